@@ -0,0 +1,387 @@
+"""
+FAISS 검색 마이크로 벤치마크 (합성 코퍼스 1천 ~ 100만 건).
+
+역할
+-----
+- 합성 `DesignChangeRecord` 와 벡터를 크기별로 만든다.
+  - random   : 단위 구 위의 균일한 랜덤 벡터 (최악의 경우, 근사 인덱스의 recall 이 가장 낮게 나옴)
+  - clustered: 사업/공종처럼 몇 개의 주제 중심 주변에 모인 벡터 (실제 설계변경 임베딩에 가까움)
+- 인덱스 종류별로
+  - 빌드(학습 + 추가) 시간, 인덱스 메모리
+  - `FAISS.save_local` / `FAISS.load_local` 시간과 파일 크기 (index.faiss + docstore index.pkl)
+  - 질문 1건 검색 지연 p50/p95, 배치 검색의 질문당 시간 / QPS
+  - LangChain 경로(`similarity_search_with_score_by_vector`, get_retriever() 와 같은 경로)의 질문 1건 지연
+  - 정확 검색(flat) 대비 recall@k
+  를 측정해 표와 JSON 으로 남긴다.
+- 서버/OpenAI 없이 실행되며, 실제 `data/faiss_index` 는 건드리지 않는다. (임시 디렉터리 사용)
+
+인덱스 종류 (`BENCH_FAISS_INDEX_TYPES`)
+-----
+- flat : IndexFlatL2 (현재 앱이 쓰는 정확 검색, recall 기준)
+- hnsw : HNSW{M},Flat (efSearch = BENCH_FAISS_HNSW_EF)
+- ivf  : IVF{nlist},Flat (nlist ≈ 4·√N, nprobe = BENCH_FAISS_NPROBE)
+- ivfpq: IVF{nlist},PQ{m} (벡터를 m 바이트로 압축, m = 차원/8)
+
+실행 예시 (Windows PowerShell)
+-----
+cd backend
+python -m app.bench_faiss
+$env:BENCH_FAISS_SIZES = "1000,10000,100000,1000000"; $env:BENCH_FAISS_DIM = "256"; python -m app.bench_faiss
+
+환경 변수
+-----
+- BENCH_FAISS_SIZES         : 코퍼스 크기 목록 (기본 "1000,10000,100000")
+- BENCH_FAISS_DIM           : 벡터 차원 (기본 embedding_dimensions, 없으면 1536)
+- BENCH_FAISS_DISTRIBUTIONS : "random,clustered" 중 선택 (기본 "clustered")
+- BENCH_FAISS_INDEX_TYPES   : 기본 "flat,hnsw,ivf,ivfpq"
+- BENCH_FAISS_QUERIES       : 질문 수 (기본 200)
+- BENCH_FAISS_BATCH         : 배치 검색 크기 (기본 64)
+- BENCH_FAISS_TOP_K         : 기본 retriever_top_k
+- BENCH_FAISS_NPROBE        : IVF 계열 nprobe (기본 16)
+- BENCH_FAISS_HNSW_M / BENCH_FAISS_HNSW_EF : HNSW 이웃 수 / 검색 폭 (기본 32 / 64)
+- BENCH_FAISS_SAVE_LOAD     : 0 이면 save/load 측정 생략 (큰 코퍼스에서 docstore 생성 시간이 길 때)
+- BENCH_FAISS_OUTPUT        : 결과 JSON 경로 (기본 bench_faiss.json)
+
+100만 건 × 1536차원은 벡터만 약 5.7 GB 이고, flat 기준 인덱스가 한 벌 더 필요하다.
+메모리가 부족하면 BENCH_FAISS_DIM 을 256/512 로 낮춰서 돌린다. (Matryoshka 축소 차원과 같은 조건)
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+import gc
+import json
+import math
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from .core.config import settings
+from .core.models import DesignChangeRecord
+from .services.vectorstore import _build_text, _metadata
+
+
+SIZES = [int(s) for s in os.getenv("BENCH_FAISS_SIZES", "1000,10000,100000").split(",") if s.strip()]
+DIM = int(os.getenv("BENCH_FAISS_DIM", "0")) or settings.embedding_dimensions or 1536
+DISTRIBUTIONS = [d.strip() for d in os.getenv("BENCH_FAISS_DISTRIBUTIONS", "clustered").split(",") if d.strip()]
+INDEX_TYPES = [t.strip() for t in os.getenv("BENCH_FAISS_INDEX_TYPES", "flat,hnsw,ivf,ivfpq").split(",") if t.strip()]
+QUERIES = int(os.getenv("BENCH_FAISS_QUERIES", "200"))
+BATCH = int(os.getenv("BENCH_FAISS_BATCH", "64"))
+TOP_K = int(os.getenv("BENCH_FAISS_TOP_K", "0")) or settings.retriever_top_k
+NPROBE = int(os.getenv("BENCH_FAISS_NPROBE", "16"))
+HNSW_M = int(os.getenv("BENCH_FAISS_HNSW_M", "32"))
+HNSW_EF = int(os.getenv("BENCH_FAISS_HNSW_EF", "64"))
+SAVE_LOAD = os.getenv("BENCH_FAISS_SAVE_LOAD", "1") != "0"
+OUTPUT_PATH = os.getenv("BENCH_FAISS_OUTPUT", "bench_faiss.json")
+
+_GEN_CHUNK = 50_000
+
+
+class _NoEmbeddings(Embeddings):
+    """save_local/load_local 에 넘길 자리 채우기용. 벤치마크는 항상 벡터로 직접 검색한다."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def make_vectors(n: int, dim: int, distribution: str, seed: int = 0) -> np.ndarray:
+    """정규화된 float32 벡터 n 개. 메모리를 아끼려고 조각 단위로 채운다."""
+    rng = np.random.default_rng(seed)
+    out = np.empty((n, dim), dtype=np.float32)
+    if distribution == "clustered":
+        clusters = max(8, int(math.sqrt(n)))
+        centers = _normalize(rng.standard_normal((clusters, dim), dtype=np.float32))
+    elif distribution != "random":
+        raise ValueError(f"알 수 없는 분포: {distribution} (random, clustered)")
+    for start in range(0, n, _GEN_CHUNK):
+        size = min(_GEN_CHUNK, n - start)
+        block = rng.standard_normal((size, dim), dtype=np.float32)
+        if distribution == "clustered":
+            # 중심 + 잡음: 같은 주제 문서끼리 코사인 0.7 안팎이 되도록 잡음 크기를 정한다.
+            block = centers[rng.integers(0, clusters, size)] + block * (0.8 / math.sqrt(dim))
+        out[start : start + size] = _normalize(block)
+    return out
+
+
+def make_queries(corpus: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """코퍼스 문서를 조금 흔든 질문 벡터. (질문이 정답 문서와 가깝지만 같지는 않은 실제 상황)"""
+    rng = np.random.default_rng(seed)
+    picks = corpus[rng.integers(0, len(corpus), count)]
+    noise = rng.standard_normal(picks.shape, dtype=np.float32) * (0.5 / math.sqrt(corpus.shape[1]))
+    return _normalize(picks + noise).astype(np.float32)
+
+
+def make_docstore(n: int) -> Tuple[InMemoryDocstore, Dict[int, str]]:
+    """합성 설계변경 레코드로 앱과 같은 모양의 docstore(page_content + metadata)를 만든다."""
+    docs: Dict[str, Document] = {}
+    index_to_docstore_id: Dict[int, str] = {}
+    created_at = datetime.utcnow()
+    for i in range(n):
+        record = DesignChangeRecord(
+            id=uuid4().hex,
+            change_date=date(2024, i % 12 + 1, i % 28 + 1),
+            title=f"VE 제안 {i}",
+            description=f"공종{i % 9} 설계변경 {i}. [생애주기비용(LCC) 절감효과] 개선전 {1000 + i % 500} 백만원",
+            organization=f"기관{i % 13}",
+            project_name=f"사업{i % 211}",
+            created_at=created_at,
+        )
+        doc_id = uuid4().hex
+        docs[doc_id] = Document(
+            page_content=_build_text(record),
+            metadata={**_metadata(record), "passage": 0, "passages": 1},
+        )
+        index_to_docstore_id[i] = doc_id
+    return InMemoryDocstore(docs), index_to_docstore_id
+
+
+def _nlist(n: int) -> int:
+    # FAISS 권장: 클러스터당 학습 벡터 39개 이상 → 작은 코퍼스에서는 nlist 를 줄인다.
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def build_index(kind: str, vectors: np.ndarray) -> faiss.Index:
+    n, dim = vectors.shape
+    if kind == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efSearch = HNSW_EF
+    elif kind == "ivf":
+        index = faiss.index_factory(dim, f"IVF{_nlist(n)},Flat")
+    elif kind == "ivfpq":
+        m = max(1, dim // 8)
+        if dim % m:
+            raise ValueError(f"ivfpq: 차원({dim})이 서브 양자화 수({m})로 나누어 떨어지지 않습니다.")
+        # PQ 학습은 코드북당 256개 중심을 만들므로 작은 코퍼스에서는 비트 수를 줄인다.
+        bits = 8 if n >= 256 * 39 else max(1, int(math.log2(max(2, n // 39))))
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, _nlist(n), m, bits)
+        # index_factory 기본값인 polysemous 학습은 검색에 쓰지 않으면서 학습 시간을 수십 배 늘린다.
+        index.do_polysemous_training = False
+        quantizer.this.disown()
+        index.own_fields = True
+    else:
+        raise ValueError(f"알 수 없는 인덱스 종류: {kind} (flat, hnsw, ivf, ivfpq)")
+
+    if not index.is_trained:
+        rng = np.random.default_rng(2)
+        sample = vectors if n <= 100_000 else vectors[rng.choice(n, 100_000, replace=False)]
+        index.train(sample)
+    for start in range(0, n, _GEN_CHUNK):
+        index.add(vectors[start : start + _GEN_CHUNK])
+    if kind in ("ivf", "ivfpq"):
+        faiss.extract_index_ivf(index).nprobe = NPROBE
+    return index
+
+
+def _index_mb(index: faiss.Index) -> float:
+    return faiss.serialize_index(index).nbytes / (1024 * 1024)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def measure_search(index: faiss.Index, queries: np.ndarray, k: int) -> Tuple[Dict[str, float], np.ndarray]:
+    """질문 1건씩 / 배치 검색 시간. (통계, 배치 검색 결과 인덱스)"""
+    single: List[float] = []
+    for q in queries:
+        started = time.perf_counter()
+        index.search(q[None, :], k)
+        single.append((time.perf_counter() - started) * 1000)
+
+    results = np.empty((len(queries), k), dtype=np.int64)
+    started = time.perf_counter()
+    for start in range(0, len(queries), BATCH):
+        _, ids = index.search(queries[start : start + BATCH], k)
+        results[start : start + BATCH] = ids
+    batch_seconds = time.perf_counter() - started
+
+    return (
+        {
+            "single_ms_p50": _percentile(single, 0.50),
+            "single_ms_p95": _percentile(single, 0.95),
+            "batch_ms_per_query": batch_seconds * 1000 / len(queries),
+            "batch_qps": len(queries) / batch_seconds if batch_seconds > 0 else 0.0,
+        },
+        results,
+    )
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(len(set(f.tolist()) & set(t.tolist())) for f, t in zip(found, truth))
+    return hits / (len(truth) * k)
+
+
+def measure_save_load(
+    index: faiss.Index,
+    docstore: InMemoryDocstore,
+    index_to_docstore_id: Dict[int, str],
+    queries: np.ndarray,
+    k: int,
+) -> Dict[str, float]:
+    """앱과 같은 FAISS 래퍼로 save_local / load_local 시간, 파일 크기, 래퍼 경유 검색 지연."""
+    vs = FAISS(
+        embedding_function=_NoEmbeddings(),
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
+    folder = Path(tempfile.mkdtemp(prefix="bench_faiss_"))
+    try:
+        started = time.perf_counter()
+        vs.save_local(str(folder))
+        save_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = FAISS.load_local(str(folder), _NoEmbeddings(), allow_dangerous_deserialization=True)
+        load_seconds = time.perf_counter() - started
+
+        retriever: List[float] = []
+        for q in queries[: min(len(queries), 100)]:
+            started = time.perf_counter()
+            loaded.similarity_search_with_score_by_vector(q.tolist(), k=k)
+            retriever.append((time.perf_counter() - started) * 1000)
+
+        return {
+            "save_seconds": save_seconds,
+            "load_seconds": load_seconds,
+            "index_file_mb": (folder / "index.faiss").stat().st_size / (1024 * 1024),
+            "docstore_file_mb": (folder / "index.pkl").stat().st_size / (1024 * 1024),
+            "retriever_ms_p50": _percentile(retriever, 0.50),
+            "retriever_ms_p95": _percentile(retriever, 0.95),
+        }
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def run_size(distribution: str, n: int) -> List[Dict[str, Any]]:
+    print(f"[BENCH] {distribution} N={n:,} dim={DIM} (벡터 {n * DIM * 4 / (1024 * 1024):,.0f} MB)")
+    vectors = make_vectors(n, DIM, distribution)
+    queries = make_queries(vectors, QUERIES)
+    k = min(TOP_K, n)
+
+    # recall 기준이 되는 정확 검색 결과
+    exact = faiss.IndexFlatL2(DIM)
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    del exact
+
+    docstore = index_to_docstore_id = None
+    if SAVE_LOAD:
+        started = time.perf_counter()
+        docstore, index_to_docstore_id = make_docstore(n)
+        print(f"  - docstore 생성 {time.perf_counter() - started:.1f}s")
+
+    rows: List[Dict[str, Any]] = []
+    for kind in INDEX_TYPES:
+        gc.collect()
+        started = time.perf_counter()
+        try:
+            index = build_index(kind, vectors)
+        except (ValueError, RuntimeError) as e:
+            print(f"  - {kind}: 건너뜀 ({e})")
+            continue
+        build_seconds = time.perf_counter() - started
+
+        search, found = measure_search(index, queries, k)
+        row: Dict[str, Any] = {
+            "distribution": distribution,
+            "n": n,
+            "dim": DIM,
+            "index": kind,
+            "build_seconds": build_seconds,
+            "index_mb": _index_mb(index),
+            **search,
+            "recall_at_k": recall_at_k(found, truth),
+        }
+        if SAVE_LOAD:
+            row.update(measure_save_load(index, docstore, index_to_docstore_id, queries, k))
+        rows.append(row)
+        print(
+            f"  - {kind:<6} build {build_seconds:7.2f}s | single p50 {row['single_ms_p50']:7.3f} ms | "
+            f"batch {row['batch_ms_per_query']:7.3f} ms/q | recall@{k} {row['recall_at_k']:.3f}"
+        )
+        del index
+    return rows
+
+
+def format_rows(rows: List[Dict[str, Any]]) -> List[str]:
+    lines = [
+        f"{'dist':<9} | {'N':>9} | {'index':<6} | {'build s':>8} | {'save s':>7} | {'load s':>7} | "
+        f"{'idx MB':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'batch ms/q':>10} | {'QPS':>9} | "
+        f"{'lc p50 ms':>9} | {'recall@' + str(TOP_K):>9}"
+    ]
+    for row in rows:
+        save = f"{row['save_seconds']:.2f}" if "save_seconds" in row else "-"
+        load = f"{row['load_seconds']:.2f}" if "load_seconds" in row else "-"
+        retriever = f"{row['retriever_ms_p50']:.3f}" if "retriever_ms_p50" in row else "-"
+        lines.append(
+            f"{row['distribution']:<9} | {row['n']:>9,} | {row['index']:<6} | {row['build_seconds']:>8.2f} | "
+            f"{save:>7} | {load:>7} | {row['index_mb']:>8.1f} | {row['single_ms_p50']:>8.3f} | "
+            f"{row['single_ms_p95']:>8.3f} | {row['batch_ms_per_query']:>10.3f} | {row['batch_qps']:>9,.0f} | "
+            f"{retriever:>9} | {row['recall_at_k']:>9.3f}"
+        )
+    return lines
+
+
+def main() -> None:
+    print(
+        f"[BENCH] FAISS {faiss.__version__}, threads={faiss.omp_get_max_threads()}, "
+        f"sizes={SIZES}, index types={INDEX_TYPES}, k={TOP_K}"
+    )
+    rows: List[Dict[str, Any]] = []
+    for distribution in DISTRIBUTIONS:
+        for n in SIZES:
+            rows.extend(run_size(distribution, n))
+            gc.collect()
+
+    print("\n".join(format_rows(rows)))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "faiss": faiss.__version__,
+            "threads": faiss.omp_get_max_threads(),
+            "dim": DIM,
+            "queries": QUERIES,
+            "batch": BATCH,
+            "top_k": TOP_K,
+            "nprobe": NPROBE,
+            "hnsw_m": HNSW_M,
+            "hnsw_ef_search": HNSW_EF,
+        },
+        "results": rows,
+    }
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[BENCH] 결과 저장: {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+VE XLSX 로더 벤치마크 (기존 전체 로드 방식 vs read-only 스트리밍 방식).
+
+역할
+-----
+- 같은 XLSX 파일을 두 로더로 끝까지 읽어서
+  - 처리 속도(rows/s)와
+  - 최대 메모리 사용량(tracemalloc peak, MB)을 비교한다.
+- 기존 방식: `load_workbook(filename, data_only=True)` 로 활성 시트 전체를 메모리에 올린 뒤 순회
+- 스트리밍 방식: `ingest_ve_csv._load_xlsx` (read-only, 모든 시트, 행 단위 yield)
+- 임베딩/저장은 하지 않고 행 파싱까지만 측정한다.
+
+실행 예시 (Windows PowerShell)
+-----
+cd backend
+python -m app.bench_ingest_xlsx
+
+환경 변수
+-----
+- BENCH_XLSX_PATH : 측정할 XLSX 경로 (없으면 합성 파일을 만들어 사용)
+- BENCH_XLSX_ROWS : 합성 파일의 데이터 행 수 (기본 50000)
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from openpyxl import Workbook, load_workbook
+
+from .services.ingest_ve_csv import _load_xlsx
+
+
+XLSX_PATH = os.getenv("BENCH_XLSX_PATH", "")
+SYNTHETIC_ROWS = int(os.getenv("BENCH_XLSX_ROWS", "50000"))
+
+HEADER = [
+    "기관명", "사업명", "제안명", "제안일자", "채택여부", "공종분류", "키워드",
+    "개선전_건설사업비(백만원)", "개선전_유지관리비(백만원)", "개선전_계(백만원)",
+    "개선후_건설사업비(백만원)", "개선후_유지관리비(백만원)", "개선후_계(백만원)",
+    "절감액(백만원)", "절감율(%)",
+    "개선전_성능점수(점)", "개선전_가치점수(점)", "개선후_성능점수(점)", "개선후_가치점수(점)",
+]
+
+
+def build_synthetic_xlsx(path: Path, rows: int) -> None:
+    """실제 VE 내보내기와 같은 모양(제목 행 + 헤더 + 데이터)의 XLSX 를 write-only 로 생성."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("VE제안 목록")
+    ws.append(["설계VE 상세내용 - VE제안 목록"])
+    ws.append(["기준일자", "2025-01-01"])
+    ws.append([])
+    ws.append(HEADER)
+    for i in range(rows):
+        before = 1000 + i % 500
+        after = before - (i % 97)
+        ws.append(
+            [
+                f"기관{i % 13}", f"사업{i % 211}", f"VE 제안 {i}", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "채택" if i % 3 else "불채택", f"공종{i % 9}", "구조, 공법, 자재",
+                before, 10.5, before + 10.5, after, 9.5, after + 9.5,
+                before - after, round((before - after) / before * 100, 2),
+                70 + i % 20, 80 + i % 15, 75 + i % 20, 85 + i % 15,
+            ]
+        )
+    wb.save(path)
+
+
+def legacy_load_xlsx(path: Path) -> Iterable[Dict[str, Any]]:
+    """변경 전 `_load_xlsx` 와 같은 방식 (전체 모드, 활성 시트만)."""
+    wb = load_workbook(filename=path, data_only=True)
+    ws = wb.active
+
+    header_row_index: int | None = None
+    header: list[str] | None = None
+    for idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        cells = [(str(c).strip() if c is not None else "") for c in row]
+        if not any(cells):
+            continue
+        if {"기관명", "사업명", "제안명", "제안일자"}.issubset(set(cells)):
+            header_row_index = idx
+            header = cells
+            break
+    if header_row_index is None or header is None:
+        raise RuntimeError("헤더 행을 찾지 못했습니다.")
+
+    for row in ws.iter_rows(min_row=header_row_index + 1, values_only=True):
+        values = [(str(c).strip() if c is not None else "") for c in row]
+        if not any(values):
+            continue
+        row_dict = {k: v for k, v in zip(header, values) if k}
+        if not str(row_dict.get("제안명", "")).strip():
+            continue
+        yield row_dict
+
+
+def measure(loader: Callable[[Path], Iterable[Dict[str, Any]]], path: Path) -> Tuple[int, float, float]:
+    """(행 수, rows/s, peak MB). 속도와 메모리는 tracemalloc 오버헤드를 피하려고 따로 측정한다."""
+    gc.collect()
+    started = time.perf_counter()
+    count = sum(1 for _ in loader(path))
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    for _ in loader(path):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return count, count / elapsed if elapsed > 0 else 0.0, peak / (1024 * 1024)
+
+
+def main() -> None:
+    if XLSX_PATH:
+        path = Path(XLSX_PATH)
+        cleanup = False
+    else:
+        path = Path(tempfile.mkdtemp()) / "bench_ve.xlsx"
+        print(f"[BENCH] 합성 XLSX 생성 중 ({SYNTHETIC_ROWS:,}행) → {path}")
+        build_synthetic_xlsx(path, SYNTHETIC_ROWS)
+        cleanup = True
+
+    size_mb = path.stat().st_size / (1024 * 1024)
+    print(f"[BENCH] 파일: {path.name} ({size_mb:.1f} MB)")
+
+    results = []
+    for name, loader in (("legacy (full load)", legacy_load_xlsx), ("streaming (read-only)", _load_xlsx)):
+        count, rate, peak = measure(loader, path)
+        results.append((name, count, rate, peak))
+        print(f"  - {name:<22} rows={count:,}  {rate:,.0f} rows/s  peak={peak:,.1f} MB")
+
+    (_, _, legacy_rate, legacy_peak), (_, _, stream_rate, stream_peak) = results
+    if stream_peak > 0 and legacy_rate > 0:
+        print(
+            f"[BENCH] 메모리 {legacy_peak / stream_peak:,.1f}배 감소, "
+            f"속도 {stream_rate / legacy_rate:,.2f}배"
+        )
+
+    if cleanup:
+        path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+FastAPI 백엔드 부하 테스트 / 지연 시간 벤치마크.
+
+역할
+-----
+- 별도 프로세스에서 `app.main:app` 을 uvicorn 으로 띄운다.
+  - OpenAI 임베딩/LLM 대신 지연 시간을 설정할 수 있는 대역(stand-in)을 쓴다. (API 키/비용 없음)
+    - 임베딩: 글자 bigram 해시 벡터 → 비슷한 문장은 실제처럼 가까운 벡터가 되어 검색/재정렬 경로를 그대로 탄다.
+    - LLM: 입력을 되돌려 주는 가짜 모델 (번역은 5줄 그대로, 채팅은 고정 문구)
+  - 임시 데이터 디렉터리에 합성 설계변경 `BENCH_SEED_RECORDS` 건을 먼저 넣어 둔다.
+- 목표 RPS 로 섞인 트래픽(open-loop, 포아송 도착)을 보낸다.
+  - latest   : `GET /worker/latest-change` 폴링 (마지막으로 받은 ETag 로 If-None-Match → 대부분 304)
+  - chat     : `POST /worker/chat` (합성 레코드 제목 기반 질문, 언어 랜덤)
+  - translate: `GET /worker/latest-change-translated` (ko 제외 언어 랜덤)
+  - insert   : `POST /admin/changes`
+- 엔드포인트별 / 전체 p50/p95/p99 지연, 처리량, 에러율, 상태 코드 분포를 출력한다.
+- 서버 프로세스 CPU 사용량
+  - 섞인 트래픽 구간 전체의 CPU 초 / CPU% (코어 1개 기준)
+  - 엔드포인트별 CPU: 같은 RPS 로 한 종류만 보내는 구간을 따로 돌려 요청 1건당 CPU ms 를 잰다.
+- 결과는 JSON 으로 저장하고, `BENCH_LOAD_BASELINE` 에 이전 결과를 주면 엔드포인트별 변화량을 함께 출력한다.
+
+실행 예시 (Windows PowerShell)
+-----
+cd backend
+python -m app.bench_load
+$env:BENCH_RPS = "200"; $env:BENCH_LLM_LATENCY_MS = "1500"; python -m app.bench_load
+$env:BENCH_LOAD_BASELINE = "bench_load_prev.json"; python -m app.bench_load
+
+환경 변수
+-----
+- BENCH_RPS                  : 목표 초당 요청 수 (기본 50)
+- BENCH_DURATION_SECONDS     : 섞인 트래픽 구간 길이 (기본 30)
+- BENCH_CPU_PHASE_SECONDS    : 엔드포인트별 CPU 측정 구간 길이 (기본 5, 0 이면 생략)
+- BENCH_MIX                  : 트래픽 비율 (기본 "latest=60,chat=25,translate=10,insert=5")
+- BENCH_EMBED_LATENCY_MS     : 임베딩 호출 1건의 가짜 지연 (기본 80)
+- BENCH_LLM_LATENCY_MS       : LLM 호출 1건의 가짜 지연 (기본 800)
+- BENCH_SEED_RECORDS         : 미리 넣어 둘 합성 레코드 수 (기본 2000)
+- BENCH_CHAT_QUESTIONS       : 채팅 질문 종류 수 (작을수록 답변 캐시 적중이 많아짐, 기본 300)
+- BENCH_MAX_INFLIGHT         : 클라이언트 최대 동시 요청 수. 넘으면 보내지 않고 dropped 로 센다. (기본 1000)
+- BENCH_TIMEOUT_SECONDS      : 요청 타임아웃 (기본 60)
+- BENCH_PORT                 : 서버 포트 (기본 8765)
+- BENCH_LOAD_OUTPUT          : 결과 JSON 경로 (기본 bench_load.json)
+- BENCH_LOAD_BASELINE        : 비교할 이전 결과 JSON 경로 (선택)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import zlib
+
+import httpx
+
+
+RPS = float(os.getenv("BENCH_RPS", "50"))
+DURATION_SECONDS = float(os.getenv("BENCH_DURATION_SECONDS", "30"))
+CPU_PHASE_SECONDS = float(os.getenv("BENCH_CPU_PHASE_SECONDS", "5"))
+MIX_SPEC = os.getenv("BENCH_MIX", "latest=60,chat=25,translate=10,insert=5")
+EMBED_LATENCY_MS = float(os.getenv("BENCH_EMBED_LATENCY_MS", "80"))
+LLM_LATENCY_MS = float(os.getenv("BENCH_LLM_LATENCY_MS", "800"))
+SEED_RECORDS = int(os.getenv("BENCH_SEED_RECORDS", "2000"))
+CHAT_QUESTIONS = max(1, int(os.getenv("BENCH_CHAT_QUESTIONS", "300")))
+MAX_INFLIGHT = int(os.getenv("BENCH_MAX_INFLIGHT", "1000"))
+TIMEOUT_SECONDS = float(os.getenv("BENCH_TIMEOUT_SECONDS", "60"))
+PORT = int(os.getenv("BENCH_PORT", "8765"))
+OUTPUT_PATH = os.getenv("BENCH_LOAD_OUTPUT", "bench_load.json")
+BASELINE_PATH = os.getenv("BENCH_LOAD_BASELINE", "")
+
+KINDS = ("latest", "chat", "translate", "insert")
+LANGUAGES = ("ko", "en", "zh", "vi", "uk")
+_ORGS = ("한국토지주택공사", "서울주택도시공사", "경기주택도시공사", "인천도시공사", "부산도시공사")
+_WORKS = ("외벽 단열", "지하주차장 방수", "옥상 녹화", "배관 자재", "기초 말뚝", "창호 성능", "조경 식재")
+
+
+# ---------------------------------------------------------------------------
+# 서버 프로세스: 대역 백엔드 + 합성 데이터
+# ---------------------------------------------------------------------------
+
+
+def _seed_title(i: int) -> str:
+    return f"{_ORGS[i % len(_ORGS)]} 사업{i % 97} {_WORKS[i % len(_WORKS)]} 개선 VE 제안 {i}"
+
+
+def _seed_change(i: int) -> Dict[str, Any]:
+    work = _WORKS[i % len(_WORKS)]
+    return {
+        "change_date": date(2024, i % 12 + 1, i % 28 + 1).isoformat(),
+        "title": _seed_title(i),
+        "description": (
+            f"{work} 공법을 변경하여 공사비와 유지관리비를 줄인다. 제안 번호 {i}.\n"
+            f"[생애주기비용(LCC) 절감효과] 개선전 {1000 + i % 500} 백만원, 개선후 {900 + i % 400} 백만원"
+        ),
+        "organization": _ORGS[i % len(_ORGS)],
+        "project_name": f"사업{i % 97}",
+    }
+
+
+def _install_stand_ins(embed_latency: List[float]) -> None:
+    """vectorstore / agent 의 OpenAI 클라이언트를 지연 시간이 있는 대역으로 바꾼다."""
+    import numpy as np
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    from .core.config import settings
+    from .services import agent, vectorstore
+
+    dims = settings.embedding_dimensions or 1536
+
+    class BenchEmbeddings(Embeddings):
+        def _vector(self, text: str) -> List[float]:
+            v = np.zeros(dims, dtype=np.float32)
+            for i in range(len(text) - 1):
+                v[zlib.crc32(text[i : i + 2].encode("utf-8")) % dims] += 1.0
+            norm = float(np.linalg.norm(v)) or 1.0
+            return (v / norm).tolist()
+
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            time.sleep(embed_latency[0] / 1000)
+            return [self._vector(t) for t in texts]
+
+        def embed_query(self, text: str) -> List[float]:
+            return self.embed_documents([text])[0]
+
+    class BenchChatModel(BaseChatModel):
+        latency_ms: float = 0.0
+
+        @property
+        def _llm_type(self) -> str:
+            return "bench-echo"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            time.sleep(self.latency_ms / 1000)
+            lines = str(messages[-1].content).splitlines()
+            # 번역 프롬프트는 첫 줄 다음이 원문 5줄 → 그대로 돌려주면 번역 결과처럼 파싱된다.
+            content = "\n".join(lines[1:]) if len(lines) > 1 else "벤치마크용 답변입니다."
+            message = AIMessage(
+                content=content,
+                usage_metadata={"input_tokens": 500, "output_tokens": 100, "total_tokens": 600},
+            )
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    embeddings = BenchEmbeddings()
+    llm = BenchChatModel(latency_ms=LLM_LATENCY_MS)
+    vectorstore._get_embeddings = lambda: embeddings
+    agent._build_llm = lambda: llm
+
+
+def _seed_corpus(count: int) -> None:
+    from .core.models import DesignChangeInput
+    from .services.vectorstore import commit_design_changes, embed_texts, persist_stores, prepare_design_change
+
+    batch = 256
+    for start in range(0, count, batch):
+        prepared = [
+            prepare_design_change(DesignChangeInput(**_seed_change(i)))
+            for i in range(start, min(count, start + batch))
+        ]
+        flat = [text for _, passages in prepared for text in passages]
+        vectors = embed_texts(flat)
+        entries = []
+        offset = 0
+        for record, passages in prepared:
+            entries.append((record, vectors[offset : offset + len(passages)], None))
+            offset += len(passages)
+        commit_design_changes(entries, persist=False)
+    persist_stores()
+
+
+def _serve(data_dir: str, port: int) -> None:
+    """자식 프로세스 진입점: 설정을 임시 디렉터리로 돌리고, 대역 설치/데이터 시드 후 uvicorn 실행."""
+    import uvicorn
+
+    from .core.config import settings
+
+    settings.openai_api_key = settings.openai_api_key or "bench"
+    settings.data_dir = Path(data_dir)
+    settings.faiss_index_dir = Path(data_dir) / "faiss_index"
+    settings.import_dir = Path(data_dir) / "imports"
+    # 대역 백엔드에는 분당 한도가 없으므로 governor 의 분당 한도만 끈다. (동시성/재시도 로직은 그대로)
+    settings.upstream_requests_per_minute = 0
+    settings.upstream_tokens_per_minute = 0
+
+    embed_latency = [0.0]  # 시드 중에는 지연 없이, 서버 시작 전에 설정값으로 바꾼다.
+    _install_stand_ins(embed_latency)
+    _seed_corpus(SEED_RECORDS)
+    embed_latency[0] = EMBED_LATENCY_MS
+
+    from .main import app
+
+    @app.get("/__bench/cpu", include_in_schema=False)
+    def bench_cpu() -> Dict[str, float]:
+        return {"cpu_seconds": time.process_time()}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성기
+# ---------------------------------------------------------------------------
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in KINDS:
+            raise ValueError(f"BENCH_MIX 의 알 수 없는 종류: {name} (가능: {', '.join(KINDS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError(f"BENCH_MIX 가 비어 있습니다: {spec!r}")
+    return mix
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class LoadClient:
+    """종류별 요청을 만들어 보내고 (종류, 상태 코드, 지연 ms) 를 기록한다."""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.etag: Optional[str] = None
+        self.samples: List[Tuple[str, int, float]] = []
+        self.routes: Dict[str, int] = {}
+        self._rng = random.Random(42)
+        self._inserted = 0
+
+    async def send(self, kind: str) -> None:
+        started = time.perf_counter()
+        try:
+            resp = await self._request(kind)
+            status = resp.status_code
+        except httpx.HTTPError:
+            status = 0  # 타임아웃/연결 실패
+        self.samples.append((kind, status, (time.perf_counter() - started) * 1000))
+
+    async def _request(self, kind: str) -> httpx.Response:
+        if kind == "latest":
+            headers = {"If-None-Match": self.etag} if self.etag else {}
+            resp = await self.client.get("/worker/latest-change", headers=headers)
+            self.etag = resp.headers.get("ETag", self.etag)
+            return resp
+        if kind == "chat":
+            i = self._rng.randrange(CHAT_QUESTIONS) % max(1, SEED_RECORDS)
+            payload = {
+                "language": self._rng.choice(LANGUAGES),
+                "question": f"{_seed_title(i)} 설계변경 내용과 절감 효과를 알려줘",
+                "history": [],
+            }
+            resp = await self.client.post("/worker/chat", json=payload)
+            if resp.status_code == 200:
+                route = resp.json().get("route") or "rag"
+                self.routes[route] = self.routes.get(route, 0) + 1
+            return resp
+        if kind == "translate":
+            language = self._rng.choice(LANGUAGES[1:])
+            return await self.client.get("/worker/latest-change-translated", params={"language": language})
+        self._inserted += 1
+        change = _seed_change(SEED_RECORDS + self._inserted)
+        change["change_date"] = date.today().isoformat()
+        return await self.client.post("/admin/changes", json=change)
+
+
+async def _server_cpu(client: httpx.AsyncClient) -> float:
+    resp = await client.get("/__bench/cpu")
+    resp.raise_for_status()
+    return float(resp.json()["cpu_seconds"])
+
+
+async def run_phase(
+    client: httpx.AsyncClient, mix: Dict[str, float], rps: float, duration: float
+) -> Tuple[LoadClient, float, float, int]:
+    """open-loop 로 duration 초 동안 요청을 보낸다. (LoadClient, 걸린 시간, 서버 CPU 초, dropped)"""
+    load = LoadClient(client)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    rng = random.Random(7)
+    pending: set[asyncio.Task] = set()
+    dropped = 0
+
+    cpu_before = await _server_cpu(client)
+    started = time.perf_counter()
+    next_at = started
+    while True:
+        next_at += rng.expovariate(rps)
+        if next_at - started >= duration:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(pending) >= MAX_INFLIGHT:
+            dropped += 1
+            continue
+        task = asyncio.create_task(load.send(rng.choices(kinds, weights)[0]))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    elapsed = time.perf_counter() - started
+    cpu_seconds = await _server_cpu(client) - cpu_before
+    return load, elapsed, cpu_seconds, dropped
+
+
+def summarize(samples: List[Tuple[str, int, float]], elapsed: float) -> Dict[str, Any]:
+    latencies = [ms for _, _, ms in samples]
+    # 304 (ETag 일치) 도 정상 응답이다.
+    errors = sum(1 for _, status, _ in samples if status == 0 or status >= 400)
+    statuses: Dict[str, int] = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "latency_ms_p50": _percentile(latencies, 0.50),
+        "latency_ms_p95": _percentile(latencies, 0.95),
+        "latency_ms_p99": _percentile(latencies, 0.99),
+        "latency_ms_max": max(latencies, default=0.0),
+        "status_codes": statuses,
+    }
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: multiprocessing.Process, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not server.is_alive():
+            raise RuntimeError(f"벤치마크 서버가 시작 중에 종료되었습니다 (exit={server.exitcode}).")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"벤치마크 서버가 {timeout:.0f}초 안에 준비되지 않았습니다.")
+
+
+async def run_benchmark(server: multiprocessing.Process) -> Dict[str, Any]:
+    mix = _parse_mix(MIX_SPEC)
+    limits = httpx.Limits(max_connections=MAX_INFLIGHT, max_keepalive_connections=MAX_INFLIGHT)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PORT}", timeout=TIMEOUT_SECONDS, limits=limits
+    ) as client:
+        await _wait_ready(client, server, timeout=300)
+        # 첫 요청의 지연(LLM 체인/프롬프트 로드 등)이 결과에 섞이지 않도록 종류별로 한 번씩 먼저 보낸다.
+        warmup = LoadClient(client)
+        for kind in mix:
+            await warmup.send(kind)
+
+        print(f"[BENCH] mixed traffic: {RPS:g} rps × {DURATION_SECONDS:g}s, mix={mix}")
+        load, elapsed, cpu_seconds, dropped = await run_phase(client, mix, RPS, DURATION_SECONDS)
+        overall = summarize(load.samples, elapsed)
+        overall.update(
+            {
+                "dropped": dropped,
+                "server_cpu_seconds": cpu_seconds,
+                "server_cpu_percent": cpu_seconds / elapsed * 100 if elapsed > 0 else 0.0,
+                "chat_routes": load.routes,
+            }
+        )
+        endpoints = {
+            kind: summarize([s for s in load.samples if s[0] == kind], elapsed) for kind in mix
+        }
+
+        if CPU_PHASE_SECONDS > 0:
+            for kind in mix:
+                print(f"[BENCH] CPU phase: {kind} only, {RPS:g} rps × {CPU_PHASE_SECONDS:g}s")
+                solo, solo_elapsed, solo_cpu, _ = await run_phase(client, {kind: 1.0}, RPS, CPU_PHASE_SECONDS)
+                done = len(solo.samples)
+                endpoints[kind]["cpu_ms_per_request"] = solo_cpu * 1000 / done if done else None
+                endpoints[kind]["cpu_percent_at_rps"] = solo_cpu / solo_elapsed * 100 if solo_elapsed > 0 else 0.0
+
+    return {"overall": overall, "endpoints": endpoints}
+
+
+# ---------------------------------------------------------------------------
+# 결과 출력 / 저장
+# ---------------------------------------------------------------------------
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def format_results(results: Dict[str, Any]) -> List[str]:
+    lines = [
+        f"{'endpoint':<10} | {'reqs':>6} | {'rps':>7} | {'err%':>6} | {'p50 ms':>8} | {'p95 ms':>8} | "
+        f"{'p99 ms':>8} | {'cpu ms/req':>10}"
+    ]
+    rows = [(kind, stats) for kind, stats in results["endpoints"].items()] + [("overall", results["overall"])]
+    for kind, stats in rows:
+        cpu = stats.get("cpu_ms_per_request")
+        lines.append(
+            f"{kind:<10} | {stats['requests']:>6} | {stats['throughput_rps']:>7.1f} | "
+            f"{stats['error_rate'] * 100:>6.2f} | {stats['latency_ms_p50']:>8.1f} | "
+            f"{stats['latency_ms_p95']:>8.1f} | {stats['latency_ms_p99']:>8.1f} | "
+            f"{(f'{cpu:.2f}' if cpu is not None else '-'):>10}"
+        )
+    overall = results["overall"]
+    lines.append(
+        f"server CPU {overall['server_cpu_seconds']:.2f}s ({overall['server_cpu_percent']:.1f}% of one core), "
+        f"dropped={overall['dropped']}, chat routes={overall['chat_routes']}"
+    )
+    return lines
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """엔드포인트별 p95 / 처리량 / 에러율 / 요청당 CPU 의 이전 결과 대비 변화량."""
+    keys = ("latency_ms_p95", "latency_ms_p99", "throughput_rps", "error_rate", "cpu_ms_per_request")
+    current = {**results["endpoints"], "overall": results["overall"]}
+    previous = {**baseline.get("endpoints", {}), "overall": baseline.get("overall", {})}
+    comparison: Dict[str, Any] = {}
+    for kind, stats in current.items():
+        before = previous.get(kind)
+        if not before:
+            continue
+        comparison[kind] = {
+            key: {"before": before[key], "after": stats[key], "change": stats[key] - before[key]}
+            for key in keys
+            if stats.get(key) is not None and before.get(key) is not None
+        }
+    return comparison
+
+
+def main() -> None:
+    data_dir = Path(tempfile.mkdtemp(prefix="bench_load_"))
+    print(f"[BENCH] 서버 시작 (시드 {SEED_RECORDS:,}건, 데이터: {data_dir})")
+    # fork 를 쓰면 부모의 import 상태가 섞이므로 플랫폼과 관계없이 spawn 으로 띄운다.
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(str(data_dir), PORT), daemon=True)
+    server.start()
+    try:
+        results = asyncio.run(run_benchmark(server))
+    finally:
+        server.terminate()
+        server.join(10)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": {
+                "rps": RPS,
+                "duration_seconds": DURATION_SECONDS,
+                "cpu_phase_seconds": CPU_PHASE_SECONDS,
+                "mix": _parse_mix(MIX_SPEC),
+                "embed_latency_ms": EMBED_LATENCY_MS,
+                "llm_latency_ms": LLM_LATENCY_MS,
+                "seed_records": SEED_RECORDS,
+                "chat_questions": CHAT_QUESTIONS,
+                "max_inflight": MAX_INFLIGHT,
+            },
+        },
+        **results,
+    }
+
+    print("\n".join(format_results(results)))
+
+    if BASELINE_PATH:
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["baseline"] = {"path": BASELINE_PATH, "git_commit": baseline.get("meta", {}).get("git_commit")}
+        report["comparison"] = compare_with_baseline(results, baseline)
+        print(f"[BENCH] 이전 결과 대비 ({BASELINE_PATH}):")
+        for kind, changes in report["comparison"].items():
+            p95 = changes.get("latency_ms_p95")
+            rps = changes.get("throughput_rps")
+            if p95 and rps:
+                print(
+                    f"  - {kind:<10} p95 {p95['before']:.1f} → {p95['after']:.1f} ms ({p95['change']:+.1f}), "
+                    f"rps {rps['before']:.1f} → {rps['after']:.1f} ({rps['change']:+.1f})"
+                )
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[BENCH] 결과 저장: {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import BaseModel
 from pydantic import Field
@@ -20,9 +20,101 @@ class Settings(BaseModel):
     openai_api_key: str = Field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
     openai_chat_model: str = "gpt-4.1-mini"
     openai_embedding_model: str = "text-embedding-3-small"
+    # 문서/질문 임베딩 차원 (text-embedding-3 계열의 축소 임베딩). None 이면 모델 기본값(1536).
+    # 기존 faiss_index 와 다르게 바꿀 때는 `python -m app.services.reindex_faiss --dimensions N` 으로 다시 만든다.
+    embedding_dimensions: Optional[int] = Field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+    )
+
+    # OpenAI 호출이 공유하는 HTTP 커넥션 풀 (services/http_clients.py)
+    openai_timeout_seconds: float = 20.0
+    openai_connect_timeout_seconds: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = True  # h2 패키지가 있을 때만 적용
+
+    # OpenAI 호출 제어 (services/upstream.py): 모델별 AIMD 동시성 / 분당 한도 / 재시도 / 서킷 브레이커
+    upstream_initial_concurrency: int = 8
+    upstream_min_concurrency: int = 1
+    upstream_max_concurrency: int = 32
+    upstream_queue_timeout_seconds: float = 5.0  # 동시성/분당 한도로 이 이상 기다려야 하면 503
+    upstream_requests_per_minute: int = 500  # 0 이면 제한 없음
+    upstream_tokens_per_minute: int = 200_000  # 0 이면 제한 없음
+    upstream_max_retries: int = 3
+    upstream_backoff_base_seconds: float = 0.5
+    upstream_backoff_max_seconds: float = 8.0
+    upstream_deadline_seconds: float = 30.0  # 재시도를 포함한 호출 1건의 최대 소요 시간
+    upstream_breaker_failure_threshold: int = 5  # 연속 실패 횟수 (0 이면 브레이커 끔)
+    upstream_breaker_reset_seconds: float = 30.0
+    upstream_completion_token_estimate: int = 500  # 분당 토큰 한도 계산용 예상 답변 토큰 수
+
+    # RAG 검색 시 가져올 문서 수
+    retriever_top_k: int = 5
+    # 프롬프트에 넣을 검색 문서 컨텍스트의 최대 토큰 수 (낮은 순위 문서부터 잘라냄)
+    context_token_budget: int = 3000
+
+    # 긴 설명은 섹션([생애주기비용...] 등) 단위 패시지로 나눠 임베딩 (services/chunker.py)
+    chunk_max_tokens: int = 512  # 패시지 본문 최대 토큰 수. 이보다 짧은 레코드는 한 덩어리 그대로 (0 이면 나누지 않음)
+    chunk_overlap_tokens: int = 64  # 긴 섹션을 나눌 때 앞 패시지 끝부분을 다음 패시지에 겹쳐 넣는 양
+    chunk_search_multiplier: int = 3  # 패시지 단위로 k 의 몇 배를 먼저 검색한 뒤 레코드 단위로 합칠지
+
+    # 검색 후 로컬 재정렬(rerank) + MMR
+    rerank_enabled: bool = True
+    rerank_fetch_k: int = 20  # FAISS 에서 먼저 가져올 후보 수
+    rerank_min_score: float = 0.25  # (1-w)*cosine + w*lexical 이 이 값 미만이면 프롬프트에서 제외
+    rerank_lexical_weight: float = 0.3
+    rerank_mmr_lambda: float = 0.7  # 1 에 가까울수록 관련도, 0 에 가까울수록 다양성 우선
+    rerank_duplicate_similarity: float = 0.97  # 이미 고른 문서와 코사인이 이 이상이면 중복으로 제외
+
+    # "최근 N건/사업별/날짜별" 질문을 변경 인덱스에서 바로 답하는 규칙 기반 라우터
+    intent_router_enabled: bool = True
+    intent_router_max_items: int = 10
+
+    # 관련 문서가 없을 때 LLM 호출 없이 바로 템플릿 답변. 검색 후보의 최고 코사인 유사도와 비교
+    # (재정렬 on/off 와 관계없이 같은 척도, eval_rag_retrieval 의 추천값으로 보정)
+    no_answer_enabled: bool = True
+    no_answer_score_threshold: float = 0.3
+
+    # 작업자 챗봇 의미 기반 답변 캐시 (언어 + 질문 임베딩 유사도)
+    answer_cache_enabled: bool = True
+    answer_cache_similarity_threshold: float = 0.95
+    answer_cache_max_entries: int = 1024
+    answer_cache_ttl_seconds: float = 3600.0
+
+    # 동시 요청의 질문 임베딩 / FAISS 검색을 모아 한 번에 호출하는 창 (0 이면 배칭 안 함)
+    query_batch_window_ms: float = 5.0
+    query_batch_max_size: int = 64
+
+    # /worker/latest-change?wait= long-poll 최대 대기 시간 (프록시 유휴 타임아웃보다 짧게)
+    latest_change_max_wait_seconds: float = 55.0
+
+    # /worker/changes/stream (SSE)
+    change_stream_heartbeat_seconds: float = 15.0
+    change_stream_client_buffer: int = 64  # 구독자별 대기 이벤트 수. 넘치면 연결을 끊고 재접속으로 따라오게 함
+    change_stream_max_backlog: int = 500  # Last-Event-ID 재개 시 change_log 에서 다시 보낼 최대 건수
+    change_stream_retry_ms: int = 3000  # EventSource 재접속 대기 시간
+
+    # 단계별 지연 히스토그램 / GET /metrics (services/metrics.py)
+    metrics_enabled: bool = True
+
+    # 대량 인제스트 파이프라인 (services/ingest_pipeline.py)
+    ingest_embed_workers: int = 4
+    ingest_batch_max_tokens: int = 50_000  # 임베딩 요청 1건에 넣을 최대 토큰 수
+    ingest_batch_max_items: int = 512  # 임베딩 요청 1건에 넣을 최대 입력(패시지) 수
+    ingest_queue_size: int = 8  # 단계 사이 큐에 쌓아 둘 최대 배치 수
+    ingest_persist_every_batches: int = 20  # 이 배치 수마다 index.faiss / numeric_store.npz 저장
+    ingest_progress_interval_seconds: float = 5.0
+    # 디렉터리 인제스트 시 파일 파싱 프로세스 수 / 프로세스에서 한 번에 보내는 행 수
+    ingest_parse_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    ingest_parse_batch_rows: int = 256
 
     data_dir: Path = Field(default_factory=lambda: Path("data"))
     faiss_index_dir: Path = Field(default_factory=lambda: Path("data") / "faiss_index")
+    # POST /admin/imports 업로드 파일을 인제스트 전까지 보관하는 곳
+    import_dir: Path = Field(default_factory=lambda: Path("data") / "imports")
+    import_max_upload_mb: int = 1024
+    import_jobs_history: int = 100
 
     allowed_lang_codes: tuple[Literal["ko", "en", "zh", "ja", "th"], ...] = (
         "ko",
@@ -50,6 +142,12 @@ class Settings(BaseModel):
         self.faiss_index_dir.mkdir(parents=True, exist_ok=True)
         return self.faiss_index_dir
 
+    @computed_field
+    @property
+    def import_dir_path(self) -> Path:  # type: ignore[override]
+        self.import_dir.mkdir(parents=True, exist_ok=True)
+        return self.import_dir
+
 
 @lru_cache
 def get_settings() -> Settings:
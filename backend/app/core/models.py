@@ -97,9 +97,129 @@ class WorkerChatAnswerSource(BaseModel):
     change_date: Optional[date] = None
 
 
+class WorkerChatUsage(BaseModel):
+    """요청 한 번에 사용한 토큰 수."""
+
+    context_tokens: int = Field(description="프롬프트에 넣은 문서 컨텍스트 토큰 수 (로컬 토크나이저 기준)")
+    context_truncated: bool = Field(default=False, description="토큰 예산 때문에 문서가 잘렸는지 여부")
+    prompt_tokens: Optional[int] = Field(default=None, description="LLM 이 보고한 입력 토큰 수")
+    completion_tokens: Optional[int] = Field(default=None, description="LLM 이 보고한 출력 토큰 수")
+
+
 class WorkerChatResponse(BaseModel):
     answer: str
     language: LanguageCode
     sources: List[WorkerChatAnswerSource] = Field(default_factory=list)
+    usage: Optional[WorkerChatUsage] = None
+    route: str = Field(
+        default="rag",
+        description=(
+            "답변 경로: rag(검색+LLM) / no_answer(관련 문서 없음, LLM 미호출) / "
+            "structured(변경 인덱스에서 바로 답변, LLM 미호출)"
+        ),
+    )
+    retrieval_score: Optional[float] = Field(
+        default=None, description="검색 후보 중 최고 코사인 유사도 (no-answer 임계값 보정용)"
+    )
+
+
+class AnalyticsMetric(str, Enum):
+    """VE 수치 컬럼 (백만원 / % / 점)."""
+
+    lcc_before_construction = "lcc_before_construction"
+    lcc_before_maintenance = "lcc_before_maintenance"
+    lcc_before_total = "lcc_before_total"
+    lcc_after_construction = "lcc_after_construction"
+    lcc_after_maintenance = "lcc_after_maintenance"
+    lcc_after_total = "lcc_after_total"
+    savings_amount = "savings_amount"
+    savings_rate = "savings_rate"
+    performance_before = "performance_before"
+    value_before = "value_before"
+    performance_after = "performance_after"
+    value_after = "value_after"
+
+
+class AnalyticsGroupBy(str, Enum):
+    organization = "organization"
+    project_name = "project_name"
+    category = "category"
+    adopted = "adopted"
+    year = "year"
 
 
+class AnalyticsAggregate(str, Enum):
+    sum = "sum"
+    mean = "mean"
+    max = "max"
+    min = "min"
+    count = "count"
+
+
+class AnalyticsRow(BaseModel):
+    id: str
+    title: str
+    organization: Optional[str] = None
+    project_name: Optional[str] = None
+    change_date: date
+    category: Optional[str] = Field(default=None, description="공종분류")
+    adopted: Optional[str] = Field(default=None, description="채택여부")
+    lcc_before_construction: Optional[float] = None
+    lcc_before_maintenance: Optional[float] = None
+    lcc_before_total: Optional[float] = None
+    lcc_after_construction: Optional[float] = None
+    lcc_after_maintenance: Optional[float] = None
+    lcc_after_total: Optional[float] = None
+    savings_amount: Optional[float] = None
+    savings_rate: Optional[float] = None
+    performance_before: Optional[float] = None
+    value_before: Optional[float] = None
+    performance_after: Optional[float] = None
+    value_after: Optional[float] = None
+
+
+class AnalyticsGroup(BaseModel):
+    key: str
+    value: float
+    count: int
+
+
+class AnalyticsResponse(BaseModel):
+    """VE 수치 컬럼 필터/정렬/그룹 집계 결과."""
+
+    metric: AnalyticsMetric
+    matched: int = Field(description="필터를 통과하고 metric 값이 있는 레코드 수")
+    total: float
+    mean: Optional[float] = None
+    rows: List[AnalyticsRow] = Field(default_factory=list)
+    groups: List[AnalyticsGroup] = Field(default_factory=list)
+    elapsed_ms: float
+
+
+class ImportJobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    partial = "partial"  # 끝났지만 읽기 오류/실패 행 때문에 일부 행만 저장됨
+    failed = "failed"
+
+
+class ImportJobResponse(BaseModel):
+    """VE 엑셀/CSV 백그라운드 인제스트 작업 상태."""
+
+    id: str
+    filename: str
+    status: ImportJobStatus
+    total_rows: Optional[int] = Field(default=None, description="파일의 데이터 행 수 추정치 (ETA 용, 추정 전이거나 추정할 수 없으면 None). 끝나면 실제 처리 행 수")
+    rows_done: int = 0
+    rows_failed: int = 0
+    rows_skipped: int = Field(default=0, description="이미 인제스트된 내용이라 건너뛴 행 수")
+    tokens: int = 0
+    rows_per_second: float = 0.0
+    tokens_per_second: float = 0.0
+    elapsed_seconds: float = 0.0
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -8,7 +8,12 @@ LLM-as-judge 기반 RAG 평가 스크립트.
   - relevance / coverage / structure / language_quality
   - comment
   항목으로 질적 평가를 수행한 뒤
-- 사람 눈으로 바로 볼 수 있도록 TXT 리포트를 생성한다.
+- 사람 눈으로 바로 볼 수 있도록 TXT 리포트를, 차원별 평균과 케이스별 점수를 담은 JSON 리포트와 함께 생성한다.
+- 테스트 케이스는 JSON 파일(`EVAL_TESTSET_PATH`, 기본 `llm_judge_testset.json`)에서 읽는다.
+- 케이스(답변 받기 + 판정)는 `EVAL_CONCURRENCY` 개 스레드로 동시에 실행한다. (리포트 순서는 테스트셋 순서)
+- 판정 결과는 (judge 모델, 프롬프트 버전, 언어/질문/key point, 답변 해시) 로 캐시한다. (`EVAL_JUDGE_CACHE_PATH`)
+  - 답변이 그대로인 케이스는 다시 판정하지 않으므로, 검색만 바꾼 뒤 재실행하면 바뀐 답변만 판정 비용이 든다.
+  - 프롬프트 버전은 판정 프롬프트 본문의 해시라서, 프롬프트를 고치면 이전 캐시는 자동으로 쓰이지 않는다.
 
 실행 예시 (Windows PowerShell)
 -----
@@ -16,14 +21,33 @@ cd D:\\AI-change-app
 .\.venv\Scripts\Activate.ps1
 cd backend
 python -m app.eval_llm_judge
+$env:EVAL_CONCURRENCY = "8"; $env:EVAL_TESTSET_PATH = "my_cases.json"; python -m app.eval_llm_judge
+
+테스트셋 JSON 예시 스키마 (리스트 형태)
+-----
+[
+  {
+    "id": "ko_1",
+    "language": "ko",
+    "question": "성남복정1 C3BL 설계 변경 내용과 LCC 절감 효과를 알려줘.",
+    "expected_key_points": ["성남복정1 C3BL", "LCC 절감 효과"]
+  }
+]
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
-from typing import Any, Dict, List
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from langchain_openai import ChatOpenAI
@@ -32,52 +56,45 @@ from app.core.config import settings
 
 API_BASE_URL = os.getenv("WORKER_API_BASE", "http://localhost:8000")
 EVAL_MODEL = os.getenv("EVAL_MODEL", "gpt-4.1-mini")
+TESTSET_PATH = os.getenv("EVAL_TESTSET_PATH", "llm_judge_testset.json")
 OUTPUT_PATH = os.getenv("EVAL_OUTPUT_PATH", "rag_eval_llm_judge.txt")
+JSON_OUTPUT_PATH = os.getenv("EVAL_JSON_OUTPUT_PATH") or str(Path(OUTPUT_PATH).with_suffix(".json"))
+CONCURRENCY = max(1, int(os.getenv("EVAL_CONCURRENCY", "4")))
+# 빈 문자열이면 판정 캐시를 쓰지 않음
+JUDGE_CACHE_PATH = os.getenv("EVAL_JUDGE_CACHE_PATH", "llm_judge_cache.json")
 
+SCORE_KEYS = ("relevance", "coverage", "structure", "language_quality")
 
-# 1) 평가 대상 테스트 케이스 정의
-# 실제로 사용할 때는 이 리스트를 자유롭게 추가/수정하면 된다.
-TEST_CASES: List[Dict[str, Any]] = [
-    {
-        "id": "ko_1",
-        "language": "ko",
-        "question": "성남복정1 C3BL 설계 변경 내용과 LCC 절감 효과를 알려줘.",
-        "expected_key_points": [
-            "성남복정1 C3BL",
-            "LCC 절감 효과",
-        ],
-    },
-    {
-        "id": "ko_2",
-        "language": "ko",
-        "question": "가장 최근에 등록된 설계변경의 기관명, 사업명, 제안명, 제안일자를 알려줘.",
-        "expected_key_points": [
-            "가장 최근 설계변경",
-            "기관명",
-            "사업명",
-            "제안명",
-            "제안일자",
-        ],
-    },
-    {
-        "id": "zh_1",
-        "language": "zh",
-        "question": "请用中文说明最近的设计变更内容和节约成本效果。",
-        "expected_key_points": [
-            "最近 설계변경",
-            "节约成本",
-        ],
-    },
-    {
-        "id": "en_1",
-        "language": "en",
-        "question": "In English, summarize the latest design change and its impact on life-cycle cost (LCC).",
-        "expected_key_points": [
-            "latest design change",
-            "life-cycle cost",
-        ],
-    },
-]
+
+def load_test_cases(path: str) -> List[Dict[str, Any]]:
+    """테스트셋 JSON 로드. 각 항목은 id / language / question 이 필요하다."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path} 최상위는 리스트여야 합니다.")
+    for idx, case in enumerate(data, start=1):
+        missing = [key for key in ("id", "language", "question") if not case.get(key)]
+        if missing:
+            raise ValueError(f"{path} {idx}번째 케이스에 {', '.join(missing)} 가 없습니다.")
+        case.setdefault("expected_key_points", [])
+    return data
+
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """동시 실행 스레드가 keep-alive 커넥션을 나눠 쓰도록 풀 크기를 동시성에 맞춘 세션."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONCURRENCY)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
 
 
 def call_worker_chat(language: str, question: str) -> Dict[str, Any]:
@@ -88,20 +105,12 @@ def call_worker_chat(language: str, question: str) -> Dict[str, Any]:
         "question": question,
         "history": [],
     }
-    resp = requests.post(url, json=payload, timeout=60)
+    resp = _get_session().post(url, json=payload, timeout=60)
     resp.raise_for_status()
     return resp.json()
 
 
-def build_judge_chain() -> Any:
-    """LLM-as-judge 체인 구성."""
-    # config 에서 불러온 키를 환경변수에 주입 (ChatOpenAI 가 OPENAI_API_KEY 를 참조)
-    if settings.openai_api_key:
-        os.environ.setdefault("OPENAI_API_KEY", settings.openai_api_key)
-
-    llm = ChatOpenAI(model=EVAL_MODEL, temperature=0.0)
-
-    system_prompt = """
+JUDGE_SYSTEM_PROMPT = """
 You are an expert evaluator for a RAG-based design-change assistant
 used on construction design-change (VE) data.
 
@@ -155,7 +164,7 @@ Return ONLY a valid JSON object with the following keys:
 Do not include any extra keys, comments, or text outside the JSON object.
 """
 
-    human_prompt = """
+JUDGE_HUMAN_PROMPT = """
 [Language]
 {language}
 
@@ -171,10 +180,24 @@ Do not include any extra keys, comments, or text outside the JSON object.
 Please rate this answer according to the instructions.
 """
 
+# 판정 프롬프트가 바뀌면 캐시 키도 바뀌도록 본문 해시를 버전으로 쓴다.
+JUDGE_PROMPT_VERSION = hashlib.sha256(
+    (JUDGE_SYSTEM_PROMPT.strip() + "\n" + JUDGE_HUMAN_PROMPT.strip()).encode("utf-8")
+).hexdigest()[:12]
+
+
+def build_judge_chain() -> Any:
+    """LLM-as-judge 체인 구성."""
+    # config 에서 불러온 키를 환경변수에 주입 (ChatOpenAI 가 OPENAI_API_KEY 를 참조)
+    if settings.openai_api_key:
+        os.environ.setdefault("OPENAI_API_KEY", settings.openai_api_key)
+
+    llm = ChatOpenAI(model=EVAL_MODEL, temperature=0.0)
+
     prompt = ChatPromptTemplate.from_messages(
         [
-            ("system", system_prompt.strip()),
-            ("human", human_prompt.strip()),
+            ("system", JUDGE_SYSTEM_PROMPT.strip()),
+            ("human", JUDGE_HUMAN_PROMPT.strip()),
         ]
     )
 
@@ -182,6 +205,185 @@ Please rate this answer according to the instructions.
     return chain
 
 
+class JudgeCache:
+    """판정 결과 캐시 (JSON 파일). 키: judge 모델 / 프롬프트 버전 / 언어·질문·key point / 답변 해시."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None and self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"[WARN] 판정 캐시를 읽지 못해 새로 만듭니다: {e}")
+
+    @staticmethod
+    def key(case: Dict[str, Any], answer: str) -> str:
+        answer_hash = hashlib.sha256(answer.encode("utf-8")).hexdigest()
+        # coverage 점수는 key point 에 따라 달라지므로 질문과 함께 키에 넣는다.
+        payload = json.dumps(
+            [
+                EVAL_MODEL,
+                JUDGE_PROMPT_VERSION,
+                case["language"],
+                case["question"],
+                list(case.get("expected_key_points", [])),
+                answer_hash,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.path is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(entry["judge"])
+
+    def put(self, key: str, judge: Dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            self._entries[key] = {
+                "judge": judge,
+                "model": EVAL_MODEL,
+                "prompt_version": JUDGE_PROMPT_VERSION,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries, ensure_ascii=False, indent=1)
+            self._dirty = False
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def parse_judge(raw_judge: str) -> Tuple[Dict[str, Any], bool]:
+    """판정 JSON 파싱. ```json 코드 블록으로 감싸 온 경우도 허용한다. (결과, 성공 여부)"""
+    text = raw_judge.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("{") :] if "{" in text else text
+    try:
+        judge = json.loads(text)
+        if not isinstance(judge, dict):
+            raise ValueError("not an object")
+        return judge, True
+    except Exception:
+        return (
+            {
+                "relevance": None,
+                "coverage": None,
+                "structure": None,
+                "language_quality": None,
+                "comment": f"parse_error: {raw_judge[:200]}",
+            },
+            False,
+        )
+
+
+def run_case(case: Dict[str, Any], judge_chain: Any, cache: JudgeCache) -> Dict[str, Any]:
+    """답변을 받고, 같은 답변의 판정이 캐시에 없을 때만 judge 를 호출한다."""
+    chat_resp = call_worker_chat(case["language"], case["question"])
+    answer = chat_resp.get("answer", "")
+    sources = chat_resp.get("sources", [])
+
+    key = JudgeCache.key(case, answer)
+    judge = cache.get(key)
+    cached = judge is not None
+    parsed = True
+    if judge is None:
+        raw_judge = judge_chain.invoke(
+            {
+                "language": case["language"],
+                "question": case["question"],
+                "answer": answer,
+                "expected_key_points": "\n".join(case["expected_key_points"]),
+            }
+        )
+        judge, parsed = parse_judge(raw_judge)
+        # 파싱에 실패한 판정은 캐시하지 않아 다음 실행에서 다시 판정한다.
+        if parsed:
+            cache.put(key, judge)
+
+    print(f"=== Done case {case['id']} ({case['language']}, {'cached' if cached else 'judged'}) ===")
+    return {
+        "case_id": case["id"],
+        "language": case["language"],
+        "question": case["question"],
+        "answer": answer,
+        "sources": str(sources),
+        "relevance": judge.get("relevance"),
+        "coverage": judge.get("coverage"),
+        "structure": judge.get("structure"),
+        "language_quality": judge.get("language_quality"),
+        "comment": judge.get("comment", ""),
+        "judge_cached": cached,
+        "judge_parse_error": not parsed,
+    }
+
+
+def _averages(rows: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    averages: Dict[str, Optional[float]] = {}
+    for key in SCORE_KEYS:
+        scores = [row[key] for row in rows if isinstance(row.get(key), (int, float))]
+        averages[key] = round(sum(scores) / len(scores), 3) if scores else None
+    return averages
+
+
+def summarize(rows: List[Dict[str, Any]], elapsed_seconds: float) -> Dict[str, Any]:
+    languages = sorted({row["language"] for row in rows})
+    return {
+        "judge_model": EVAL_MODEL,
+        "prompt_version": JUDGE_PROMPT_VERSION,
+        "concurrency": CONCURRENCY,
+        "total_cases": len(rows),
+        "judged": sum(1 for row in rows if not row["judge_cached"]),
+        "cache_hits": sum(1 for row in rows if row["judge_cached"]),
+        "parse_errors": sum(1 for row in rows if row["judge_parse_error"]),
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "averages": _averages(rows),
+        "averages_by_language": {
+            language: _averages([row for row in rows if row["language"] == language]) for language in languages
+        },
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines: List[str] = ["=== SUMMARY (AVERAGE SCORES) ==="]
+    lines.append(f"- judge model     : {summary['judge_model']} (prompt {summary['prompt_version']})")
+    lines.append(
+        f"- cases           : {summary['total_cases']} "
+        f"(judged={summary['judged']}, cached={summary['cache_hits']}, parse_errors={summary['parse_errors']})"
+    )
+    lines.append(f"- elapsed         : {summary['elapsed_seconds']:.1f}s (concurrency={summary['concurrency']})")
+    for key in SCORE_KEYS:
+        value = summary["averages"][key]
+        lines.append(f"- avg {key:<16}: {value if value is not None else 'N/A'}")
+    for language, averages in summary["averages_by_language"].items():
+        scores = ", ".join(f"{key}={averages[key]}" for key in SCORE_KEYS)
+        lines.append(f"  - [{language}] {scores}")
+    lines.append("")
+    lines.append("")
+    return "\n".join(lines)
+
+
 def format_case_block(row: Dict[str, Any]) -> str:
     """각 테스트 케이스 결과를 사람 눈으로 보기 좋은 텍스트 블록으로 변환."""
     lines: List[str] = []
@@ -211,61 +413,34 @@ def format_case_block(row: Dict[str, Any]) -> str:
 
 
 def main() -> None:
+    print(f"[LLM JUDGE] Loading test cases from {TESTSET_PATH}")
+    cases = load_test_cases(TESTSET_PATH)
     judge_chain = build_judge_chain()
-
-    results: List[Dict[str, Any]] = []
-
-    for case in TEST_CASES:
-        print(f"=== Running case {case['id']} ({case['language']}) ===")
-        chat_resp = call_worker_chat(case["language"], case["question"])
-        answer = chat_resp.get("answer", "")
-        sources = chat_resp.get("sources", [])
-
-        # Judge 호출
-        import json
-
-        raw_judge = judge_chain.invoke(
-            {
-                "language": case["language"],
-                "question": case["question"],
-                "answer": answer,
-                "expected_key_points": "\n".join(case["expected_key_points"]),
-            }
-        )
-
-        try:
-            judge = json.loads(raw_judge)
-        except Exception:
-            judge = {
-                "relevance": None,
-                "coverage": None,
-                "structure": None,
-                "language_quality": None,
-                "comment": f"parse_error: {raw_judge[:200]}",
-            }
-
-        row: Dict[str, Any] = {
-            "case_id": case["id"],
-            "language": case["language"],
-            "question": case["question"],
-            "answer": answer,
-            "sources": str(sources),
-            "relevance": judge.get("relevance"),
-            "coverage": judge.get("coverage"),
-            "structure": judge.get("structure"),
-            "language_quality": judge.get("language_quality"),
-            "comment": judge.get("comment", ""),
-        }
-        results.append(row)
+    cache = JudgeCache(JUDGE_CACHE_PATH)
+
+    print(f"[LLM JUDGE] cases={len(cases)}, concurrency={CONCURRENCY}, prompt={JUDGE_PROMPT_VERSION}")
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="llm-judge") as pool:
+            results = list(pool.map(lambda case: run_case(case, judge_chain, cache), cases))
+    finally:
+        # 중간에 실패해도 이미 받은 판정은 다음 실행에서 다시 쓰도록 저장해 둔다.
+        cache.save()
+    summary = summarize(results, time.perf_counter() - started)
 
     # TXT 리포트 생성
     blocks = [format_case_block(r) for r in results]
-    report = "\n".join(blocks)
+    report = format_summary(summary) + "\n".join(blocks)
 
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         f.write(report)
+    with open(JSON_OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "cases": results}, f, ensure_ascii=False, indent=2)
 
-    print(f"\nSaved LLM-as-judge report to {OUTPUT_PATH}")
+    print(
+        f"\nSaved LLM-as-judge report to {OUTPUT_PATH} (JSON: {JSON_OUTPUT_PATH}, "
+        f"judged={summary['judged']}, cached={summary['cache_hits']})"
+    )
 
 
 if __name__ == "__main__":
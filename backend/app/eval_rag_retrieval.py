@@ -8,7 +8,16 @@ RAG retrieval 평가 스크립트.
   - 반환된 `sources` 의 문서 ID와 정답(`gold_doc_ids`)을 비교
 - hit@k / precision@k / recall@k 와
   - negative / oos 케이스에 대한 hallucination rate 를 계산
-- 사람 눈으로 확인하기 좋은 TXT 리포트를 생성한다.
+- 관련 문서가 없어 LLM 을 건너뛴 no-answer fast path 비율과,
+  응답의 `retrieval_score`(최고 코사인) 로 계산한 `no_answer_score_threshold` 추천값을 함께 출력
+- 사람 눈으로 확인하기 좋은 TXT 리포트와, 같은 내용을 기계가 읽기 좋은 JSON 리포트를 생성한다.
+- 케이스는 커넥션 풀을 공유하는 스레드 `RAG_EVAL_CONCURRENCY` 개로 동시에 실행한다. (리포트 순서는 테스트셋 순서)
+- `RAG_EVAL_MODE=retrieval` 이면 서버/LLM 없이 in-process 로 검색만 한다.
+  - 질문 임베딩을 한 번에 여러 개씩 만들고 `agent.retrieve_documents` 로 검색/재정렬
+  - no-answer 판정과 컨텍스트 토큰 예산(sources)은 `/worker/chat` 과 같은 규칙을 적용
+  - 규칙 기반 라우터(최근 N건 등)와 답변 캐시는 거치지 않는다.
+- `RAG_DIMENSION_SWEEP` 을 주면 서버와 별도로, 저장된 faiss_index 벡터를 앞 N 차원으로 잘라
+  차원별 recall@k / 검색 지연 / 인덱스 메모리를 비교한 표를 리포트 끝에 덧붙인다. (질문 임베딩만 OpenAI 호출)
 
 실행 예시 (Windows PowerShell)
 -----
@@ -16,6 +25,8 @@ cd D:\\AI-change-app
 .\.venv\Scripts\Activate.ps1
 cd backend
 python -m app.eval_rag_retrieval
+$env:RAG_EVAL_MODE = "retrieval"; python -m app.eval_rag_retrieval
+$env:RAG_DIMENSION_SWEEP = "256,512,1024,1536"; python -m app.eval_rag_retrieval
 
 테스트셋 JSON 예시 스키마 (리스트 형태)
 -----
@@ -39,17 +50,30 @@ python -m app.eval_rag_retrieval
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
+from pathlib import Path
+import threading
+import time
 from typing import Any, Dict, List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 API_BASE_URL = os.getenv("WORKER_API_BASE", "http://localhost:8000")
 TESTSET_PATH = os.getenv("RAG_TESTSET_PATH", "rag_testset.json")
 OUTPUT_PATH = os.getenv("RAG_RETRIEVAL_OUTPUT_PATH", "rag_eval_retrieval.txt")
+JSON_OUTPUT_PATH = os.getenv("RAG_RETRIEVAL_JSON_PATH") or str(Path(OUTPUT_PATH).with_suffix(".json"))
 TOP_K = int(os.getenv("RAG_TOP_K", "5"))
+# "http": /worker/chat 호출 (기본) / "retrieval": 서버/LLM 없이 in-process 검색만
+EVAL_MODE = os.getenv("RAG_EVAL_MODE", "http").strip().lower()
+CONCURRENCY = max(1, int(os.getenv("RAG_EVAL_CONCURRENCY", "8")))
+# retrieval 모드에서 임베딩 요청 1건에 넣을 질문 수
+EMBED_BATCH_SIZE = max(1, int(os.getenv("RAG_EVAL_EMBED_BATCH", "256")))
+# 예: "256,512,1024,1536" (비어 있으면 차원 비교를 하지 않음)
+DIMENSION_SWEEP = [int(d) for d in os.getenv("RAG_DIMENSION_SWEEP", "").split(",") if d.strip()]
 
 
 def load_test_cases(path: str) -> List[Dict[str, Any]]:
@@ -61,6 +85,23 @@ def load_test_cases(path: str) -> List[Dict[str, Any]]:
     return data
 
 
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """동시 실행 스레드가 keep-alive 커넥션을 나눠 쓰도록 풀 크기를 동시성에 맞춘 세션."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONCURRENCY)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
 def call_worker_chat(language: str, question: str) -> Dict[str, Any]:
     """백엔드 `/worker/chat` 호출."""
     url = f"{API_BASE_URL}/worker/chat"
@@ -69,11 +110,56 @@ def call_worker_chat(language: str, question: str) -> Dict[str, Any]:
         "question": question,
         "history": [],
     }
-    resp = requests.post(url, json=payload, timeout=60)
+    resp = _get_session().post(url, json=payload, timeout=60)
     resp.raise_for_status()
     return resp.json()
 
 
+def run_http_cases(cases: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+    """케이스를 동시에 `/worker/chat` 으로 보내고 (응답, 지연 ms) 를 테스트셋 순서대로 돌려준다."""
+
+    def run(case: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        started = time.perf_counter()
+        resp = call_worker_chat(case.get("language", "ko"), case.get("question", ""))
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"=== Done case {case.get('id', 'unknown')} ({elapsed:.0f} ms) ===")
+        return resp, elapsed
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="rag-eval") as pool:
+        return list(pool.map(run, cases))
+
+
+def run_retrieval_cases(cases: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+    """서버/LLM 없이 in-process 로 검색만 해서 `/worker/chat` 응답과 같은 모양(sources/route/score)을 만든다."""
+    from .core.config import settings
+    from .services.agent import retrieve_documents
+    from .services.context_packer import pack_context
+    from .services.vectorstore import embed_texts
+
+    questions = [case.get("question", "") for case in cases]
+    vectors: List[List[float]] = []
+    for start in range(0, len(questions), EMBED_BATCH_SIZE):
+        vectors.extend(embed_texts(questions[start : start + EMBED_BATCH_SIZE]))
+    print(f"[RAG EVAL] Embedded {len(vectors)} questions")
+
+    def run(item: Tuple[str, List[float]]) -> Tuple[Dict[str, Any], float]:
+        question, vector = item
+        started = time.perf_counter()
+        retrieval = retrieve_documents(question, vector)
+        top_score = round(retrieval.top_score, 4) if retrieval.top_score is not None else None
+        # _worker_chat 과 같은 규칙: 임계값 미만이면 no-answer, 아니면 토큰 예산 안에 들어간 문서가 sources
+        if settings.no_answer_enabled and (top_score is None or top_score < settings.no_answer_score_threshold):
+            resp: Dict[str, Any] = {"sources": [], "route": "no_answer", "retrieval_score": top_score}
+        else:
+            packed = pack_context(retrieval.docs, settings.context_token_budget)
+            sources = [{"id": (d.metadata or {}).get("id")} for d in packed.docs]
+            resp = {"sources": sources, "route": "rag", "retrieval_score": top_score}
+        return resp, (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="rag-eval") as pool:
+        return list(pool.map(run, zip(questions, vectors)))
+
+
 def compute_retrieval_metrics(
     gold_ids: List[str], returned_ids: List[str], k: int
 ) -> Tuple[int, float, float]:
@@ -105,6 +191,132 @@ def compute_retrieval_metrics(
     return hit, precision, recall
 
 
+def suggest_no_answer_threshold(
+    positive_scores: List[float], negative_scores: List[float]
+) -> Tuple[float, float] | None:
+    """positive 는 통과, negative 는 fast path 로 빠지도록 하는 정확도 최대 임계값과 그 정확도.
+
+    동점이면 positive 를 덜 잃는 낮은 임계값을 고른다.
+    """
+    if not positive_scores or not negative_scores:
+        return None
+
+    total = len(positive_scores) + len(negative_scores)
+    best: Tuple[float, float] | None = None
+    for threshold in sorted(set(positive_scores + negative_scores)):
+        correct = sum(1 for s in positive_scores if s >= threshold) + sum(
+            1 for s in negative_scores if s < threshold
+        )
+        accuracy = correct / total
+        if best is None or accuracy > best[1]:
+            best = (threshold, accuracy)
+    return best
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_dimension_sweep(cases: List[Dict[str, Any]], dims_list: List[int]) -> List[Dict[str, Any]]:
+    """저장된 벡터를 앞 N 차원으로 잘라(Matryoshka) 차원별 검색 품질/지연/메모리를 측정. (서버 없이 in-process)
+
+    - recall@k / hit@k : positive/multi 케이스의 정답 문서 기준
+    - agreement@k      : 가장 큰 차원의 top-k 레코드와 겹치는 비율
+    - latency          : 질문 1건당 index.search 시간 (IndexFlatL2)
+    """
+    import faiss
+    import numpy as np
+
+    from .core.config import settings
+    from .services.vectorstore import embed_texts, load_vectorstore, truncate_embeddings
+
+    vs = load_vectorstore()
+    total = vs.index.ntotal
+    positives = [c for c in cases if c.get("gold_doc_ids")]
+    if total == 0 or not positives:
+        return []
+
+    stored = vs.index.reconstruct_n(0, total)
+    record_ids = [
+        (vs.docstore.search(vs.index_to_docstore_id[i]).metadata or {}).get("id") for i in range(total)
+    ]
+    questions = np.asarray(embed_texts([c.get("question", "") for c in positives]), dtype=np.float32)
+
+    usable = sorted({d for d in dims_list if d <= stored.shape[1]})
+    skipped = sorted({d for d in dims_list if d > stored.shape[1]})
+    if skipped:
+        print(f"[RAG EVAL] 저장된 벡터({stored.shape[1]}차원)보다 큰 차원은 건너뜀: {skipped}")
+
+    fetch = min(total, TOP_K * max(1, settings.chunk_search_multiplier))
+    per_dims: Dict[int, List[List[str]]] = {}
+    rows: List[Dict[str, Any]] = []
+    for dims in usable:
+        index = faiss.IndexFlatL2(dims)
+        index.add(truncate_embeddings(stored, dims))
+        queries = truncate_embeddings(questions, dims)
+
+        latencies: List[float] = []
+        returned: List[List[str]] = []
+        for query in queries:
+            started = time.perf_counter()
+            _, indices = index.search(query[None, :], fetch)
+            latencies.append((time.perf_counter() - started) * 1000)
+            ids: List[str] = []
+            for idx in indices[0]:
+                record_id = record_ids[idx] if idx != -1 else None
+                if record_id and record_id not in ids:
+                    ids.append(record_id)
+            returned.append(ids[:TOP_K])
+        per_dims[dims] = returned
+
+        metrics = [
+            compute_retrieval_metrics(c.get("gold_doc_ids", []), ids, TOP_K)
+            for c, ids in zip(positives, returned)
+        ]
+        rows.append(
+            {
+                "dimensions": dims,
+                "hit_at_k": sum(m[0] for m in metrics) / len(metrics),
+                "recall_at_k": sum(m[2] for m in metrics) / len(metrics),
+                "latency_ms_p50": _percentile(latencies, 0.5),
+                "latency_ms_p95": _percentile(latencies, 0.95),
+                "index_mb": total * dims * 4 / (1024 * 1024),
+            }
+        )
+
+    if usable:
+        reference = per_dims[usable[-1]]
+        for row in rows:
+            overlaps = [
+                len(set(a) & set(b)) / max(1, len(b))
+                for a, b in zip(per_dims[row["dimensions"]], reference)
+            ]
+            row["agreement_at_k"] = sum(overlaps) / len(overlaps)
+    return rows
+
+
+def format_dimension_sweep(rows: List[Dict[str, Any]]) -> List[str]:
+    lines = ["=== EMBEDDING DIMENSION SWEEP (stored vectors, in-process) ==="]
+    if not rows:
+        lines.append("(no vectors or positive cases)")
+        return lines
+    lines.append(
+        f"{'dims':>6} | {'hit@' + str(TOP_K):>7} | {'recall@' + str(TOP_K):>9} | "
+        f"{'agree@' + str(TOP_K):>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'index MB':>9}"
+    )
+    for row in rows:
+        lines.append(
+            f"{row['dimensions']:>6} | {row['hit_at_k']:>7.3f} | {row['recall_at_k']:>9.3f} | "
+            f"{row['agreement_at_k']:>8.3f} | {row['latency_ms_p50']:>8.3f} | "
+            f"{row['latency_ms_p95']:>8.3f} | {row['index_mb']:>9.2f}"
+        )
+    lines.append("")
+    return lines
+
+
 def format_case_block(row: Dict[str, Any]) -> str:
     """각 테스트 케이스 결과를 텍스트 블록으로 변환."""
     lines: List[str] = []
@@ -132,6 +344,13 @@ def format_case_block(row: Dict[str, Any]) -> str:
 def main() -> None:
     print(f"[RAG EVAL] Loading test cases from {TESTSET_PATH}")
     cases = load_test_cases(TESTSET_PATH)
+    if EVAL_MODE not in ("http", "retrieval"):
+        raise ValueError(f"RAG_EVAL_MODE 는 http 또는 retrieval 이어야 합니다: {EVAL_MODE}")
+
+    print(f"[RAG EVAL] mode={EVAL_MODE}, cases={len(cases)}, concurrency={CONCURRENCY}")
+    started = time.perf_counter()
+    responses = run_retrieval_cases(cases) if EVAL_MODE == "retrieval" else run_http_cases(cases)
+    elapsed_seconds = time.perf_counter() - started
 
     pos_hit_sum = 0
     pos_prec_sum = 0.0
@@ -141,20 +360,26 @@ def main() -> None:
     neg_cnt = 0
     neg_hallu_cnt = 0
 
+    fast_path_cnt = 0
+    neg_fast_path_cnt = 0
+    pos_fast_path_cnt = 0
+    pos_scores: List[float] = []
+    neg_scores: List[float] = []
+
     rows: List[Dict[str, Any]] = []
 
-    for case in cases:
+    for case, (chat_resp, latency_ms) in zip(cases, responses):
         case_id = case.get("id", "unknown")
         language = case.get("language", "ko")
         question = case.get("question", "")
         gold_doc_ids: List[str] = case.get("gold_doc_ids", []) or []
         case_type = case.get("type", "positive")
 
-        print(f"=== Running case {case_id} (lang={language}, type={case_type}) ===")
-
-        chat_resp = call_worker_chat(language, question)
         sources = chat_resp.get("sources", [])
         returned_ids = [str(s.get("id", "")) for s in sources if s.get("id")]
+        fast_path = 1 if chat_resp.get("route") == "no_answer" else 0
+        retrieval_score = chat_resp.get("retrieval_score")
+        fast_path_cnt += fast_path
 
         row: Dict[str, Any] = {
             "case_id": case_id,
@@ -163,6 +388,9 @@ def main() -> None:
             "question": question,
             "gold_doc_ids": gold_doc_ids,
             "returned_ids": returned_ids[:TOP_K],
+            "fast_path": fast_path,
+            "retrieval_score": retrieval_score,
+            "latency_ms": round(latency_ms, 1),
         }
 
         # positive / multi 케이스: retrieval 성능 계산
@@ -176,6 +404,9 @@ def main() -> None:
             pos_prec_sum += prec
             pos_rec_sum += rec
             pos_cnt += 1
+            pos_fast_path_cnt += fast_path
+            if retrieval_score is not None:
+                pos_scores.append(float(retrieval_score))
 
             row["hallucination"] = None
         else:
@@ -183,6 +414,9 @@ def main() -> None:
             neg_cnt += 1
             hallucination = 1 if returned_ids else 0
             neg_hallu_cnt += hallucination
+            neg_fast_path_cnt += fast_path
+            if retrieval_score is not None:
+                neg_scores.append(float(retrieval_score))
             row["hit_at_k"] = "-"
             row["precision_at_k"] = "-"
             row["recall_at_k"] = "-"
@@ -200,11 +434,15 @@ def main() -> None:
             prec = row.get("precision_at_k", "-")
             rec = row.get("recall_at_k", "-")
             per_case_lines.append(
-                f"{case_label}: hit@{TOP_K}={hit}, precision@{TOP_K}={prec}, recall@{TOP_K}={rec}"
+                f"{case_label}: hit@{TOP_K}={hit}, precision@{TOP_K}={prec}, recall@{TOP_K}={rec}, "
+                f"fast_path={row['fast_path']}, score={row['retrieval_score']}"
             )
         else:  # negative / oos
             hallu = row.get("hallucination", "-")
-            per_case_lines.append(f"{case_label}: hallucination={hallu}")
+            per_case_lines.append(
+                f"{case_label}: hallucination={hallu}, "
+                f"fast_path={row['fast_path']}, score={row['retrieval_score']}"
+            )
 
     per_case_lines.append("")
 
@@ -215,6 +453,15 @@ def main() -> None:
     summary_lines.append(f"- positive/multi cases  : {pos_cnt}")
     summary_lines.append(f"- negative/oos cases    : {neg_cnt}")
     summary_lines.append("")
+    latencies = [row["latency_ms"] for row in rows]
+    summary_lines.append(f"- mode                  : {EVAL_MODE} (concurrency={CONCURRENCY})")
+    summary_lines.append(
+        f"- elapsed               : {elapsed_seconds:.2f}s ({len(cases) / max(elapsed_seconds, 1e-9):.1f} cases/s)"
+    )
+    summary_lines.append(
+        f"- case latency p50/p95  : {_percentile(latencies, 0.5):.1f} / {_percentile(latencies, 0.95):.1f} ms"
+    )
+    summary_lines.append("")
 
     if pos_cnt > 0:
         avg_hit = pos_hit_sum / pos_cnt
@@ -234,8 +481,32 @@ def main() -> None:
     else:
         summary_lines.append(f"- hallucination rate    : N/A")
 
+    # no-answer fast path (LLM 미호출) 비율
+    summary_lines.append("")
+    if cases:
+        summary_lines.append(f"- fast-path rate        : {fast_path_cnt / len(cases):.3f}  (all cases)")
+    else:
+        summary_lines.append("- fast-path rate        : N/A")
+    if neg_cnt > 0:
+        summary_lines.append(f"- fast-path rate (neg)  : {neg_fast_path_cnt / neg_cnt:.3f}  (negative/oos, 높을수록 좋음)")
+    if pos_cnt > 0:
+        summary_lines.append(f"- fast-path rate (pos)  : {pos_fast_path_cnt / pos_cnt:.3f}  (positive/multi, 낮을수록 좋음)")
+
+    suggestion = suggest_no_answer_threshold(pos_scores, neg_scores)
+    if suggestion is not None:
+        threshold, accuracy = suggestion
+        summary_lines.append(
+            f"- suggested no_answer_score_threshold : {threshold:.4f}  (accuracy={accuracy:.3f})"
+        )
+
     summary_lines.append("")
 
+    sweep_rows: List[Dict[str, Any]] = []
+    if DIMENSION_SWEEP:
+        print(f"[RAG EVAL] Embedding dimension sweep: {DIMENSION_SWEEP}")
+        sweep_rows = run_dimension_sweep(cases, DIMENSION_SWEEP)
+        summary_lines.extend(format_dimension_sweep(sweep_rows))
+
     # TXT 리포트 작성
     # 상세 블록은 생략하고, 케이스별 요약 + 평균 지표만 출력
     report = "\n".join(per_case_lines) + "\n" + "\n".join(summary_lines)
@@ -243,7 +514,35 @@ def main() -> None:
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         f.write(report)
 
-    print(f"\n[RAG EVAL] Saved retrieval report to {OUTPUT_PATH}")
+    summary: Dict[str, Any] = {
+        "mode": EVAL_MODE,
+        "concurrency": CONCURRENCY,
+        "top_k": TOP_K,
+        "total_cases": len(cases),
+        "positive_cases": pos_cnt,
+        "negative_cases": neg_cnt,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "latency_ms_p50": _percentile(latencies, 0.5),
+        "latency_ms_p95": _percentile(latencies, 0.95),
+        "avg_hit_at_k": pos_hit_sum / pos_cnt if pos_cnt else None,
+        "avg_precision_at_k": pos_prec_sum / pos_cnt if pos_cnt else None,
+        "avg_recall_at_k": pos_rec_sum / pos_cnt if pos_cnt else None,
+        "hallucination_rate": neg_hallu_cnt / neg_cnt if neg_cnt else None,
+        "fast_path_rate": fast_path_cnt / len(cases) if cases else None,
+        "fast_path_rate_negative": neg_fast_path_cnt / neg_cnt if neg_cnt else None,
+        "fast_path_rate_positive": pos_fast_path_cnt / pos_cnt if pos_cnt else None,
+        "suggested_no_answer_score_threshold": suggestion[0] if suggestion else None,
+        "suggested_threshold_accuracy": suggestion[1] if suggestion else None,
+    }
+    with open(JSON_OUTPUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(
+            {"summary": summary, "cases": rows, "dimension_sweep": sweep_rows},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    print(f"\n[RAG EVAL] Saved retrieval report to {OUTPUT_PATH} (JSON: {JSON_OUTPUT_PATH})")
 
 
 if __name__ == "__main__":
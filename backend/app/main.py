@@ -1,16 +1,40 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+import asyncio
+from datetime import date, datetime
+import math
+import time
+from pathlib import Path
+from typing import Any, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from .services.agent import worker_chat, translate_latest_metadata_fields
+from .services.answer_cache import ANSWER_CACHE
+from .services.change_index import CHANGE_INDEX
+from .services.change_notifier import CHANGE_NOTIFIER
+from .services.change_stream import CHANGE_HUB, format_change_event
+from .services.import_jobs import IMPORT_JOBS, SUPPORTED_SUFFIXES
+from .services.http_clients import close_http_clients, http2_available
+from .services.metrics import METRICS, Family, MetricsMiddleware, cache_hit_ratio
+from .services.numeric_store import NUMERIC_STORE
+from .services.singleflight import CHAT_FLIGHTS, TRANSLATE_FLIGHTS
+from .services.upload_spool import MULTIPART_OVERHEAD_BYTES, UploadRejected, spool_multipart_file
+from .services.upstream import UpstreamUnavailable, upstream_stats
 from .core.config import settings
 from .core.models import (
     AdminChangeResponse,
+    AnalyticsAggregate,
+    AnalyticsGroupBy,
+    AnalyticsMetric,
+    AnalyticsResponse,
     DesignChangeInput,
+    DesignChangeRecord,
+    ImportJobResponse,
     LatestChangeResponse,
     LatestChangeSummary,
     LatestChangeTranslatedResponse,
@@ -18,7 +42,16 @@ from .core.models import (
     WorkerChatResponse,
     LanguageCode,
 )
-from .services.vectorstore import add_design_change, get_latest_change, load_vectorstore
+from .services.vectorstore import (
+    QUERY_EMBED_BATCHER,
+    SEARCH_BATCHER,
+    add_design_change,
+    get_change_index,
+    get_latest_change,
+    get_numeric_store,
+    index_stats,
+    load_vectorstore,
+)
 
 app = FastAPI(
     title="AI Design Change App",
@@ -33,7 +66,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 웹(Flutter web)에서 ETag 를 읽어 If-None-Match 로 돌려보낼 수 있도록 노출
+    expose_headers=["ETag"],
 )
+# CORS 바깥에 두어 preflight 를 포함한 모든 요청의 지연을 잰다.
+app.add_middleware(MetricsMiddleware)
+
+
+def _collect_app_metrics() -> List[Family]:
+    """이미 각 서비스가 세고 있는 캐시/인덱스/upstream 상태를 scrape 시점에 읽어 메트릭으로 바꾼다."""
+    cache = ANSWER_CACHE.stats()
+    flights = {"worker_chat": CHAT_FLIGHTS.stats(), "latest_change_translated": TRANSLATE_FLIGHTS.stats()}
+    batchers = {"query_embedding": QUERY_EMBED_BATCHER.stats(), "faiss_search": SEARCH_BATCHER.stats()}
+    index = index_stats()
+    upstream = upstream_stats()
+    loaded_stores = [
+        (name, store)
+        for name, store in (("change_index", CHANGE_INDEX), ("numeric_store", NUMERIC_STORE))
+        if store.loaded
+    ]
+
+    upstream_counters = [
+        ({"model": model, "outcome": key}, stats[key])
+        for model, stats in upstream.items()
+        for key in ("succeeded", "failed", "retries", "rejected_breaker", "rejected_rate_limit", "rejected_queue")
+    ]
+    return [
+        ("app_answer_cache_lookups_total", "counter", "Worker chat answer cache lookups.", [
+            ({"result": "hit"}, cache["hits"]),
+            ({"result": "miss"}, cache["misses"]),
+        ]),
+        ("app_cache_hit_ratio", "gauge", "Hit ratio since process start.", [
+            ({"cache": "answer"}, cache["hit_rate"]),
+            ({"cache": "translation"}, cache_hit_ratio("translation")),
+        ]),
+        ("app_answer_cache_entries", "gauge", "Entries held in the answer cache.", [({}, cache["entries"])]),
+        ("app_coalesced_requests_total", "counter", "Single-flight requests that ran or joined an in-flight call.", [
+            ({"flight": name, "result": result}, stats[result])
+            for name, stats in flights.items()
+            for result in ("executed", "shared")
+        ]),
+        ("app_microbatch_batches_total", "counter", "Micro-batches flushed.", [
+            ({"batcher": name}, stats["batches"]) for name, stats in batchers.items()
+        ]),
+        ("app_microbatch_items_total", "counter", "Items submitted to micro-batchers.", [
+            ({"batcher": name}, stats["items"]) for name, stats in batchers.items()
+        ]),
+        ("app_faiss_vectors", "gauge", "Vectors (passages) in the loaded FAISS index.", [({}, index["vectors"])]),
+        ("app_faiss_dimensions", "gauge", "Embedding dimensions of the loaded FAISS index.", [({}, index["dimensions"])]),
+        ("app_faiss_vector_bytes", "gauge", "Raw float32 vector memory of the FAISS index.", [({}, index["vector_bytes"])]),
+        ("app_index_generation", "gauge", "Vector store generation (bumps on every commit).", [({}, index["generation"])]),
+        # get_change_index()/get_numeric_store() 는 처음 호출 때 디스크에서 읽으므로, scrape 는 이미 올라온 것만 센다.
+        ("app_change_records", "gauge", "Records in the in-memory change index / numeric store (loaded only).", [
+            ({"store": name}, len(store)) for name, store in loaded_stores
+        ]),
+        ("app_upstream_calls_total", "counter", "Upstream (OpenAI) calls by outcome.", upstream_counters),
+        ("app_upstream_concurrency_limit", "gauge", "Current AIMD concurrency limit per model.", [
+            ({"model": model}, stats["limit"]) for model, stats in upstream.items()
+        ]),
+        ("app_upstream_inflight", "gauge", "Upstream calls currently running per model.", [
+            ({"model": model}, stats["inflight"]) for model, stats in upstream.items()
+        ]),
+        ("app_upstream_queue_depth", "gauge", "Callers waiting for an upstream slot per model.", [
+            ({"model": model}, stats["queue_depth"]) for model, stats in upstream.items()
+        ]),
+        ("app_upstream_breaker_open", "gauge", "1 while the circuit breaker rejects calls (open or half_open).", [
+            ({"model": model}, 0 if stats["breaker"] == "closed" else 1) for model, stats in upstream.items()
+        ]),
+        ("app_change_stream_subscribers", "gauge", "Open SSE change-stream connections.", [
+            ({}, CHANGE_HUB.stats()["subscribers"]),
+        ]),
+        ("app_long_poll_waiters", "gauge", "Requests parked on /worker/latest-change?wait=.", [
+            ({}, CHANGE_NOTIFIER.stats()["waiters"]),
+        ]),
+    ]
+
+
+METRICS.register_collector(_collect_app_metrics)
 
 
 @app.on_event("startup")
@@ -45,6 +154,17 @@ def startup_event() -> None:
 
     load_vectorstore()
     print("[INFO] FAISS vector store loaded or initialized.")
+    # long-poll 엔드포인트(async)에서 파일을 읽지 않도록 최신 레코드를 미리 읽어 둔다.
+    get_latest_change()
+    # 변경 스트림 재개(Last-Event-ID)에 쓰는 인덱스도 미리 채운다.
+    print(f"[INFO] Change index loaded ({len(get_change_index())} records).")
+    print(f"[INFO] VE numeric store loaded ({len(get_numeric_store())} records).")
+    print(f"[INFO] Shared OpenAI HTTP client ready (http2={http2_available()}).")
+
+
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    close_http_clients()
 
 
 @app.get("/health", tags=["system"])
@@ -56,6 +176,63 @@ def health_check() -> dict[str, Any]:
     }
 
 
+@app.get("/system/answer-cache", tags=["system"])
+def answer_cache_stats() -> dict[str, Any]:
+    """작업자 챗봇 답변 캐시의 hit rate / 절약된 지연 시간 등 통계."""
+    return {
+        "enabled": settings.answer_cache_enabled,
+        "similarity_threshold": settings.answer_cache_similarity_threshold,
+        **ANSWER_CACHE.stats(),
+    }
+
+
+@app.get("/system/coalescing", tags=["system"])
+def coalescing_stats() -> dict[str, Any]:
+    """동시 동일 요청 합치기(single-flight) 통계. shared 가 클수록 절약된 upstream 호출이 많다."""
+    return {
+        "worker_chat": CHAT_FLIGHTS.stats(),
+        "latest_change_translated": TRANSLATE_FLIGHTS.stats(),
+    }
+
+
+@app.get("/system/upstream", tags=["system"])
+def upstream_governor_stats() -> dict[str, Any]:
+    """모델별 OpenAI 호출 제어 상태: 동시성 한도/대기열 길이/재시도/거절 횟수/브레이커 상태."""
+    return upstream_stats()
+
+
+def _service_unavailable(e: UpstreamUnavailable) -> HTTPException:
+    """upstream 과부하/장애는 500 대신 503 + Retry-After 로 알려 클라이언트가 잠시 후 재시도하게 한다."""
+    return HTTPException(
+        status_code=503,
+        detail=f"Upstream temporarily unavailable: {e}",
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+
+@app.get("/system/change-stream", tags=["system"])
+def change_stream_stats() -> dict[str, Any]:
+    """변경 알림 상태: SSE 구독자 수, 보낸 이벤트 수, 느려서 끊은 구독자 수, long-poll 대기 요청 수."""
+    return {**CHANGE_HUB.stats(), "long_poll": CHANGE_NOTIFIER.stats()}
+
+
+@app.get("/system/batching", tags=["system"])
+def batching_stats() -> dict[str, Any]:
+    """질문 임베딩 / FAISS 검색 마이크로 배칭 통계. avg_batch_size 가 1 보다 클수록 호출이 합쳐진 것."""
+    return {
+        "query_embedding": QUERY_EMBED_BATCHER.stats(),
+        "faiss_search": SEARCH_BATCHER.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Prometheus 텍스트 형식 메트릭 (단계별 지연 히스토그램, 엔드포인트별 지연, 캐시/인덱스/upstream 상태)."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/admin/changes", response_model=AdminChangeResponse, tags=["admin"])
 def create_design_change(change: DesignChangeInput) -> AdminChangeResponse:
     """
@@ -69,33 +246,202 @@ def create_design_change(change: DesignChangeInput) -> AdminChangeResponse:
 
     try:
         record = add_design_change(change)
+    except UpstreamUnavailable as e:
+        raise _service_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add design change: {e}")
 
     return AdminChangeResponse(success=True, change=record)
 
 
+@app.post(
+    "/admin/imports",
+    response_model=ImportJobResponse,
+    status_code=202,
+    tags=["admin"],
+    # 본문을 직접 스트리밍으로 읽으므로 문서용 요청 스키마만 따로 적어 둔다.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    },
+)
+async def create_import_job(request: Request) -> ImportJobResponse:
+    """
+    VE 제안 목록 CSV/XLSX 를 업로드하면 디스크에 저장한 뒤 백그라운드 인제스트 작업으로 등록한다.
+    - 요청은 파일 저장까지만 기다리고 바로 202 + 작업 정보를 돌려준다.
+    - 본문은 받는 대로 import_dir 에 바로 쓴다. (임시 파일을 거쳐 다시 복사하지 않음)
+    - Content-Length 가 한도를 넘으면 본문을 읽기 전에, 없으면 받는 도중 한도를 넘는 순간 413.
+    - 진행 상황은 `GET /admin/imports/{id}` 로 조회.
+    """
+    if not settings.openai_api_key:
+        raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not configured.")
+
+    max_bytes = settings.import_max_upload_mb * 1024 * 1024
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File is larger than {settings.import_max_upload_mb} MB.",
+        )
+
+    try:
+        filename, spool_path = await spool_multipart_file(
+            request.stream(),
+            request.headers.get("content-type"),
+            settings.import_dir_path,
+            field_name="file",
+            suffixes=SUPPORTED_SUFFIXES,
+            max_bytes=max_bytes,
+            run_sync=run_in_threadpool,
+        )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    job = IMPORT_JOBS.submit(filename, spool_path)
+    return job.to_response()
+
+
+@app.get("/admin/imports", response_model=List[ImportJobResponse], tags=["admin"])
+def list_import_jobs() -> List[ImportJobResponse]:
+    """최근 인제스트 작업 목록 (최신순)."""
+    return [job.to_response() for job in IMPORT_JOBS.list()]
+
+
+@app.get("/admin/imports/{job_id}", response_model=ImportJobResponse, tags=["admin"])
+def get_import_job(job_id: str) -> ImportJobResponse:
+    """인제스트 작업 상태: 처리/실패 행 수, rows/s, tokens/s, 남은 시간(ETA)."""
+    job = IMPORT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found.")
+    return job.to_response()
+
+
+def _latest_change_etag(record: Optional[DesignChangeRecord]) -> str:
+    # 레코드 ID 는 한 번 만들어지면 바뀌지 않으므로 strong ETag 로 충분하다.
+    return f'"{record.id}"' if record is not None else '"none"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @app.get("/worker/latest-change", response_model=LatestChangeResponse, tags=["worker"])
-def get_latest_change_for_worker() -> LatestChangeResponse:
+async def get_latest_change_for_worker(
+    if_none_match: Optional[str] = Header(default=None),
+    wait: float = Query(
+        default=0.0,
+        ge=0.0,
+        le=settings.latest_change_max_wait_seconds,
+        description="If-None-Match 와 같으면 새 변경이 커밋되거나 이 시간(초)이 지날 때까지 응답을 보류",
+    ),
+) -> Response:
     """
     작업자 페이지에서 폴링해서 확인할 수 있는 최신 설계 변경 요약.
     - Flutter 쪽에서는 마지막으로 본 id 를 로컬에 저장해 두었다가,
       여기서 받은 latest.id 와 다르면 '새로운 설계변경이 있습니다' 알림을 띄우면 됨.
+    - 응답에 ETag(최신 레코드 id)를 붙이고, If-None-Match 가 같으면 본문 없이 304 를 돌려준다.
+    - wait>0 이면 바뀔 때까지(또는 wait 초) 스레드를 잡지 않고 대기하는 long-poll 로 동작한다.
     """
+    # 레코드를 읽기 전에 version 을 잡아야 그 사이에 들어온 커밋을 놓치지 않는다.
+    version = CHANGE_NOTIFIER.version
     record = get_latest_change()
+    etag = _latest_change_etag(record)
+
+    if wait > 0 and _etag_matches(if_none_match, etag):
+        if await CHANGE_NOTIFIER.wait(version, wait):
+            record = get_latest_change()
+            etag = _latest_change_etag(record)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
     if record is None:
-        return LatestChangeResponse(has_change=False, latest=None)
+        body = LatestChangeResponse(has_change=False, latest=None)
+    else:
+        summary = LatestChangeSummary(
+            id=record.id,
+            change_date=record.change_date,
+            title=record.title,
+            created_at=record.created_at,
+            organization=record.organization,
+            project_name=record.project_name,
+            client=record.client,
+        )
+        body = LatestChangeResponse(has_change=True, latest=summary)
+    return JSONResponse(content=jsonable_encoder(body), headers=headers)
 
-    summary = LatestChangeSummary(
-        id=record.id,
-        change_date=record.change_date,
-        title=record.title,
-        created_at=record.created_at,
-        organization=record.organization,
-        project_name=record.project_name,
-        client=record.client,
+
+@app.get("/worker/changes/stream", tags=["worker"])
+async def stream_changes(
+    last_event_id: Optional[str] = Header(default=None),
+    since: Optional[int] = Query(
+        default=None, ge=-1, description="이 seq 다음부터 다시 받기 (Last-Event-ID 헤더를 못 쓰는 클라이언트용)"
+    ),
+) -> StreamingResponse:
+    """
+    새 설계변경을 Server-Sent Events 로 밀어 주는 스트림. (`event: change`, `data`: LatestChangeSummary JSON)
+    - 이벤트 id 는 change_log 의 줄 번호(seq). 재접속 시 Last-Event-ID 다음 이벤트부터 이어서 보낸다.
+    - `change_stream_heartbeat_seconds` 마다 주석 줄(heartbeat)을 보내 프록시/단말의 유휴 연결 종료를 막는다.
+    """
+    # 백로그를 읽기 전에 구독부터 해야 그 사이에 커밋된 이벤트를 놓치지 않는다. (중복은 seq 로 거른다)
+    subscriber = CHANGE_HUB.connect(max(1, settings.change_stream_client_buffer))
+
+    resume_from: Optional[int] = since
+    if last_event_id is not None and last_event_id.strip().lstrip("-").isdigit():
+        resume_from = int(last_event_id.strip())
+    backlog = (
+        get_change_index().since(resume_from, settings.change_stream_max_backlog)
+        if resume_from is not None
+        else []
+    )
+
+    async def events():
+        sent = resume_from if resume_from is not None else -1
+        try:
+            yield f"retry: {settings.change_stream_retry_ms}\n\n"
+            for seq, record in backlog:
+                yield format_change_event(seq, record)
+                sent = seq
+            while True:
+                try:
+                    seq, message = await asyncio.wait_for(
+                        subscriber.queue.get(), settings.change_stream_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if seq is None:
+                    # 버퍼가 넘친 느린 클라이언트: 연결을 끊고 재접속 시 Last-Event-ID 로 따라오게 한다.
+                    break
+                if seq <= sent:
+                    continue
+                yield message
+                sent = seq
+        finally:
+            CHANGE_HUB.disconnect(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return LatestChangeResponse(has_change=True, latest=summary)
 
 
 @app.post("/worker/chat", response_model=WorkerChatResponse, tags=["worker"])
@@ -111,6 +457,8 @@ def worker_chat_endpoint(req: WorkerChatRequest) -> WorkerChatResponse:
 
     try:
         return worker_chat(req)
+    except UpstreamUnavailable as e:
+        raise _service_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {e}")
 
@@ -150,3 +498,47 @@ def get_latest_change_translated(language: LanguageCode) -> LatestChangeTranslat
     )
 
 
+@app.get("/worker/analytics", response_model=AnalyticsResponse, tags=["worker"])
+def get_ve_analytics(
+    metric: AnalyticsMetric = AnalyticsMetric.savings_amount,
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=10, ge=1, le=1000),
+    group_by: Optional[AnalyticsGroupBy] = None,
+    agg: AnalyticsAggregate = AnalyticsAggregate.sum,
+    organization: Optional[str] = None,
+    project_name: Optional[str] = None,
+    category: Optional[str] = Query(default=None, description="공종분류 (부분 일치)"),
+    adopted: Optional[str] = Query(default=None, description="채택여부 (부분 일치)"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+) -> AnalyticsResponse:
+    """
+    VE 수치 컬럼(절감액, 절감율, LCC 개선전/후, 성능/가치 점수)에 대한 필터/정렬/그룹 집계.
+    - 예: 절감액 상위 10건 → `?metric=savings_amount&order=desc&limit=10`
+    - 예: 기관별 절감액 합계 → `?metric=savings_amount&group_by=organization&agg=sum`
+    - LLM 을 쓰지 않고 컬럼형 저장소(NumPy)에서 바로 계산한다.
+    """
+    started = time.perf_counter()
+    result = get_numeric_store().query(
+        metric=metric.value,
+        descending=order == "desc",
+        limit=limit,
+        group_by=group_by.value if group_by else None,
+        agg=agg.value,
+        filters={
+            "organization": organization,
+            "project_name": project_name,
+            "category": category,
+            "adopted": adopted,
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+        },
+        min_value=min_value,
+        max_value=max_value,
+    )
+    return AnalyticsResponse(
+        **result,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
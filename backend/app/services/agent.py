@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, List, Optional
+
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
@@ -13,9 +19,25 @@ from ..core.models import (
     WorkerChatRequest,
     WorkerChatResponse,
     WorkerChatAnswerSource,
+    WorkerChatUsage,
     DesignChangeRecord,
 )
-from .vectorstore import get_retriever
+from .answer_cache import ANSWER_CACHE
+from .context_packer import count_tokens, pack_context
+from .http_clients import get_async_http_client, get_http_client, get_timeout
+from .intent_router import answer_intent, classify_intent
+from .metrics import record_cache_lookup, timed
+from .singleflight import CHAT_FLIGHTS, TRANSLATE_FLIGHTS
+from .upstream import get_governor
+from .reranker import rerank, score_hits
+from .vectorstore import (
+    SearchHit,
+    embed_query,
+    get_change_index,
+    get_generation,
+    get_numeric_store,
+    search_hits,
+)
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -64,81 +86,140 @@ def _build_prompt() -> ChatPromptTemplate:
     )
 
 
+@lru_cache
 def _build_llm() -> ChatOpenAI:
+    # 채팅/번역 모두 같은 인스턴스와 공유 커넥션 풀을 사용한다.
     return ChatOpenAI(
         api_key=settings.openai_api_key,
         model=settings.openai_chat_model,
         temperature=0.0,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        timeout=get_timeout(),
+        # 재시도는 upstream governor 가 담당한다.
+        max_retries=0,
     )
 
 
-def _format_docs(docs: List[Document]) -> str:
-    if not docs:
-        return "No design change documents found."
+# (레코드 ID, 언어) -> 번역된 메타데이터 필드. 레코드 내용은 바뀌지 않으므로 만료 없이 LRU 로만 관리.
+TRANSLATION_CACHE_SIZE = 4096
+_TRANSLATIONS: "OrderedDict[tuple[str, str], dict[str, str]]" = OrderedDict()
+_TRANSLATIONS_LOCK = threading.Lock()
 
-    chunks = []
-    for i, d in enumerate(docs, start=1):
-        meta = d.metadata or {}
-        chunks.append(
-            f"[문서 {i}]\n"
-            f"ID: {meta.get('id')}\n"
-            f"제목(제안명): {meta.get('title')}\n"
-            f"변경일(제안일자): {meta.get('change_date')}\n"
-            f"기관명: {meta.get('organization')}\n"
-            f"사업명: {meta.get('project_name')}\n"
-            f"요청 발주처: {meta.get('client')}\n"
-            f"내용 요약 후보:\n{d.page_content}\n"
-        )
-    return "\n\n".join(chunks)
+
+NO_ANSWER_TEMPLATES: Dict[LanguageCode, str] = {
+    LanguageCode.ko: "질문과 일치하는 설계변경 문서를 찾지 못했습니다. 기관명, 사업명 또는 제안명을 포함해서 다시 질문해 주세요.",
+    LanguageCode.en: "No matching design change was found for your question. Please ask again including the organization, project name or proposal name.",
+    LanguageCode.zh: "未找到与您的问题相符的设计变更。请提供机构名称、项目名称或提案名称后重新提问。",
+    LanguageCode.vi: "Không tìm thấy thay đổi thiết kế nào phù hợp với câu hỏi của bạn. Vui lòng hỏi lại kèm tên cơ quan, tên dự án hoặc tên đề xuất.",
+    LanguageCode.uk: "Не знайдено відповідної зміни проєкту за вашим запитом. Будь ласка, повторіть запит, вказавши назву організації, проєкту або пропозиції.",
+}
+
+
+@dataclass
+class RetrievalResult:
+    hits: List[SearchHit]  # FAISS 후보 (재정렬 전)
+    docs: List[Document]  # 프롬프트에 넣을 문서 (재정렬/임계값/MMR 적용 후)
+    # 후보 중 최고 코사인 유사도. 재정렬 설정과 관계없이 같은 의미라서 no-answer 임계값
+    # (no_answer_score_threshold) 과 eval_rag_retrieval 의 추천값을 그대로 비교할 수 있다.
+    top_score: Optional[float]
+
+
+def retrieve_documents(question: str, query_vector: List[float]) -> RetrievalResult:
+    """질문 임베딩으로 후보를 검색하고 재정렬해서 프롬프트에 넣을 문서를 고른다. (LLM 미사용)"""
+    if settings.rerank_enabled:
+        hits = search_hits(query_vector, k=settings.rerank_fetch_k)
+        with timed("rerank"):
+            scored = score_hits(question, query_vector, hits)
+            docs = [r.doc for r in rerank(scored)]
+    else:
+        hits = search_hits(query_vector, k=settings.retriever_top_k)
+        with timed("rerank"):
+            scored = score_hits(question, query_vector, hits)
+        docs = [h.doc for h in hits]
+    top_score = max((r.cosine for r in scored), default=None)
+    return RetrievalResult(hits=hits, docs=docs, top_score=top_score)
 
 
 def build_worker_chain():
-    retriever = get_retriever()
+    """검색된 문서(context)를 받아 답변 메시지를 만드는 LCEL 체인: 프롬프트 -> LLM.
+
+    토큰 사용량(usage_metadata)을 읽기 위해 문자열 파서 대신 AIMessage 를 그대로 반환한다.
+    """
     llm = _build_llm()
     prompt = _build_prompt()
-
-    # LCEL 체인: 질문 -> 문서 검색 -> 프롬프트 -> LLM -> 문자열
-    from langchain_core.runnables import RunnableParallel, RunnableMap
-
-    def get_docs(inputs: dict) -> List[Document]:
-        question: str = inputs["question"]
-        return retriever.get_relevant_documents(question)
-
-    chain_inputs = RunnableParallel(
-        question=lambda x: x["question"],
-        language_code=lambda x: x["language_code"],
-        language_name=lambda x: x["language_name"],
-        docs=get_docs,
-    ) | RunnableMap(
-        context=lambda x: _format_docs(x["docs"]),
-        question=lambda x: x["question"],
-        language_code=lambda x: x["language_code"],
-        language_name=lambda x: x["language_name"],
-        docs=lambda x: x["docs"],
-    )
-
-    chain = chain_inputs | prompt | llm | StrOutputParser()
-    return chain
+    return prompt | llm
 
 
 def worker_chat(req: WorkerChatRequest) -> WorkerChatResponse:
-    chain = build_worker_chain()
+    """동시에 들어온 같은 (언어, 질문) 요청은 한 번의 검색/LLM 호출 결과를 공유한다."""
+    key = (req.language.value, " ".join(req.question.split()))
+    response = CHAT_FLIGHTS.do(key, lambda: _worker_chat(req))
+    return response.model_copy(deep=True)
 
+
+def _worker_chat(req: WorkerChatRequest) -> WorkerChatResponse:
+    started = time.perf_counter()
     language_name = LANGUAGE_NAME_MAP[req.language]
-    raw_answer = chain.invoke(
-        {
-            "question": req.question,
-            "language_code": req.language.value,
-            "language_name": language_name,
-        }
+
+    # "가장 최근 N건", "사업별", "날짜별" 같은 질문은 임베딩/LLM 없이 변경 인덱스에서 바로 답한다.
+    if settings.intent_router_enabled:
+        index = get_change_index()
+        intent = classify_intent(req.question, index)
+        if intent is not None:
+            return answer_intent(
+                intent, req.language, index, get_numeric_store(), cached_translation
+            )
+
+    # 질문 임베딩은 한 번만 만들고 캐시 조회와 검색에 같이 쓴다.
+    query_vector = embed_query(req.question)
+    generation = get_generation()
+
+    if settings.answer_cache_enabled:
+        cached = ANSWER_CACHE.lookup(req.language.value, query_vector, generation)
+        if cached is not None:
+            return cached
+
+    retrieval = retrieve_documents(req.question, query_vector)
+    top_score = (
+        round(retrieval.top_score, 4) if retrieval.top_score is not None else None
     )
 
-    # 검색된 문서에서 간단한 출처 정보만 다시 뽑기 위해 retriever 를 한 번 더 호출
-    retriever = get_retriever()
-    docs = retriever.get_relevant_documents(req.question)
+    # 관련 문서가 하나도 임계값을 넘지 못하면 LLM 을 부르지 않고 바로 안내 문구를 돌려준다.
+    if settings.no_answer_enabled and (
+        top_score is None or top_score < settings.no_answer_score_threshold
+    ):
+        return WorkerChatResponse(
+            answer=NO_ANSWER_TEMPLATES[req.language],
+            language=req.language,
+            sources=[],
+            route="no_answer",
+            retrieval_score=top_score,
+        )
+
+    hits = retrieval.hits
+    with timed("format"):
+        packed = pack_context(retrieval.docs, settings.context_token_budget)
+
+    chain = build_worker_chain()
+    inputs = {
+        "question": req.question,
+        "language_code": req.language.value,
+        "language_name": language_name,
+        "context": packed.text,
+    }
+    with timed("llm"):
+        message = get_governor(settings.openai_chat_model).call(
+            lambda: chain.invoke(inputs),
+            tokens=packed.tokens
+            + count_tokens(req.question)
+            + settings.upstream_completion_token_estimate,
+        )
+    raw_answer = StrOutputParser().invoke(message)
+    token_usage = getattr(message, "usage_metadata", None) or {}
 
     sources: List[WorkerChatAnswerSource] = []
-    for d in docs:
+    for d in packed.docs:
         meta = d.metadata or {}
         sources.append(
             WorkerChatAnswerSource(
@@ -148,12 +229,34 @@ def worker_chat(req: WorkerChatRequest) -> WorkerChatResponse:
             )
         )
 
-    return WorkerChatResponse(
+    response = WorkerChatResponse(
         answer=raw_answer,
         language=req.language,
         sources=sources,
+        usage=WorkerChatUsage(
+            context_tokens=packed.tokens,
+            context_truncated=packed.truncated,
+            prompt_tokens=token_usage.get("input_tokens"),
+            completion_tokens=token_usage.get("output_tokens"),
+        ),
+        retrieval_score=top_score,
     )
 
+    if settings.answer_cache_enabled:
+        ANSWER_CACHE.store(
+            language=req.language.value,
+            query_vector=query_vector,
+            response=response,
+            # 재정렬 전 후보 집합 기준으로 기록해야 새 문서가 후보에 들어오는 경우를 놓치지 않는다.
+            doc_ids=[(h.doc.metadata or {}).get("id") for h in hits],
+            distances=[h.distance for h in hits],
+            top_k=settings.rerank_fetch_k if settings.rerank_enabled else settings.retriever_top_k,
+            generation=generation,
+            latency=time.perf_counter() - started,
+        )
+
+    return response
+
 
 def translate_latest_metadata_fields(
     record: DesignChangeRecord, language: LanguageCode
@@ -171,6 +274,45 @@ def translate_latest_metadata_fields(
     if language == LanguageCode.ko:
         return base_fields
 
+    cached = cached_translation(record.id, language)
+    if cached is not None:
+        return cached
+
+    def translate() -> dict[str, str]:
+        fields = _translate_fields(base_fields, language)
+        _store_translation(record.id, language, fields)
+        return fields
+
+    # 새 변경이 올라온 직후 여러 작업자가 같은 (id, 언어)를 동시에 요청하므로 한 번만 번역한다.
+    try:
+        fields = TRANSLATE_FLIGHTS.do((record.id, language.value), translate)
+    except Exception:
+        # 실패 시 원문 필드 사용
+        return base_fields
+    return dict(fields)
+
+
+def cached_translation(record_id: str, language: LanguageCode) -> Optional[dict[str, str]]:
+    """이미 번역해 둔 메타데이터 필드 (없으면 None). LLM 을 호출하지 않는다."""
+    with _TRANSLATIONS_LOCK:
+        fields = _TRANSLATIONS.get((record_id, language.value))
+        record_cache_lookup("translation", fields is not None)
+        if fields is None:
+            return None
+        _TRANSLATIONS.move_to_end((record_id, language.value))
+        return dict(fields)
+
+
+def _store_translation(record_id: str, language: LanguageCode, fields: dict[str, str]) -> None:
+    with _TRANSLATIONS_LOCK:
+        _TRANSLATIONS[(record_id, language.value)] = dict(fields)
+        while len(_TRANSLATIONS) > TRANSLATION_CACHE_SIZE:
+            _TRANSLATIONS.popitem(last=False)
+
+
+def _translate_fields(
+    base_fields: dict[str, str], language: LanguageCode
+) -> dict[str, str]:
     llm = _build_llm()
     language_name = LANGUAGE_NAME_MAP[language]
 
@@ -205,26 +347,25 @@ def translate_latest_metadata_fields(
 
     chain = prompt | llm | StrOutputParser()
 
-    try:
-        raw = chain.invoke(
-            {
-                "language_name": language_name,
-                "language_code": language.value,
-                "phrases": phrases,
-            }
+    inputs = {
+        "language_name": language_name,
+        "language_code": language.value,
+        "phrases": phrases,
+    }
+    with timed("translate"):
+        raw = get_governor(settings.openai_chat_model).call(
+            lambda: chain.invoke(inputs),
+            tokens=2 * count_tokens(phrases) + 200,
         )
-        lines = [line.strip() for line in raw.splitlines() if line.strip()]
-        keys = ["organization", "project_name", "title", "change_date", "client"]
-        result: dict[str, str] = {}
-        for idx, key in enumerate(keys):
-            if idx < len(lines):
-                result[key] = lines[idx]
-            else:
-                result[key] = base_fields[key]
-        return result
-    except Exception:
-        # 실패 시 원문 필드 사용
-        return base_fields
+    lines = [line.strip() for line in raw.splitlines() if line.strip()]
+    keys = ["organization", "project_name", "title", "change_date", "client"]
+    result: dict[str, str] = {}
+    for idx, key in enumerate(keys):
+        if idx < len(lines):
+            result[key] = lines[idx]
+        else:
+            result[key] = base_fields[key]
+    return result
 
 
 
@@ -0,0 +1,215 @@
+"""
+작업자 챗봇용 의미 기반(semantic) 답변 캐시.
+
+- 키: 언어 코드 + 질문 임베딩. 코사인 유사도가 임계값 이상인 항목이 있으면 hit.
+- 각 항목에는 생성 당시의 벡터스토어 세대(generation), 검색된 문서 ID,
+  top-k 중 가장 먼 문서까지의 거리를 함께 기록한다.
+- 새 설계변경이 추가되면 그 문서가 top-k 안에 새로 들어올 수 있는 항목만 무효화하고,
+  나머지 항목은 새 세대로 올려서 계속 사용한다.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.models import WorkerChatResponse
+
+
+@dataclass
+class _CacheEntry:
+    language: str
+    vector: np.ndarray  # L2 정규화된 질문 임베딩
+    raw_vector: np.ndarray  # 무효화 판단용 원본 질문 임베딩 (FAISS 와 같은 공간)
+    response: WorkerChatResponse
+    doc_ids: frozenset[str]
+    max_distance: Optional[float]  # top-k 가 꽉 차지 않았으면 None (어떤 새 문서든 영향)
+    generation: int
+    latency: float  # 원래 답변 생성에 걸린 시간(초)
+    created_at: float
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return arr
+    return arr / norm
+
+
+class AnswerCache:
+    """언어별 질문 임베딩 유사도로 조회하는 LRU 답변 캐시 (스레드 안전)."""
+
+    def __init__(
+        self,
+        similarity_threshold: float,
+        max_entries: int,
+        ttl_seconds: float,
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._next_key = 0
+        # 언어별 (키 목록, 정규화 벡터 행렬). 항목이 바뀌면 None 으로 두고 다음 조회 때 다시 쌓는다.
+        self._matrices: Dict[str, Optional[tuple[List[int], np.ndarray]]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidated = 0
+        self._evicted = 0
+        self._saved_seconds = 0.0
+
+    def _dirty(self, language: str) -> None:
+        self._matrices[language] = None
+
+    def _remove(self, key: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._dirty(entry.language)
+
+    def _matrix_for(self, language: str) -> Optional[tuple[List[int], np.ndarray]]:
+        cached = self._matrices.get(language)
+        if cached is not None:
+            return cached
+
+        keys = [k for k, e in self._entries.items() if e.language == language]
+        if not keys:
+            return None
+        matrix = np.stack([self._entries[k].vector for k in keys])
+        self._matrices[language] = (keys, matrix)
+        return self._matrices[language]
+
+    def lookup(
+        self, language: str, query_vector: Sequence[float], generation: int
+    ) -> Optional[WorkerChatResponse]:
+        started = time.perf_counter()
+        query = _normalize(query_vector)
+        now = time.time()
+
+        with self._lock:
+            packed = self._matrix_for(language)
+            if packed is None:
+                self._misses += 1
+                return None
+
+            keys, matrix = packed
+            sims = matrix @ query
+            order = np.argsort(-sims)
+            for idx in order:
+                if float(sims[idx]) < self.similarity_threshold:
+                    break
+                key = keys[int(idx)]
+                entry = self._entries[key]
+                # 세대가 다르면 무효화 통보 없이 인덱스가 바뀐 것이므로 버린다.
+                if entry.generation != generation or now - entry.created_at > self.ttl_seconds:
+                    self._remove(key)
+                    continue
+
+                self._entries.move_to_end(key)
+                self._hits += 1
+                self._saved_seconds += max(
+                    entry.latency - (time.perf_counter() - started), 0.0
+                )
+                return entry.response.model_copy(deep=True)
+
+            self._misses += 1
+            return None
+
+    def store(
+        self,
+        language: str,
+        query_vector: Sequence[float],
+        response: WorkerChatResponse,
+        doc_ids: Iterable[str],
+        distances: Sequence[float],
+        top_k: int,
+        generation: int,
+        latency: float,
+    ) -> None:
+        raw = np.asarray(query_vector, dtype=np.float32)
+        max_distance = float(max(distances)) if len(distances) >= top_k else None
+        entry = _CacheEntry(
+            language=language,
+            vector=_normalize(raw),
+            raw_vector=raw,
+            response=response.model_copy(deep=True),
+            doc_ids=frozenset(doc_ids),
+            max_distance=max_distance,
+            generation=generation,
+            latency=latency,
+            created_at=time.time(),
+        )
+
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = entry
+            self._dirty(language)
+            while len(self._entries) > self.max_entries:
+                # 가장 오래된 항목을 내보내고, 그 언어의 행렬만 다시 만들게 한다.
+                self._remove(next(iter(self._entries)))
+                self._evicted += 1
+
+    def invalidate_for_change(
+        self, doc_id: str, doc_vector: Sequence[float], generation: int
+    ) -> int:
+        """새로 추가/변경된 문서가 검색 결과에 영향을 줄 수 있는 항목만 제거.
+
+        FAISS(IndexFlatL2)와 같은 제곱 L2 거리로 비교해서,
+        새 문서가 기존 top-k 의 가장 먼 문서보다 가까우면 그 답변은 달라질 수 있다고 본다.
+        """
+        doc = np.asarray(doc_vector, dtype=np.float32)
+        removed = 0
+
+        with self._lock:
+            for key in list(self._entries.keys()):
+                entry = self._entries[key]
+                affected = doc_id in entry.doc_ids or entry.max_distance is None
+                if not affected:
+                    diff = entry.raw_vector - doc
+                    affected = float(diff @ diff) <= entry.max_distance
+                if affected:
+                    self._remove(key)
+                    removed += 1
+                else:
+                    entry.generation = generation
+            self._invalidated += removed
+
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "invalidated": self._invalidated,
+                "evicted": self._evicted,
+                "saved_seconds": round(self._saved_seconds, 3),
+                "avg_saved_seconds_per_hit": (
+                    round(self._saved_seconds / self._hits, 3) if self._hits else 0.0
+                ),
+            }
+
+
+ANSWER_CACHE = AnswerCache(
+    similarity_threshold=settings.answer_cache_similarity_threshold,
+    max_entries=settings.answer_cache_max_entries,
+    ttl_seconds=settings.answer_cache_ttl_seconds,
+)
@@ -0,0 +1,142 @@
+"""
+설계변경 레코드의 메모리 인덱스 (등록 순서 / 제안일자 / 사업명).
+
+- "가장 최근 N건", "사업별", "날짜별" 같은 구조화된 질문을 벡터 검색 없이 정확하게 답하기 위해 사용.
+- 처음 사용할 때 change_log.jsonl 전체를 한 번 읽어 채우고, 이후에는 add_design_change 가 추가한다.
+- 레코드의 위치(seq)는 change_log.jsonl 의 줄 순서(빈 줄 제외, 0부터)와 같다.
+  읽을 수 없는 줄이나 중복 ID 도 seq 자리를 하나 차지해서, 재시작해도 SSE 이벤트 id 가 바뀌지 않는다.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from datetime import date
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.models import DesignChangeRecord
+
+
+_SPACES = re.compile(r"\s+")
+
+
+def _normalize_name(name: str) -> str:
+    return _SPACES.sub("", name).lower()
+
+
+class ChangeIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._records: List[Optional[DesignChangeRecord]] = []  # seq -> 레코드 (빈 자리는 None)
+        self._by_id: Dict[str, int] = {}
+        self._by_created: List[Tuple[str, int]] = []  # (created_at ISO, seq)
+        self._by_date: List[Tuple[date, int]] = []  # (change_date, seq)
+        self._by_project: Dict[str, List[int]] = {}  # 정규화된 사업명 -> seq 목록
+        self._project_names: Dict[str, str] = {}  # 정규화된 사업명 -> 원래 사업명
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, loader: Callable[[], Iterable[Optional[DesignChangeRecord]]]) -> None:
+        """처음 한 번만 loader 로 전체 레코드를 읽어 인덱스를 채운다. (None 은 읽을 수 없는 줄의 자리)"""
+        with self._lock:
+            if self._loaded:
+                return
+            for record in loader():
+                self._add_locked(record)
+            self._loaded = True
+
+    def add(self, record: DesignChangeRecord) -> None:
+        """아직 로드 전이면 나중에 change_log 에서 함께 읽히므로 무시한다."""
+        with self._lock:
+            if self._loaded:
+                self._add_locked(record)
+
+    def _add_locked(self, record: Optional[DesignChangeRecord]) -> None:
+        if record is None or record.id in self._by_id:
+            self._records.append(None)
+            return
+        seq = len(self._records)
+        self._records.append(record)
+        self._by_id[record.id] = seq
+        insort(self._by_created, (record.created_at.isoformat(), seq))
+        insort(self._by_date, (record.change_date, seq))
+        if record.project_name:
+            key = _normalize_name(record.project_name)
+            self._by_project.setdefault(key, []).append(seq)
+            self._project_names.setdefault(key, record.project_name)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def seq_of(self, record_id: str) -> Optional[int]:
+        with self._lock:
+            return self._by_id.get(record_id)
+
+    def since(self, seq: int, limit: int) -> List[Tuple[int, DesignChangeRecord]]:
+        """seq 보다 뒤에 등록된 레코드를 (seq, 레코드) 로 등록 순서대로. 너무 많으면 마지막 limit 건만."""
+        with self._lock:
+            start = max(seq + 1, len(self._records) - limit, 0)
+            return [
+                (i, record)
+                for i in range(start, len(self._records))
+                if (record := self._records[i]) is not None
+            ]
+
+    def by_ids(self, ids: Iterable[str]) -> List[DesignChangeRecord]:
+        """ID 순서를 유지해서 레코드를 돌려준다. (모르는 ID 는 건너뜀)"""
+        with self._lock:
+            return [self._records[self._by_id[i]] for i in ids if i in self._by_id]
+
+    def latest(self, limit: int = 1) -> List[DesignChangeRecord]:
+        """등록 시각(created_at) 기준 최신순."""
+        with self._lock:
+            return [self._records[seq] for _, seq in reversed(self._by_created[-limit:])]
+
+    def by_project(self, project_name: str, limit: int = 10) -> List[DesignChangeRecord]:
+        """사업명이 같은 레코드를 제안일자 최신순으로."""
+        with self._lock:
+            seqs = self._by_project.get(_normalize_name(project_name), [])
+            records = [self._records[s] for s in seqs]
+        records.sort(key=lambda r: (r.change_date, r.created_at), reverse=True)
+        return records[:limit]
+
+    def by_date(
+        self,
+        date_from: date,
+        date_to: date,
+        limit: int = 10,
+        project_name: Optional[str] = None,
+    ) -> List[DesignChangeRecord]:
+        """제안일자가 [date_from, date_to] 안에 있는 레코드를 최신순으로."""
+        project_key = _normalize_name(project_name) if project_name else None
+        result: List[DesignChangeRecord] = []
+        with self._lock:
+            hi = bisect_right(self._by_date, (date_to, len(self._records)))
+            for i in range(hi - 1, -1, -1):
+                d, seq = self._by_date[i]
+                if d < date_from:
+                    break
+                record = self._records[seq]
+                if project_key and _normalize_name(record.project_name or "") != project_key:
+                    continue
+                result.append(record)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def match_project(self, text: str) -> Optional[str]:
+        """질문 안에 들어 있는 사업명 중 가장 긴 것을 돌려준다."""
+        compact = _normalize_name(text)
+        best_key = ""
+        with self._lock:
+            for key in self._project_names:
+                if len(key) >= 2 and len(key) > len(best_key) and key in compact:
+                    best_key = key
+            return self._project_names.get(best_key) if best_key else None
+
+
+CHANGE_INDEX = ChangeIndex()
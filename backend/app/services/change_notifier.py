@@ -0,0 +1,70 @@
+"""
+새 설계변경이 커밋됐음을 대기 중인 요청(long-poll 등)에 알려 주는 알림기.
+
+- 커밋은 스레드풀(동기 엔드포인트/인제스트 스레드)에서, 대기는 이벤트 루프(async 엔드포인트)에서 일어나므로
+  publish 는 `loop.call_soon_threadsafe` 로 각 대기자의 Future 를 깨운다.
+- 대기자는 OS 스레드를 점유하지 않고 Future 하나만 들고 있으므로 수천 개가 걸려 있어도 비용이 거의 없다.
+- 레이스를 피하기 위해 "version(커밋 횟수)"을 기준으로 기다린다:
+  레코드를 읽기 **전에** version 을 잡아 두고, 그 version 보다 커질 때까지 기다린다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Set, Tuple
+
+
+class ChangeNotifier:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def publish(self) -> None:
+        """설계변경이 커밋된 직후 호출. 기다리던 요청을 모두 깨운다."""
+        with self._lock:
+            self._version += 1
+            waiters = list(self._waiters)
+            self._waiters.clear()
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 (서버 종료 중)
+                pass
+
+    async def wait(self, since_version: int, timeout: float) -> bool:
+        """version 이 since_version 보다 커지면 True, timeout 이 지나면 False."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self._version > since_version:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"version": self._version, "waiters": len(self._waiters)}
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+CHANGE_NOTIFIER = ChangeNotifier()
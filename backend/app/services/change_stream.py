@@ -0,0 +1,108 @@
+"""
+`/worker/changes/stream` (Server-Sent Events) 용 프로세스 내 브로드캐스트 허브.
+
+- 커밋된 설계변경은 change_log 줄 번호(seq)를 SSE `id:` 로 붙여 모든 구독자에게 보낸다.
+  끊겼던 클라이언트는 `Last-Event-ID` 헤더로 그 다음 seq 부터 change_log 에서 다시 받는다.
+- 이벤트 문자열은 publish 할 때 한 번만 만들고, 구독자에게는 참조만 넘긴다.
+- 구독자마다 크기가 제한된 asyncio.Queue 를 두고, 가득 차면(느린 클라이언트) 연결을 끊는다.
+  클라이언트는 재접속해서 Last-Event-ID 로 빠진 이벤트를 받으므로 서버 메모리가 늘어나지 않는다.
+- 유휴 연결은 Queue 하나 + 주기적인 heartbeat 주석 줄만 쓰므로 수천 개가 열려 있어도 부담이 적다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..core.models import DesignChangeRecord, LatestChangeSummary
+
+
+# 구독자 큐에 넣는 항목: (seq, SSE 이벤트 문자열). seq 가 None 이면 연결 종료 신호.
+StreamItem = Tuple[Optional[int], str]
+
+
+def format_change_event(seq: int, record: DesignChangeRecord) -> str:
+    summary = LatestChangeSummary(
+        id=record.id,
+        change_date=record.change_date,
+        title=record.title,
+        created_at=record.created_at,
+        organization=record.organization,
+        project_name=record.project_name,
+        client=record.client,
+    )
+    data = json.dumps(summary.model_dump(mode="json"), ensure_ascii=False)
+    return f"id: {seq}\nevent: change\ndata: {data}\n\n"
+
+
+class ChangeSubscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int) -> None:
+        self.loop = loop
+        self.queue: "asyncio.Queue[StreamItem]" = asyncio.Queue(maxsize=buffer_size)
+
+
+class ChangeStreamHub:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Set[ChangeSubscriber] = set()
+        self._published = 0
+        self._dropped = 0
+
+    def connect(self, buffer_size: int) -> ChangeSubscriber:
+        """이벤트 루프 안(async 엔드포인트)에서 호출."""
+        subscriber = ChangeSubscriber(asyncio.get_running_loop(), buffer_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def disconnect(self, subscriber: ChangeSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, events: List[Tuple[Optional[int], DesignChangeRecord]]) -> None:
+        """커밋한 스레드에서 호출. 구독자가 속한 이벤트 루프마다 전달 콜백을 한 번씩 예약한다."""
+        items: List[StreamItem] = [
+            (seq, format_change_event(seq, record)) for seq, record in events if seq is not None
+        ]
+        if not items:
+            return
+
+        with self._lock:
+            self._published += len(items)
+            by_loop: Dict[asyncio.AbstractEventLoop, List[ChangeSubscriber]] = {}
+            for subscriber in self._subscribers:
+                by_loop.setdefault(subscriber.loop, []).append(subscriber)
+
+        for loop, subscribers in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, subscribers, items)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힘 (서버 종료 중)
+                pass
+
+    def _deliver(self, subscribers: List[ChangeSubscriber], items: List[StreamItem]) -> None:
+        for subscriber in subscribers:
+            try:
+                for item in items:
+                    subscriber.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # 느린 클라이언트: 버퍼를 비우고 종료 신호만 넣는다. 재접속 시 Last-Event-ID 로 따라잡는다.
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait((None, ""))
+                self.disconnect(subscriber)
+                with self._lock:
+                    self._dropped += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published_events": self._published,
+                "dropped_slow_subscribers": self._dropped,
+            }
+
+
+CHANGE_HUB = ChangeStreamHub()
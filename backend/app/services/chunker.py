@@ -0,0 +1,109 @@
+"""
+설계변경 description 을 임베딩용 패시지로 나누는 모듈.
+
+- description 이 `chunk_max_tokens` 이하이면 나누지 않는다. (기존과 같은 레코드 1개 = 벡터 1개)
+- 길면 `[생애주기비용(LCC) 절감효과 - 개선전]` 처럼 `[` 로 시작하는 줄을 섹션 시작으로 보고,
+  섹션을 쪼개지 않고 예산 안에서 앞에서부터 차례로 묶는다.
+- 섹션 하나가 예산보다 길면 줄 단위(줄 하나가 길면 글자 단위)로 나누고,
+  앞 패시지 끝부분 `chunk_overlap_tokens` 만큼을 다음 패시지 앞에 겹쳐 넣는다.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from ..core.config import settings
+from .context_packer import count_tokens
+
+
+def _sections(text: str) -> List[str]:
+    """빈 줄 / `[` 로 시작하는 줄을 경계로 섹션을 나눈다."""
+    sections: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines():
+        starts_section = line.lstrip().startswith("[")
+        if (not line.strip() or starts_section) and current:
+            sections.append("\n".join(current))
+            current = []
+        if line.strip():
+            current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+
+def _split_line(line: str, max_tokens: int, overlap_tokens: int) -> List[str]:
+    """줄 하나가 예산보다 길 때 글자 단위 창으로 나눈다. (토큰/글자 비율로 창 크기를 정함)"""
+    tokens = max(1, count_tokens(line))
+    chars_per_token = len(line) / tokens
+    size = max(1, int(max_tokens * chars_per_token))
+    step = max(1, size - int(overlap_tokens * chars_per_token))
+    return [line[i : i + size] for i in range(0, len(line), step) if line[i : i + size].strip()]
+
+
+def _split_section(section: str, max_tokens: int, overlap_tokens: int) -> List[str]:
+    """긴 섹션을 줄 단위로 예산에 맞춰 나누고, 앞 조각의 마지막 줄들을 겹쳐 넣는다."""
+    lines: List[str] = []
+    for line in section.splitlines():
+        if count_tokens(line) > max_tokens:
+            lines.extend(_split_line(line, max_tokens, overlap_tokens))
+        else:
+            lines.append(line)
+
+    pieces: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    fresh = 0  # current 에서 겹침 줄이 아닌 새 줄 수
+    for line in lines:
+        line_tokens = count_tokens(line) + 1
+        if current and fresh and current_tokens + line_tokens > max_tokens:
+            pieces.append("\n".join(current))
+            # 다음 조각 앞에 겹쳐 넣을 꼬리 줄
+            tail: List[str] = []
+            tail_tokens = 0
+            for prev in reversed(current):
+                prev_tokens = count_tokens(prev) + 1
+                if tail_tokens + prev_tokens > overlap_tokens or tail_tokens + prev_tokens + line_tokens > max_tokens:
+                    break
+                tail.insert(0, prev)
+                tail_tokens += prev_tokens
+            current, current_tokens, fresh = tail, tail_tokens, 0
+        current.append(line)
+        current_tokens += line_tokens
+        fresh += 1
+    if current and fresh:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def split_description(
+    text: str,
+    max_tokens: int | None = None,
+    overlap_tokens: int | None = None,
+) -> List[str]:
+    """description 을 패시지 본문 목록으로 나눈다. 나눌 필요가 없으면 [text] 그대로."""
+    max_tokens = settings.chunk_max_tokens if max_tokens is None else max_tokens
+    overlap_tokens = settings.chunk_overlap_tokens if overlap_tokens is None else overlap_tokens
+    if max_tokens <= 0 or count_tokens(text) <= max_tokens:
+        return [text]
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    passages: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for section in _sections(text):
+        section_tokens = count_tokens(section) + 2
+        if section_tokens > max_tokens:
+            if current:
+                passages.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            passages.extend(_split_section(section, max_tokens, overlap_tokens))
+            continue
+        if current and current_tokens + section_tokens > max_tokens:
+            passages.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(section)
+        current_tokens += section_tokens
+    if current:
+        passages.append("\n\n".join(current))
+    return passages or [text]
@@ -0,0 +1,157 @@
+"""
+작업자 프롬프트에 넣을 문서 컨텍스트를 토큰 예산 안에서 만드는 모듈.
+
+- `_build_text` 로 만든 page_content 에는 ID/제목/기관명 등 메타데이터가 이미 들어 있으므로,
+  메타데이터는 한 번만 출력하고 본문에서 중복되는 줄은 제거한다.
+- 토큰 수는 로컬 토크나이저(tiktoken)로 센다. 사용할 수 없으면 글자 수 기반으로 보수적으로 추정한다.
+- 검색 순위가 높은 문서부터 채우고, 예산을 넘으면 낮은 순위 문서부터 잘라내거나 제외한다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+import threading
+from typing import Any, Callable, List
+
+from langchain_core.documents import Document
+
+from ..core.config import settings
+
+
+EMPTY_CONTEXT = "No design change documents found."
+TRUNCATED_MARK = "...(이하 생략)"
+
+# `_build_text` 가 본문 앞에 붙이는 헤더의 마지막 줄
+_BODY_MARKER = "내용:\n"
+
+
+_ENCODER_LOCK = threading.Lock()
+
+
+def _get_encoder() -> Callable[[str], List[int]] | None:
+    # 동시에 처음 호출돼도 인코딩 로드(다운로드)는 한 번만 하도록 잠근다.
+    with _ENCODER_LOCK:
+        return _load_encoder()
+
+
+@lru_cache
+def _load_encoder() -> Callable[[str], List[int]] | None:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            enc = tiktoken.encoding_for_model(settings.openai_chat_model)
+        except KeyError:
+            enc = tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # 인코딩 파일을 내려받을 수 없는 환경(오프라인 등)
+        print("[WARN] tiktoken 인코딩을 불러오지 못해 글자 수 기반으로 토큰을 추정합니다.")
+        return None
+    return enc.encode
+
+
+def count_tokens(text: str) -> int:
+    encode = _get_encoder()
+    if encode is None:
+        # 한글은 대략 1글자 ≈ 1토큰, 영문은 4글자 ≈ 1토큰. 예산을 넘지 않도록 한글 기준으로 추정.
+        return len(text)
+    return len(encode(text))
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encode = _get_encoder()
+    if encode is None:
+        return text[:max_tokens]
+
+    tokens = encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    # 토큰 경계를 정확히 되돌리기보다 비율로 자른 뒤 다시 확인한다. (디코더 의존성 최소화)
+    cut = int(len(text) * max_tokens / len(tokens))
+    while cut > 0 and len(encode(text[:cut])) > max_tokens:
+        cut = int(cut * 0.9)
+    return text[:cut]
+
+
+def _header_lines(meta: dict[str, Any], rank: int) -> List[str]:
+    return [
+        f"[문서 {rank}]",
+        f"ID: {meta.get('id')}",
+        f"제목(제안명): {meta.get('title')}",
+        f"변경일(제안일자): {meta.get('change_date')}",
+        f"기관명: {meta.get('organization')}",
+        f"사업명: {meta.get('project_name')}",
+        f"요청 발주처: {meta.get('client')}",
+    ]
+
+
+def _body(doc: Document) -> str:
+    """page_content 에서 메타데이터 헤더와, 헤더와 같은 내용의 본문 줄을 제거."""
+    meta = doc.metadata or {}
+    text = doc.page_content
+    if text.startswith("[설계변경 ID:") and _BODY_MARKER in text:
+        text = text.split(_BODY_MARKER, 1)[1]
+
+    duplicated = {
+        f"기관명: {meta.get('organization')}",
+        f"사업명: {meta.get('project_name')}",
+        f"[VE 제안명] {meta.get('title')}",
+    }
+    lines = [line for line in text.splitlines() if line.strip() not in duplicated]
+    return "\n".join(lines).strip()
+
+
+@dataclass
+class PackedContext:
+    text: str
+    tokens: int
+    docs: List[Document] = field(default_factory=list)  # 실제로 컨텍스트에 들어간 문서
+    truncated: bool = False
+
+
+def pack_context(docs: List[Document], token_budget: int | None = None) -> PackedContext:
+    """검색 순위 순서대로 문서를 채워 넣어 토큰 예산 안의 컨텍스트 문자열을 만든다."""
+    if not docs:
+        return PackedContext(text=EMPTY_CONTEXT, tokens=count_tokens(EMPTY_CONTEXT))
+
+    budget = token_budget or settings.context_token_budget
+    separator_tokens = count_tokens("\n\n")
+
+    blocks: List[str] = []
+    used_docs: List[Document] = []
+    used = 0
+    truncated = False
+
+    for rank, doc in enumerate(docs, start=1):
+        header = "\n".join(_header_lines(doc.metadata or {}, rank)) + "\n내용:\n"
+        body = _body(doc)
+        block = header + body
+        block_tokens = count_tokens(block) + (separator_tokens if blocks else 0)
+
+        if used + block_tokens <= budget:
+            blocks.append(block)
+            used_docs.append(doc)
+            used += block_tokens
+            continue
+
+        # 남은 예산으로 본문 일부라도 넣을 수 있으면 잘라서 넣고, 이후 문서는 제외한다.
+        truncated = True
+        remaining = budget - used - count_tokens(header) - count_tokens(TRUNCATED_MARK)
+        if blocks:
+            remaining -= separator_tokens
+        partial = _truncate_to_tokens(body, remaining)
+        if partial.strip():
+            blocks.append(header + partial + TRUNCATED_MARK)
+            used_docs.append(doc)
+        break
+
+    text = "\n\n".join(blocks) if blocks else EMPTY_CONTEXT
+    return PackedContext(
+        text=text, tokens=count_tokens(text), docs=used_docs, truncated=truncated
+    )
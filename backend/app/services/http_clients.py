@@ -0,0 +1,65 @@
+"""
+OpenAI 임베딩 / 채팅 호출이 함께 쓰는 프로세스 단위 HTTP 클라이언트.
+
+- OpenAIEmbeddings / ChatOpenAI 를 만들 때마다 각자 httpx 커넥션 풀을 만들면
+  TLS 핸드셰이크가 반복되고 keep-alive 가 끊기므로, 클라이언트를 한 번만 만들어 공유한다.
+- 커넥션 수 / keep-alive / 타임아웃은 Settings 에서 읽는다.
+- HTTP/2 는 `h2` 패키지가 설치되어 있을 때만 켠다. (`pip install httpx[http2]`)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import importlib.util
+
+import httpx
+
+from ..core.config import settings
+
+
+def http2_available() -> bool:
+    return settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+def get_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.openai_timeout_seconds,
+        connect=settings.openai_connect_timeout_seconds,
+    )
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+@lru_cache
+def get_http_client() -> httpx.Client:
+    """동기 호출(invoke, embed_documents)용 공유 클라이언트."""
+    return httpx.Client(
+        http2=http2_available(),
+        limits=_limits(),
+        timeout=get_timeout(),
+    )
+
+
+@lru_cache
+def get_async_http_client() -> httpx.AsyncClient:
+    """비동기 호출(ainvoke, aembed_documents)용 공유 클라이언트."""
+    return httpx.AsyncClient(
+        http2=http2_available(),
+        limits=_limits(),
+        timeout=get_timeout(),
+    )
+
+
+def close_http_clients() -> None:
+    """서버 종료 시 풀에 남은 커넥션을 정리한다."""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+        get_http_client.cache_clear()
+    # AsyncClient 는 이벤트 루프가 이미 닫혔을 수 있으므로 캐시만 비운다.
+    get_async_http_client.cache_clear()
@@ -0,0 +1,157 @@
+"""
+관리자 업로드(`POST /admin/imports`)로 들어온 VE CSV/XLSX 를 API 프로세스 안에서 인제스트하는 백그라운드 작업.
+
+- 업로드 파일은 `import_dir` 에 저장해 두고, 작업 하나당 전용 스레드가 아닌 **단일 워커 스레드**가 순서대로 처리한다.
+  (FAISS / change_log 쓰기는 한 번에 하나만 일어나야 하므로 별도 CLI 프로세스와 파일을 두고 다투지 않게 한다)
+- 행 읽기/변환/저장은 CLI 와 같은 `ingest_ve_csv.ingest_uploaded_file` 을 쓴다.
+  (인제스트 매니페스트로 이미 저장된 행/같은 내용의 파일은 다시 임베딩하지 않는다)
+- 읽기 오류나 실패한 행이 있으면 `partial`(일부 저장) 또는 `failed` 로 끝난다.
+- 상태(처리 행 수/실패/속도/ETA)는 메모리에만 두고 최근 `import_jobs_history` 건만 유지한다.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+import queue
+import threading
+from typing import List, Optional
+from uuid import uuid4
+
+from ..core.config import settings
+from ..core.models import ImportJobResponse, ImportJobStatus
+from .ingest_pipeline import IngestProgress
+from .ingest_ve_csv import estimate_row_count, ingest_uploaded_file
+
+
+SUPPORTED_SUFFIXES = {".csv", ".xlsx", ".xlsm"}
+_FINISHED = (ImportJobStatus.done, ImportJobStatus.partial, ImportJobStatus.failed)
+
+
+class ImportJob:
+    def __init__(self, filename: str, path: Path) -> None:
+        self.id = uuid4().hex
+        self.filename = filename
+        self.path = path
+        self.status = ImportJobStatus.queued
+        self.total_rows: Optional[int] = None
+        self.progress: Optional[IngestProgress] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def to_response(self) -> ImportJobResponse:
+        response = ImportJobResponse(
+            id=self.id,
+            filename=self.filename,
+            status=self.status,
+            total_rows=self.total_rows,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+        progress = self.progress
+        if progress is None:
+            return response
+
+        response.rows_done = progress.rows_ok
+        response.rows_failed = progress.rows_failed
+        response.rows_skipped = progress.rows_skipped
+        response.tokens = progress.tokens
+        response.rows_per_second = round(progress.rows_per_second, 1)
+        response.tokens_per_second = round(progress.tokens_per_second, 1)
+        response.elapsed_seconds = round(progress.elapsed, 1)
+        if self.status == ImportJobStatus.running and self.total_rows is not None:
+            remaining = max(
+                0, self.total_rows - progress.rows_ok - progress.rows_failed - progress.rows_skipped
+            )
+            if progress.rows_per_second > 0:
+                response.eta_seconds = round(remaining / progress.rows_per_second, 1)
+        elif self.status in (ImportJobStatus.done, ImportJobStatus.partial):
+            response.eta_seconds = 0.0
+        return response
+
+
+class ImportJobManager:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._queue: "queue.Queue[ImportJob]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, filename: str, path: Path) -> ImportJob:
+        job = ImportJob(filename, path)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_locked()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_forever, name="import-jobs", daemon=True)
+                self._worker.start()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[ImportJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def _trim_locked(self) -> None:
+        # 끝난 작업부터 오래된 순으로 정리 (대기/실행 중인 작업은 남긴다)
+        excess = len(self._jobs) - settings.import_jobs_history
+        for job_id in list(self._jobs.keys()):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in _FINISHED:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _run_forever(self) -> None:
+        while True:
+            job = self._queue.get()
+            self._run(job)
+
+    def _run(self, job: ImportJob) -> None:
+        job.status = ImportJobStatus.running
+        job.started_at = datetime.utcnow()
+        try:
+            # ETA 계산용 행 수 추정치. 못 세도 작업은 그대로 진행한다. (ETA 만 비움)
+            try:
+                job.total_rows = estimate_row_count(job.path)
+            except Exception as e:
+                print(f"[WARN] 행 수를 추정하지 못했습니다 ({job.filename}): {e}")
+            progress = IngestProgress(label=job.filename)
+            job.progress = progress
+            if not ingest_uploaded_file(job.path, progress):
+                progress.rows_skipped = job.total_rows or 0
+                progress.finished = progress.started
+            else:
+                # 끝나면 추정치 대신 실제로 처리한 행 수
+                job.total_rows = progress.rows_ok + progress.rows_failed + progress.rows_skipped
+            job.status = _final_status(progress)
+            if progress.read_error is not None:
+                job.error = f"파일을 끝까지 읽지 못했습니다: {progress.read_error}"
+        except Exception as e:
+            print(f"[ERROR] 인제스트 작업 실패 ({job.filename}): {e}")
+            job.error = str(e)
+            job.status = ImportJobStatus.failed
+        finally:
+            job.finished_at = datetime.utcnow()
+            job.path.unlink(missing_ok=True)
+
+
+def _final_status(progress: IngestProgress) -> ImportJobStatus:
+    if progress.read_error is None and progress.rows_failed == 0:
+        return ImportJobStatus.done
+    # 읽기 오류/실패 행이 있어도 저장된 행이 있으면 partial. (다시 업로드하면 빠진 행만 처리된다)
+    if progress.rows_ok or progress.rows_skipped:
+        return ImportJobStatus.partial
+    return ImportJobStatus.failed
+
+
+IMPORT_JOBS = ImportJobManager()
@@ -0,0 +1,240 @@
+"""
+디렉터리 인제스트를 증분으로 처리하기 위한 매니페스트.
+
+- `data/ingest_manifest.json` (작은 파일, 저장할 때마다 통째로 다시 씀): 파일별 정보 + 체크포인트
+  - 파일별: 크기 / 수정 시각(ns) / 내용 해시(sha256)
+    - 크기와 수정 시각이 그대로면 해시 계산 없이 건너뛴다.
+    - 둘 중 하나라도 다르면 해시를 다시 계산하고, 내용이 같으면 수정 시각만 갱신한 뒤 건너뛴다.
+    - 업로드 파일은 매번 임시 경로가 달라서 경로 대신 `sha256:<해시>` 키로 기록한다.
+- `data/ingest_manifest.rows` (줄 단위 추가 전용): 원본 행 내용의 fingerprint → 저장된 레코드 ID
+  - 바뀐 파일을 다시 읽을 때도 이미 저장된 fingerprint 의 행은 임베딩하지 않는다.
+    (행 내용이 바뀌면 fingerprint 가 달라지므로 새 레코드로 저장된다)
+  - 저장할 때는 새 행만 끝에 덧붙인다. (행이 수백만 개여도 저장 비용은 새 행 수에 비례)
+- 매니페스트는 FAISS / 수치 저장소를 디스크에 저장한 직후에만 쓴다.
+  그래서 매니페스트에 있는 행은 항상 디스크 인덱스에도 있다.
+- 체크포인트: 실행 중인 인제스트의 마지막 저장 지점 (파일별 행 오프셋 + 마지막 레코드 ID)
+  - json 에 행 로그의 유효 길이(`rows_bytes`)를 함께 기록하고, json 교체(임시 파일 → rename)를 커밋 지점으로 삼는다.
+    행 로그를 덧붙인 뒤 json 을 바꾸기 전에 죽으면, 다음 로드 때 그 뒤의 줄은 무시되므로 체크포인트와 어긋나지 않는다.
+  - 정상 종료하면 지우고, 남아 있으면 이전 실행이 중간에 죽은 것이다. (`--resume` 으로 이어서 실행)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..core.config import settings
+
+
+# 1: 행 fingerprint 까지 json 하나에 기록하던 형식 (읽을 때 행 로그로 옮긴다)
+MANIFEST_VERSION = 2
+_HASH_CHUNK = 1024 * 1024
+
+
+def manifest_path() -> Path:
+    return settings.data_dir_path / "ingest_manifest.json"
+
+
+def rows_path(path: Path) -> Path:
+    """매니페스트 json 옆의 행 fingerprint 로그 경로."""
+    return path.with_suffix(".rows")
+
+
+def file_key(path: Path) -> str:
+    return path.resolve().as_posix()
+
+
+def content_key(sha256: str) -> str:
+    """경로가 의미 없는 파일(업로드 임시 파일)의 매니페스트 키."""
+    return f"sha256:{sha256}"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def row_fingerprint(row: Mapping[str, Any]) -> str:
+    """원본 행(헤더 → 값)의 내용 fingerprint. 컬럼 순서/앞뒤 공백/빈 컬럼은 무시한다."""
+    items = sorted(
+        (str(k).strip(), str(v).strip() if v is not None else "")
+        for k, v in row.items()
+        if k
+    )
+    payload = json.dumps([item for item in items if item[1]], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IngestManifest:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rows_path = rows_path(path)
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._rows: Dict[str, str] = {}
+        self._pending_rows: List[Tuple[str, str]] = []  # 아직 행 로그에 쓰지 않은 (fingerprint, 레코드 ID)
+        self._rows_bytes = 0  # 행 로그에서 json 이 커밋한 길이
+        self._checkpoint: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "IngestManifest":
+        manifest = cls(path or manifest_path())
+        if manifest.path.exists():
+            try:
+                data = json.loads(manifest.path.read_text(encoding="utf-8"))
+                version = data.get("version")
+                if version == MANIFEST_VERSION:
+                    manifest._files = data.get("files", {})
+                    manifest._checkpoint = data.get("checkpoint")
+                    manifest._rows_bytes = int(data.get("rows_bytes", 0))
+                    manifest._read_rows()
+                elif version == 1:
+                    manifest._files = data.get("files", {})
+                    manifest._checkpoint = data.get("checkpoint")
+                    # 예전 형식: 다음 save() 때 행 로그로 옮겨 쓴다.
+                    manifest._rows = data.get("rows", {})
+                    manifest._pending_rows = list(manifest._rows.items())
+                    manifest._dirty = True
+            except (OSError, ValueError) as e:
+                # 깨진 매니페스트는 무시하고 처음부터 다시 만든다. (이미 저장된 행은 중복될 수 있음)
+                print(f"[WARN] 인제스트 매니페스트를 읽지 못해 새로 만듭니다: {e}")
+                manifest._files, manifest._rows, manifest._checkpoint = {}, {}, None
+                manifest._pending_rows, manifest._rows_bytes = [], 0
+        manifest._rekey_uploads()
+        return manifest
+
+    def _rekey_uploads(self) -> None:
+        """예전 형식에서 업로드 임시 경로로 기록된 파일 항목을 content_key 로 옮긴다. (임시 파일은 이미 지워짐)"""
+        upload_dir = settings.import_dir.resolve().as_posix() + "/"
+        for key in [k for k in self._files if k.startswith(upload_dir)]:
+            entry = self._files.pop(key)
+            if entry.get("sha256"):
+                self._files.setdefault(content_key(entry["sha256"]), entry)
+            self._dirty = True
+
+    def _read_rows(self) -> None:
+        """행 로그에서 json 이 커밋한 길이(rows_bytes)까지만 읽는다. 그 뒤는 커밋 전에 죽은 실행의 흔적."""
+        if not self._rows_bytes:
+            return
+        with self.rows_path.open("rb") as f:
+            data = f.read(self._rows_bytes)
+        if len(data) < self._rows_bytes:
+            raise ValueError(f"행 로그가 기록된 길이보다 짧습니다: {self.rows_path}")
+        for line in data.decode("utf-8").splitlines():
+            fingerprint, _, record_id = line.partition("\t")
+            if fingerprint:
+                self._rows[fingerprint] = record_id
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def check_file(self, path: Path) -> Optional[Dict[str, Any]]:
+        """바뀐 파일이면 저장할 파일 정보(크기/수정 시각/해시)를, 변경이 없으면 None 을 돌려준다.
+
+        크기/수정 시각이 기록과 같으면 해시는 계산하지 않는다.
+        """
+        stat = path.stat()
+        key = file_key(path)
+        with self._lock:
+            entry = self._files.get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return None
+
+        state = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path)}
+        if entry and entry.get("sha256") == state["sha256"]:
+            # touch 만 된 파일: 다음 실행에서 해시를 다시 계산하지 않도록 수정 시각을 갱신해 둔다.
+            with self._lock:
+                entry.update(state)
+                self._dirty = True
+            return None
+        return state
+
+    def has_content(self, sha256: str) -> bool:
+        """같은 내용(sha256)의 파일을 이미 끝까지 인제스트했는지. (경로가 매번 다른 업로드 파일용)"""
+        with self._lock:
+            if content_key(sha256) in self._files:
+                return True
+            return any(entry.get("sha256") == sha256 for entry in self._files.values())
+
+    def has_row(self, fingerprint: str) -> bool:
+        return fingerprint in self._rows
+
+    def record_rows(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """(fingerprint, 레코드 ID) 목록을 기록. 디스크에는 save() 때 쓴다."""
+        with self._lock:
+            for fingerprint, record_id in entries:
+                self._rows[fingerprint] = record_id
+                self._pending_rows.append((fingerprint, record_id))
+            self._dirty = True
+
+    def mark_file(self, path: Path, state: Dict[str, Any], rows: int, key: Optional[str] = None) -> None:
+        """파일의 모든 행이 저장됐을 때 check_file() 결과로 호출. 다음 실행부터 이 파일은 통째로 건너뛴다.
+
+        key 를 주면 경로 대신 그 키로 기록한다. (업로드 파일은 content_key)
+        """
+        with self._lock:
+            self._files[key or file_key(path)] = {**state, "rows": rows}
+            self._dirty = True
+
+    @property
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """{"last_record_id": str | None, "files": {파일 키: {"sha256", "row_offset"}}} 또는 None"""
+        return self._checkpoint
+
+    def set_checkpoint(self, last_record_id: Optional[str], files: Mapping[str, Mapping[str, Any]]) -> None:
+        """디스크에 저장된 마지막 지점을 기록. last_record_id 는 change_log 에서 이 지점의 마지막 레코드."""
+        with self._lock:
+            self._checkpoint = {
+                "last_record_id": last_record_id,
+                "files": {key: dict(value) for key, value in files.items()},
+            }
+            self._dirty = True
+
+    def clear_checkpoint(self) -> None:
+        with self._lock:
+            if self._checkpoint is not None:
+                self._checkpoint = None
+                self._dirty = True
+
+    def save(self) -> None:
+        """새 행만 행 로그에 덧붙이고, 파일 정보/체크포인트/행 로그 길이를 담은 작은 json 을 교체한다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            rows_bytes = self._rows_bytes
+            if self._pending_rows:
+                payload = "".join(f"{fp}\t{record_id}\n" for fp, record_id in self._pending_rows).encode("utf-8")
+                with self.rows_path.open("r+b" if self.rows_path.exists() else "wb") as f:
+                    # 커밋되지 않은 꼬리(이전 실행이 json 교체 전에 죽은 흔적)는 덮어쓴다.
+                    f.seek(rows_bytes)
+                    f.truncate()
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                rows_bytes += len(payload)
+
+            data = {
+                "version": MANIFEST_VERSION,
+                "files": self._files,
+                "checkpoint": self._checkpoint,
+                "rows_bytes": rows_bytes,
+            }
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+            self._rows_bytes = rows_bytes
+            self._pending_rows = []
+            self._dirty = False
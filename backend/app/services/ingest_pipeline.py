@@ -0,0 +1,283 @@
+"""
+대량 인제스트용 스트리밍 파이프라인.
+
+    [파서 스레드] 행 → DesignChangeInput → 토큰 수 기준 배치
+        │  (bounded queue)
+    [임베딩 워커 N개] 배치마다 embed_texts 1번 (모델별 upstream governor 가 RPM/TPM/재시도 담당)
+        │  (bounded queue)
+    [writer = 호출한 스레드] 배치 순서대로 FAISS / change_log / 인덱스에 반영, 주기적으로 디스크 저장
+
+- 큐 크기가 제한되어 있어 파일 전체를 메모리에 올리지 않는다.
+- 배치는 `ingest_batch_max_tokens` / `ingest_batch_max_items` 중 먼저 닿는 쪽에서 끊는다.
+  (분당 토큰 한도보다 큰 배치는 만들지 않는다)
+- 진행 상황은 `ingest_progress_interval_seconds` 마다 rows/s, tokens/s 로 출력한다.
+- row_key / on_commit / on_persist 로 어떤 원본 행이 저장됐는지 호출 측(증분 매니페스트 등)에 알려 준다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..core.config import settings
+from ..core.models import DesignChangeInput, DesignChangeRecord
+from .context_packer import count_tokens
+from .vectorstore import (
+    commit_design_changes,
+    embed_texts,
+    persist_stores,
+    prepare_design_change,
+)
+
+
+# 원본 행 → (DesignChangeInput, 수치 컬럼) 변환 함수
+RowConverter = Callable[[Dict[str, Any]], Tuple[DesignChangeInput, Optional[Mapping[str, Any]]]]
+
+_DONE = object()
+
+
+@dataclass
+class _Item:
+    record: DesignChangeRecord
+    passages: List[str]
+    tokens: int
+    numeric_values: Optional[Mapping[str, Any]]
+    key: Any = None
+
+
+@dataclass
+class _Batch:
+    seq: int
+    items: List[_Item]
+    vectors: Optional[List[List[List[float]]]] = None  # 항목별 패시지 벡터 목록
+    error: Optional[BaseException] = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(i.tokens for i in self.items)
+
+
+@dataclass
+class IngestProgress:
+    label: str
+    rows_ok: int = 0
+    rows_failed: int = 0
+    rows_skipped: int = 0  # 매니페스트에 이미 있어 파이프라인에 넣지 않은 행 (호출 측이 센다)
+    tokens: int = 0
+    batches: int = 0
+    read_error: Optional[str] = None  # 파일 읽기가 도중에 실패했으면 그 오류
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_ok / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.label}: {self.rows_ok:,}건 성공, {self.rows_failed:,}건 실패 "
+            f"({self.elapsed:.1f}s, {self.rows_per_second:,.1f} rows/s, "
+            f"{self.tokens_per_second:,.0f} tokens/s)"
+        )
+
+
+def _batch_limits() -> Tuple[int, int]:
+    max_tokens = settings.ingest_batch_max_tokens
+    if settings.upstream_tokens_per_minute > 0:
+        max_tokens = min(max_tokens, settings.upstream_tokens_per_minute)
+    return max(1, max_tokens), max(1, settings.ingest_batch_max_items)
+
+
+def run_ingest_pipeline(
+    rows: Iterable[Dict[str, Any]],
+    convert: RowConverter,
+    label: str,
+    on_progress: Optional[Callable[[IngestProgress], None]] = None,
+    progress: Optional[IngestProgress] = None,
+    row_key: Optional[Callable[[Any], Any]] = None,
+    on_commit: Optional[Callable[[List[Any], List[DesignChangeRecord]], None]] = None,
+    on_persist: Optional[Callable[[], None]] = None,
+    on_failed: Optional[Callable[[List[Any]], None]] = None,
+) -> IngestProgress:
+    """rows 를 변환/임베딩/저장하고 최종 진행 상황을 돌려준다. 개별 행/배치 실패는 건너뛴다.
+
+    progress 를 넘기면 그 객체를 실시간으로 갱신한다. (백그라운드 작업 상태 조회용)
+    on_commit(keys, records): 배치가 저장될 때마다 row_key(row) 목록과 레코드를 넘긴다. (writer 스레드)
+    on_persist(): FAISS / 수치 저장소를 디스크에 저장한 직후 호출. 디스크에 남은 상태를 기록할 때 사용.
+    on_failed(keys): 임베딩에 실패해 저장하지 못한 배치의 row_key 목록.
+    """
+    if progress is None:
+        progress = IngestProgress(label=label)
+    max_tokens, max_items = _batch_limits()
+    workers = max(1, settings.ingest_embed_workers)
+
+    embed_queue: "queue.Queue[Any]" = queue.Queue(maxsize=settings.ingest_queue_size)
+    write_queue: "queue.Queue[Any]" = queue.Queue(maxsize=settings.ingest_queue_size)
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def put(q: "queue.Queue[Any]", item: Any) -> bool:
+        # writer 가 중단되면 가득 찬 큐에서 영원히 막히지 않도록 주기적으로 stop 을 확인한다.
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def parse() -> None:
+        seq = 0
+        pending: List[_Item] = []
+        pending_tokens = 0
+        pending_inputs = 0  # 임베딩 요청 입력 수 (패시지 수)
+        try:
+            try:
+                for row in rows:
+                    if stop.is_set():
+                        return
+                    try:
+                        change_input, numeric_values = convert(row)
+                        record, passages = prepare_design_change(change_input)
+                    except Exception as e:
+                        print(f"[WARN] 레코드 변환 실패: {e} / 데이터: {row}")
+                        with lock:
+                            progress.rows_failed += 1
+                        continue
+
+                    tokens = sum(count_tokens(p) for p in passages)
+                    if pending and (
+                        pending_tokens + tokens > max_tokens
+                        or pending_inputs + len(passages) > max_items
+                    ):
+                        if not put(embed_queue, _Batch(seq, pending)):
+                            return
+                        seq += 1
+                        pending, pending_tokens, pending_inputs = [], 0, 0
+                    key = row_key(row) if row_key is not None else None
+                    pending.append(_Item(record, passages, tokens, numeric_values, key))
+                    pending_tokens += tokens
+                    pending_inputs += len(passages)
+            except Exception as e:
+                # 파일 읽기 자체가 실패한 경우: 지금까지 읽은 행까지는 저장하고 끝낸다.
+                print(f"[ERROR] {label}: 행 읽기 실패: {e}")
+                progress.read_error = str(e)
+
+            if pending:
+                put(embed_queue, _Batch(seq, pending))
+        finally:
+            for _ in range(workers):
+                put(embed_queue, _DONE)
+
+    def embed() -> None:
+        while True:
+            try:
+                batch = embed_queue.get(timeout=0.5)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if batch is _DONE:
+                put(write_queue, _DONE)
+                return
+            try:
+                # 레코드별 패시지를 한 요청으로 펼쳐 임베딩한 뒤 다시 레코드별로 나눈다.
+                flat = embed_texts([p for i in batch.items for p in i.passages])
+                vectors: List[List[List[float]]] = []
+                offset = 0
+                for i in batch.items:
+                    vectors.append(flat[offset : offset + len(i.passages)])
+                    offset += len(i.passages)
+                batch.vectors = vectors
+            except Exception as e:
+                batch.error = e
+            if not put(write_queue, batch):
+                return
+
+    threads = [threading.Thread(target=parse, name="ingest-parse", daemon=True)]
+    threads += [
+        threading.Thread(target=embed, name=f"ingest-embed-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    # writer: 워커 완료 순서와 관계없이 파서가 만든 배치 순서대로 저장한다.
+    ready: Dict[int, _Batch] = {}
+    next_seq = 0
+    finished_workers = 0
+    unsaved_batches = 0
+    last_report = time.perf_counter()
+    try:
+        while finished_workers < workers:
+            item = write_queue.get()
+            if item is _DONE:
+                finished_workers += 1
+                continue
+            ready[item.seq] = item
+
+            while next_seq in ready:
+                batch = ready.pop(next_seq)
+                next_seq += 1
+                if batch.error is not None or batch.vectors is None:
+                    print(
+                        f"[WARN] {label}: 배치 {batch.seq} 임베딩 실패 "
+                        f"({len(batch.items)}건): {batch.error}"
+                    )
+                    with lock:
+                        progress.rows_failed += len(batch.items)
+                    if on_failed is not None:
+                        on_failed([i.key for i in batch.items])
+                    continue
+
+                commit_design_changes(
+                    [
+                        (i.record, vector, i.numeric_values)
+                        for i, vector in zip(batch.items, batch.vectors)
+                    ],
+                    persist=False,
+                )
+                if on_commit is not None:
+                    on_commit([i.key for i in batch.items], [i.record for i in batch.items])
+                unsaved_batches += 1
+                if unsaved_batches >= settings.ingest_persist_every_batches:
+                    persist_stores()
+                    unsaved_batches = 0
+                    if on_persist is not None:
+                        on_persist()
+
+                with lock:
+                    progress.rows_ok += len(batch.items)
+                    progress.tokens += batch.tokens
+                    progress.batches += 1
+
+                now = time.perf_counter()
+                if now - last_report >= settings.ingest_progress_interval_seconds:
+                    last_report = now
+                    print(f"[PROGRESS] {progress.summary()}")
+                    if on_progress is not None:
+                        on_progress(progress)
+    finally:
+        stop.set()
+        if unsaved_batches:
+            persist_stores()
+            if on_persist is not None:
+                on_persist()
+        for t in threads:
+            t.join(timeout=5)
+
+    progress.finished = time.perf_counter()
+    if on_progress is not None:
+        on_progress(progress)
+    return progress
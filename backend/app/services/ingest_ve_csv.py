@@ -13,20 +13,29 @@
 
     cd backend
     python -m app.services.ingest_ve_csv data/ve_proposals.xlsx
+    python -m app.services.ingest_ve_csv data --workers 8 --ordered
+    python -m app.services.ingest_ve_csv data --resume   # 중단된 실행 이어서
 """
 
 from __future__ import annotations
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import csv
-import sys
 from datetime import date
+import multiprocessing
 from pathlib import Path
-from typing import Iterable, Dict, Any
+import queue
+from typing import Callable, Iterable, Iterator, Dict, Any, Generator, List, Mapping, Optional, Tuple
 
 from openpyxl import load_workbook
 
+from ..core.config import settings
 from ..core.models import DesignChangeInput
-from .vectorstore import add_design_change
+from .ingest_manifest import IngestManifest, content_key, file_key, row_fingerprint
+from .ingest_pipeline import IngestProgress, run_ingest_pipeline
+from .numeric_store import numeric_values_from_row
+from .vectorstore import get_latest_change, rollback_to_record
 
 
 REQUIRED_COLUMNS = [
@@ -128,44 +137,32 @@ def _load_csv(path: Path) -> Iterable[Dict[str, Any]]:
             if not str(row.get("제안명", "")).strip():
                 continue
             yield row
-def _load_xlsx(path: Path) -> Iterable[Dict[str, Any]]:
-    """
-    XLSX 파일에서 헤더/데이터 행을 읽어 Dict 로 변환.
-    시트 상단에 제목/기준일자 행이 여러 줄 있을 수 있다고 가정한다.
-    """
-    wb = load_workbook(filename=path, data_only=True)
-    ws = wb.active
+def _cell_text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
 
-    header_row_index: int | None = None
+def _iter_sheet_rows(ws: Any, sheet_label: str) -> Generator[Dict[str, Any], None, bool]:
+    """시트 한 장을 위에서부터 스트리밍으로 읽으며 헤더를 찾고, 그 아래 데이터 행을 Dict 로 변환.
+
+    헤더를 찾았는지 여부를 제너레이터 반환값으로 돌려준다. (`yield from` 결과)
+    """
     header: list[str] | None = None
 
-    for idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
-        cells = [
-            (str(c).strip() if c is not None else "") for c in row
-        ]
+    for row in ws.iter_rows(values_only=True):
+        cells = [_cell_text(c) for c in row]
         if not any(cells):
             continue
-        if {"기관명", "사업명", "제안명", "제안일자"}.issubset(set(cells)):
-            header_row_index = idx
-            header = cells
-            break
-
-    if header_row_index is None or header is None:
-        raise RuntimeError("XLSX에서 헤더 행(기관명,사업명,제안명,제안일자 포함)을 찾지 못했습니다.")
-
-    missing = [c for c in REQUIRED_COLUMNS if c not in header]
-    if missing:
-        raise RuntimeError(f"XLSX 헤더에 필수 컬럼이 없습니다: {missing}")
 
-    # 헤더 바로 다음 줄부터 데이터 시작
-    for row in ws.iter_rows(min_row=header_row_index + 1, values_only=True):
-        values = [
-            (str(c).strip() if c is not None else "") for c in row
-        ]
-        if not any(values):
+        if header is None:
+            if {"기관명", "사업명", "제안명", "제안일자"}.issubset(set(cells)):
+                header = cells
+                missing = [c for c in REQUIRED_COLUMNS if c not in header]
+                if missing:
+                    raise RuntimeError(f"XLSX 헤더에 필수 컬럼이 없습니다: {missing} ({sheet_label})")
             continue
+
         row_dict: Dict[str, Any] = {}
-        for col_name, value in zip(header, values):
+        for col_name, value in zip(header, cells):
             if col_name:
                 row_dict[col_name] = value
 
@@ -173,6 +170,33 @@ def _load_xlsx(path: Path) -> Iterable[Dict[str, Any]]:
             continue
         yield row_dict
 
+    if header is None:
+        print(f"[WARN] 헤더 행을 찾지 못해 건너뜀: {sheet_label}")
+        return False
+    return True
+
+
+def _load_xlsx(path: Path) -> Iterable[Dict[str, Any]]:
+    """
+    XLSX 파일에서 헤더/데이터 행을 읽어 Dict 로 변환.
+    시트 상단에 제목/기준일자 행이 여러 줄 있을 수 있다고 가정한다.
+
+    - read-only 모드로 열어서 셀 객체를 한꺼번에 만들지 않고 행 단위로 스트리밍한다. (메모리 일정)
+    - 활성 시트만이 아니라 모든 시트를 순서대로 읽고, 시트마다 헤더를 따로 찾는다.
+    """
+    wb = load_workbook(filename=path, read_only=True, data_only=True)
+    found_header = False
+    try:
+        for ws in wb.worksheets:
+            if (yield from _iter_sheet_rows(ws, f"{path.name}/{ws.title}")):
+                found_header = True
+    finally:
+        # read-only 워크북은 파일 핸들을 열어 두므로 반드시 닫는다.
+        wb.close()
+
+    if not found_header:
+        raise RuntimeError("XLSX에서 헤더 행(기관명,사업명,제안명,제안일자 포함)을 찾지 못했습니다.")
+
 
 def _iter_rows_from_file(path: Path) -> Iterable[Dict[str, Any]]:
     suffix = path.suffix.lower()
@@ -183,46 +207,395 @@ def _iter_rows_from_file(path: Path) -> Iterable[Dict[str, Any]]:
     raise RuntimeError(f"지원하지 않는 파일 형식입니다: {suffix}")
 
 
-def ingest_file(path: Path) -> None:
-    """단일 CSV/XLSX 파일을 읽어 벡터DB에 적재."""
-    if not path.exists():
-        print(f"[ERROR] 파일을 찾을 수 없습니다: {path}")
-        return
+def estimate_row_count(path: Path) -> Optional[int]:
+    """진행률/ETA 용 데이터 행 수 추정치. 행을 파싱하지 않고 싸게 센다. (모르면 None)
+
+    - CSV: 줄바꿈 수 - 1 (헤더 위 제목 줄, 따옴표 안 줄바꿈, 빈 행 때문에 조금 많게 나올 수 있음)
+    - XLSX: read-only 워크북의 시트별 max_row(저장된 dimension) - 1 의 합
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        newlines = 0
+        last = b"\n"
+        with path.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                newlines += chunk.count(b"\n")
+                last = chunk[-1:]
+        lines = newlines + (last != b"\n")
+        return max(0, lines - 1)
+    if suffix in {".xlsx", ".xlsm"}:
+        wb = load_workbook(filename=path, read_only=True)
+        try:
+            counts = [ws.max_row for ws in wb.worksheets]
+        finally:
+            wb.close()
+        if any(c is None for c in counts):
+            return None
+        return sum(max(0, c - 1) for c in counts)
+    return None
+
+
+def _row_to_change(row: Dict[str, Any]) -> Tuple[DesignChangeInput, Dict[str, float]]:
+    change = DesignChangeInput(
+        change_date=_parse_date(row["제안일자"]),
+        title=str(row["제안명"]).strip(),
+        description=_build_description(row),
+        author=None,
+        organization=str(row.get("기관명", "")).strip() or None,
+        project_name=str(row.get("사업명", "")).strip() or None,
+        client=str(row.get("요청발주처", "")).strip() or None,
+    )
+    # 절감액/LCC/점수 같은 수치는 원본 컬럼에서 바로 파싱해 컬럼형 저장소에도 넣는다.
+    return change, numeric_values_from_row(row)
 
-    count_ok = 0
-    count_fail = 0
 
-    for row in _iter_rows_from_file(path):
+# 파싱된 행: (파일 번호, 행 번호, 원본 행 fingerprint, DesignChangeInput | None, 수치 컬럼 | 변환 오류 메시지)
+ParsedRow = Tuple[int, int, str, Optional[DesignChangeInput], Any]
+
+
+def _iter_parsed_rows(file_no: int, path: Path, skip_rows: int = 0) -> Iterator[ParsedRow]:
+    """파일의 데이터 행을 ParsedRow 로 변환. skip_rows 이전 행(체크포인트로 이미 저장된 행)은 변환하지 않는다."""
+    for row_no, row in enumerate(_iter_rows_from_file(path)):
+        if row_no < skip_rows:
+            continue
+        fingerprint = row_fingerprint(row)
         try:
-            change = DesignChangeInput(
-                change_date=_parse_date(row["제안일자"]),
-                title=str(row["제안명"]).strip(),
-                description=_build_description(row),
-                author=None,
-                organization=str(row.get("기관명", "")).strip() or None,
-                project_name=str(row.get("사업명", "")).strip() or None,
-                client=str(row.get("요청발주처", "")).strip() or None,
-            )
-            add_design_change(change)
-            count_ok += 1
+            change, numeric_values = _row_to_change(row)
+            yield file_no, row_no, fingerprint, change, numeric_values
         except Exception as e:
-            print(f"[WARN] 레코드 변환/저장 실패: {e} / 데이터: {row}")
-            count_fail += 1
+            yield file_no, row_no, fingerprint, None, f"{e} / 데이터: {row}"
+
+
+def _parsed_to_change(item: ParsedRow) -> Tuple[DesignChangeInput, Any]:
+    change, payload = item[3], item[4]
+    if change is None:
+        raise RuntimeError(payload)
+    return change, payload
+
+
+def _parsed_key(item: ParsedRow) -> Tuple[int, int, str]:
+    return item[0], item[1], item[2]
 
-    print(f"[DONE] {path.name} → 총 {count_ok}건 성공, {count_fail}건 실패")
 
+class _ManifestTracker:
+    """한 번의 실행에서 파일별로 "새로 넣어야 할 행 수 / 실제 저장된 행 수"를 세고 매니페스트/체크포인트를 갱신한다.
 
-def ingest_path(target: Path) -> None:
+    - 파일의 새 행이 모두 저장되고 읽기 오류도 없었을 때만 파일을 완료로 기록한다.
+      (임베딩 실패로 빠진 행이 있으면 다음 실행에서 그 파일을 다시 읽고, 빠진 행만 임베딩한다)
+    - 디스크 저장(on_persist)마다 파일별 행 오프셋과 마지막 레코드 ID 를 체크포인트로 남긴다.
+      파일 안에서는 행 순서대로 저장되므로, 오프셋 이전 행은 모두 저장됐거나 이미 있던 행이다.
+      임베딩 실패가 난 파일은 그 지점에서 오프셋을 더 올리지 않는다. (재개 시 실패한 행부터 다시 읽음)
+    """
+
+    def __init__(
+        self,
+        manifest: IngestManifest,
+        files: List[Tuple[Path, Dict[str, Any]]],
+        resume_offsets: Mapping[str, Mapping[str, Any]],
+        progress: Optional[IngestProgress] = None,
+        keys: Optional[List[str]] = None,
+    ) -> None:
+        self.manifest = manifest
+        self.files = files
+        # 매니페스트/체크포인트의 파일 키 (기본은 경로, 업로드 파일은 content_key)
+        self.keys = keys or [file_key(path) for path, _ in files]
+        self.progress = progress
+        self.expected = [0] * len(files)
+        self.committed = [0] * len(files)
+        self.skipped = [0] * len(files)
+        self.seen = [0] * len(files)
+        self.read_failed: set[int] = set()
+        self.frozen: set[int] = set()
+        self.last_record_id: Optional[str] = None
+
+        self.offsets = [0] * len(files)
+        for file_no, (path, state) in enumerate(files):
+            previous = resume_offsets.get(self.keys[file_no])
+            # 체크포인트 이후 파일 내용이 바뀌었다면 오프셋은 쓰지 않고 fingerprint 로만 거른다.
+            if previous and previous.get("sha256") == state["sha256"]:
+                self.offsets[file_no] = int(previous.get("row_offset", 0))
+        self.start_offsets = list(self.offsets)
+
+    def begin(self) -> None:
+        """시작 지점(현재 change_log 의 마지막 레코드)을 체크포인트로 남긴다."""
+        latest = get_latest_change()
+        self.last_record_id = latest.id if latest else None
+        for file_no, (path, _) in enumerate(self.files):
+            if self.offsets[file_no]:
+                print(f"[RESUME] {path.name}: {self.offsets[file_no]:,}번째 행부터 이어서 처리합니다.")
+        self.on_persist()
+
+    def filter(self, parsed: Iterable[ParsedRow], file_no: int | None = None) -> Iterator[ParsedRow]:
+        """이미 저장된 fingerprint 의 행을 걸러 낸다. file_no 를 주면 읽기 오류를 그 파일 실패로 기록한다."""
+        try:
+            for item in parsed:
+                no, _, fingerprint, change, _ = item
+                self.seen[no] += 1
+                if self.manifest.has_row(fingerprint):
+                    self.skipped[no] += 1
+                    if self.progress is not None:
+                        self.progress.rows_skipped += 1
+                    continue
+                if change is not None:
+                    self.expected[no] += 1
+                yield item
+        except Exception:
+            if file_no is not None:
+                self.read_failed.add(file_no)
+            raise
+
+    def file_failed(self, file_no: int) -> None:
+        self.read_failed.add(file_no)
+
+    def on_commit(self, keys: List[Tuple[int, int, str]], records: List[Any]) -> None:
+        self.manifest.record_rows((fingerprint, r.id) for (_, _, fingerprint), r in zip(keys, records))
+        for file_no, row_no, _ in keys:
+            self.committed[file_no] += 1
+            if file_no not in self.frozen:
+                self.offsets[file_no] = row_no + 1
+        self.last_record_id = records[-1].id
+
+    def on_failed(self, keys: List[Tuple[int, int, str]]) -> None:
+        for file_no, _, _ in keys:
+            self.frozen.add(file_no)
+
+    def on_persist(self) -> None:
+        self.manifest.set_checkpoint(
+            self.last_record_id,
+            {
+                self.keys[file_no]: {"sha256": state["sha256"], "row_offset": self.offsets[file_no]}
+                for file_no, (_, state) in enumerate(self.files)
+            },
+        )
+        self.manifest.save()
+
+    def finish(self) -> None:
+        for file_no, (path, state) in enumerate(self.files):
+            skipped = self.skipped[file_no]
+            if file_no in self.read_failed or self.committed[file_no] < self.expected[file_no]:
+                print(f"[WARN] {path.name}: 저장되지 않은 행이 있어 다음 실행에서 다시 확인합니다.")
+                continue
+            self.manifest.mark_file(
+                path, state, self.start_offsets[file_no] + self.seen[file_no], key=self.keys[file_no]
+            )
+            if skipped:
+                print(f"[INFO] {path.name}: 이미 저장된 행 {skipped:,}건은 건너뛰었습니다.")
+        # 끝까지 실행됐으므로 재개할 지점이 없다.
+        self.manifest.clear_checkpoint()
+        self.manifest.save()
+
+
+def _recover_checkpoint(manifest: IngestManifest, resume: bool) -> Optional[Dict[str, Any]]:
+    """이전 실행이 중단돼 체크포인트가 남아 있으면 resume 일 때만 그 지점으로 되돌린다.
+
+    재개할 파일별 오프셋(없으면 빈 dict)을 돌려주고, 진행하면 안 되는 경우 None.
+    """
+    checkpoint = manifest.checkpoint
+    if checkpoint is None:
+        if resume:
+            print("[INFO] 이어서 처리할 체크포인트가 없어 처음부터 처리합니다.")
+        return {}
+    if not resume:
+        print(
+            "[ERROR] 이전 인제스트가 중간에 중단되었습니다. "
+            "중복 저장을 막기 위해 `--resume` 을 붙여 이어서 실행하세요."
+        )
+        return None
+
+    # change_log 에는 쓰였지만 FAISS 저장 전에 죽은 배치를 되돌려서, 다시 처리해도 중복되지 않게 한다.
+    removed = rollback_to_record(checkpoint.get("last_record_id"))
+    if removed:
+        print(f"[RESUME] 체크포인트 이후 디스크에 저장되지 않은 레코드 {removed:,}건을 되돌렸습니다.")
+    return checkpoint.get("files") or {}
+
+
+def _changed_files(files: List[Path], manifest: IngestManifest) -> List[Tuple[Path, Dict[str, Any]]]:
+    changed = []
+    for path in files:
+        state = manifest.check_file(path)
+        if state is None:
+            print(f"[SKIP] 변경 없음: {path.name}")
+            continue
+        changed.append((path, state))
+    return changed
+
+
+def _finish_without_changes(manifest: IngestManifest) -> None:
+    manifest.clear_checkpoint()
+    manifest.save()
+
+
+def ingest_file(path: Path, resume: bool = False) -> None:
+    """단일 CSV/XLSX 파일을 읽어 벡터DB에 적재.
+
+    행 파싱 → 토큰 수 기준 배치 → 병렬 임베딩 → 순서대로 저장하는 스트리밍 파이프라인으로 처리한다.
+    매니페스트를 보고 바뀌지 않은 파일은 건너뛰고, 바뀐 파일도 새 행/바뀐 행만 임베딩한다.
+    resume=True 면 중단된 이전 실행의 체크포인트부터 이어서 처리한다.
+    """
+    if not path.exists():
+        print(f"[ERROR] 파일을 찾을 수 없습니다: {path}")
+        return
+
+    manifest = IngestManifest.load()
+    resume_offsets = _recover_checkpoint(manifest, resume)
+    if resume_offsets is None:
+        return
+    changed = _changed_files([path], manifest)
+    if not changed:
+        _finish_without_changes(manifest)
+        return
+    _ingest_changed_file(path, changed[0][1], manifest, resume_offsets)
+
+
+def _ingest_changed_file(
+    path: Path,
+    state: Dict[str, Any],
+    manifest: IngestManifest,
+    resume_offsets: Mapping[str, Mapping[str, Any]],
+    progress: Optional[IngestProgress] = None,
+    key: Optional[str] = None,
+) -> IngestProgress:
+    tracker = _ManifestTracker(
+        manifest, [(path, state)], resume_offsets, progress=progress, keys=[key] if key else None
+    )
+    tracker.begin()
+    progress = run_ingest_pipeline(
+        tracker.filter(_iter_parsed_rows(0, path, tracker.offsets[0]), file_no=0),
+        _parsed_to_change,
+        label=progress.label if progress is not None else path.name,
+        progress=progress,
+        row_key=_parsed_key,
+        on_commit=tracker.on_commit,
+        on_persist=tracker.on_persist,
+        on_failed=tracker.on_failed,
+    )
+    tracker.finish()
+    print(f"[DONE] {progress.summary()}")
+    return progress
+
+
+def ingest_uploaded_file(path: Path, progress: IngestProgress) -> bool:
+    """관리자 업로드 파일 인제스트 (import_jobs 백그라운드 작업용). 같은 내용이라 건너뛰었으면 False.
+
+    CLI 와 같은 매니페스트/체크포인트를 써서 이미 저장된 행은 다시 임베딩하지 않는다.
+    업로드 파일은 매번 새 경로로 저장되므로 파일 단위 비교는 경로 대신 내용 해시로 한다.
+    행 읽기가 도중에 실패하면 progress.read_error 에 남는다.
+    """
+    manifest = IngestManifest.load()
+    if manifest.checkpoint is not None:
+        # 중단된(또는 실행 중인) CLI 인제스트의 레코드를 되돌리면 안 되므로 여기서는 재개하지 않는다.
+        raise RuntimeError(
+            "이전 인제스트가 중간에 중단되었거나 CLI 인제스트가 실행 중입니다. "
+            "CLI 에서 `--resume` 으로 먼저 마무리한 뒤 다시 업로드하세요."
+        )
+    state = manifest.check_file(path)
+    if state is None or manifest.has_content(state["sha256"]):
+        print(f"[SKIP] 이미 인제스트한 파일과 내용이 같습니다: {progress.label}")
+        return False
+    _ingest_changed_file(path, state, manifest, {}, progress=progress, key=content_key(state["sha256"]))
+    return True
+
+
+def _parse_file_worker(file_no: int, path_str: str, out: Any, batch_size: int, skip_rows: int) -> None:
+    """프로세스 풀 워커: 파일 하나를 읽어 ParsedRow 로 정규화한 뒤 batch_size 건씩 out 큐로 보낸다.
+
+    큐 메시지: (file_no, "rows", [ParsedRow, ...]) / (file_no, "done", None) / (file_no, "error", 메시지)
+    """
+    batch: list[ParsedRow] = []
+    try:
+        for item in _iter_parsed_rows(file_no, Path(path_str), skip_rows):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                out.put((file_no, "rows", batch))
+                batch = []
+        if batch:
+            out.put((file_no, "rows", batch))
+        out.put((file_no, "done", None))
+    except Exception as e:
+        out.put((file_no, "error", f"{Path(path_str).name}: {e}"))
+
+
+def _iter_parsed_directory(
+    files: List[Path],
+    workers: int,
+    ordered: bool,
+    skip_rows: List[int],
+    on_file_error: Callable[[int], None] | None = None,
+) -> Iterator[ParsedRow]:
+    """여러 파일을 프로세스 풀에서 병렬로 파싱하고, 정규화된 결과를 하나의 스트림으로 합친다.
+
+    ordered=True 면 파일 이름 순 → 행 순서를 그대로 지켜서 내보낸다. (레코드 ID 가 부여되는 순서가 항상 같음)
+    이때 앞 파일이 끝날 때까지 뒤 파일 결과는 메모리에 모아 둔다.
+    ordered=False 여도 한 파일 안의 행 순서는 유지된다. (파일 하나는 워커 하나가 처음부터 끝까지 읽음)
+    """
+    manager = multiprocessing.Manager()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        out = manager.Queue(maxsize=workers * 4)
+        futures = {
+            pool.submit(
+                _parse_file_worker, i, str(p), out, settings.ingest_parse_batch_rows, skip_rows[i]
+            ): i
+            for i, p in enumerate(files)
+        }
+        finished: set[int] = set()
+        buffered: Dict[int, list] = {}
+        current = 0
+
+        while len(finished) < len(files):
+            try:
+                file_no, kind, payload = out.get(timeout=1.0)
+            except queue.Empty:
+                # 워커 프로세스가 죽은 경우(메모리 부족 등) 완료 메시지가 오지 않으므로 future 로 확인한다.
+                for future, file_no in futures.items():
+                    if future.done() and future.exception() and file_no not in finished:
+                        print(f"[ERROR] {files[file_no].name}: 파싱 프로세스 실패: {future.exception()}")
+                        finished.add(file_no)
+                        if on_file_error is not None:
+                            on_file_error(file_no)
+                kind = None
+
+            if kind == "rows":
+                if not ordered or file_no == current:
+                    yield from payload
+                else:
+                    buffered.setdefault(file_no, []).extend(payload)
+            elif kind in ("done", "error"):
+                if kind == "error":
+                    print(f"[ERROR] {payload}")
+                    if on_file_error is not None:
+                        on_file_error(file_no)
+                finished.add(file_no)
+
+            if ordered:
+                while current in finished:
+                    current += 1
+                    yield from buffered.pop(current, [])
+    finally:
+        # 소비가 중간에 멈춰도 큐에 막힌 워커가 남지 않도록 매니저부터 내린다.
+        manager.shutdown()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def ingest_path(
+    target: Path,
+    workers: int | None = None,
+    ordered: bool = False,
+    resume: bool = False,
+) -> None:
     """
     - 파일 경로가 들어오면 그 파일만 처리
     - 디렉터리 경로가 들어오면 내부의 모든 .csv/.xlsx 파일을 한 번에 처리
+      (workers > 1 이면 파일 파싱은 프로세스 풀에서 병렬로, 임베딩/저장은 하나의 파이프라인에서)
+    - 인제스트 매니페스트(`data/ingest_manifest.json` + `.rows`)를 보고 바뀐 파일의 새 행/바뀐 행만 처리한다.
+    - resume=True 면 중단된 이전 실행의 체크포인트(파일별 행 오프셋, 마지막 레코드 ID)부터 이어서 처리한다.
     """
     if not target.exists():
         print(f"[ERROR] 경로를 찾을 수 없습니다: {target}")
         return
 
     if target.is_file():
-        ingest_file(target)
+        ingest_file(target, resume=resume)
         return
 
     files = sorted(
@@ -236,23 +609,72 @@ def ingest_path(target: Path) -> None:
         print(f"[WARN] 디렉터리 내에 CSV/XLSX 파일이 없습니다: {target}")
         return
 
-    for file_path in files:
-        ingest_file(file_path)
+    manifest = IngestManifest.load()
+    resume_offsets = _recover_checkpoint(manifest, resume)
+    if resume_offsets is None:
+        return
+    changed = _changed_files(files, manifest)
+    print(f"[INFO] 파일 {len(files)}개 중 {len(changed)}개가 새로 추가/변경되었습니다.")
+    if not changed:
+        _finish_without_changes(manifest)
+        return
+
+    workers = min(workers or settings.ingest_parse_workers, len(changed))
+    if workers <= 1:
+        for file_path, state in changed:
+            _ingest_changed_file(file_path, state, manifest, resume_offsets)
+        return
+
+    print(f"[INFO] {len(changed)}개 파일을 {workers}개 프로세스로 파싱합니다. (ordered={ordered})")
+    tracker = _ManifestTracker(manifest, changed, resume_offsets)
+    tracker.begin()
+    progress = run_ingest_pipeline(
+        tracker.filter(
+            _iter_parsed_directory(
+                [p for p, _ in changed],
+                workers,
+                ordered,
+                tracker.offsets,
+                on_file_error=tracker.file_failed,
+            )
+        ),
+        _parsed_to_change,
+        label=target.name or str(target),
+        row_key=_parsed_key,
+        on_commit=tracker.on_commit,
+        on_persist=tracker.on_persist,
+        on_failed=tracker.on_failed,
+    )
+    tracker.finish()
+    print(f"[DONE] {progress.summary()}")
 
 
 def main(argv: list[str] | None = None) -> None:
-    argv = argv or sys.argv[1:]
-    if not argv:
-        print("사용법:")
-        print("  단일 파일: python -m app.services.ingest_ve_csv data/ve_proposals.xlsx")
-        print("  디렉터리: python -m app.services.ingest_ve_csv data")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.ingest_ve_csv",
+        description="VE 제안 목록 CSV/XLSX 파일(또는 디렉터리)을 FAISS 벡터DB에 적재",
+    )
+    parser.add_argument("path", type=Path, help="CSV/XLSX 파일 또는 파일들이 들어 있는 디렉터리")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ingest_parse_workers,
+        help="디렉터리 파싱에 쓸 프로세스 수 (기본: CPU 코어 수, 1 이면 파일을 하나씩 처리)",
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="파일 이름/행 순서대로 저장 (레코드 등록 순서를 항상 같게, 대신 메모리를 더 씀)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="중단된 이전 실행의 마지막 저장 지점(체크포인트)부터 이어서 처리",
+    )
+    args = parser.parse_args(argv)
 
-    file_path = Path(argv[0])
-    ingest_path(file_path)
+    ingest_path(args.path, workers=args.workers, ordered=args.ordered, resume=args.resume)
 
 
 if __name__ == "__main__":
     main()
-
-
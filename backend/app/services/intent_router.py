@@ -0,0 +1,419 @@
+"""
+작업자 질문의 구조화된 의도(intent)를 규칙으로 분류하고, 해당하면 변경 인덱스에서 바로 답하는 라우터.
+
+지원하는 의도
+- latest     : "가장 최근에 등록된 설계변경 (N건)"
+- by_project : "○○사업 설계변경 목록"
+- by_date    : "2024년 3월 설계변경", "2024-03-05 제안"
+- top_metric : "절감액이 가장 큰 제안 5건", "which proposals saved the most" (VE 수치 컬럼 저장소 사용)
+
+내용/효과/비용 설명처럼 문서 본문이 필요한 질문은 분류하지 않고 기존 RAG 경로로 보낸다.
+키워드는 단어 단위로 찾고, 의도/날짜/건수/사업명/질문 틀 단어를 빼고도 남는 단어가 있으면
+("최근 교량 받침 관련 설계변경", "2024년에 변경된 배수 공법") 주제 검색이 필요한 질문으로 보고 RAG 로 보낸다.
+분류 결과는 질문 문자열 기준으로 캐시하고, 답변은 템플릿 + (캐시된) 메타데이터 번역으로 만든다.
+"""
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+import re
+from typing import Callable, Dict, List, Optional
+
+from ..core.config import settings
+from ..core.models import (
+    DesignChangeRecord,
+    LanguageCode,
+    WorkerChatAnswerSource,
+    WorkerChatResponse,
+)
+from .change_index import ChangeIndex
+from .numeric_store import NumericStore
+
+
+# 문서 본문이 필요한 질문 (RAG 로 보냄). 부분 문자열로 찾으므로 넓게 걸려도 RAG 로 갈 뿐이다.
+_CONTENT_WORDS = (
+    "내용", "효과", "이유", "왜", "설명", "요약", "비용", "lcc", "안전", "어떻게", "방법",
+    "content", "detail", "explain", "summar", "why", "effect", "impact", "cost", "safety",
+    "内容", "效果", "说明", "原因", "成本", "安全",
+    "nội dung", "hiệu quả", "chi phí", "giải thích", "tại sao", "an toàn",
+    "зміст", "ефект", "вартість", "поясн", "чому", "безпек",
+)
+
+# 아래 단어 목록은 단어 단위로 찾는다. (_word_pattern 참고, 끝의 * 는 어간)
+_LATEST_WORDS = (
+    "최근", "최신", "마지막",
+    "latest", "most recent", "recent", "recently", "newest", "last",
+    "最近", "最新",
+    "mới nhất", "gần đây", "gần nhất",
+    "останн*", "найнов*",
+)
+_LIST_WORDS = (
+    "목록", "리스트", "어떤", "몇 건", "건수", "모두", "전부",
+    "list", "which", "all",
+    "列表", "哪些", "所有",
+    "danh sách", "những", "tất cả",
+    "список", "які", "всі", "усі",
+)
+
+# VE 수치 질문: (절감액/절감율 단어) + (순위 단어) 가 함께 있으면 수치 저장소에서 답한다.
+_SAVINGS_RATE_WORDS = (
+    "절감율", "절감률", "savings rate", "saving rate", "节约率", "节省率",
+    "tỷ lệ tiết kiệm", "відсоток економії",
+)
+_SAVINGS_WORDS = (
+    "절감", "saved", "saving*", "节约", "节省", "tiết kiệm", "економ*",
+)
+_RANK_WORDS = (
+    "가장", "많이", "많은", "높은", "큰", "상위", "순위",
+    "most", "highest", "largest", "biggest", "top",
+    "最多", "最高", "最大",
+    "nhiều nhất", "cao nhất", "lớn nhất",
+    "найбільш*", "найвищ*",
+)
+# 질문의 틀을 이루는 단어 (설계변경/제안/보여줘/the/of ...). 의도·날짜·건수·사업명과 이 단어들을
+# 지우고도 남는 단어가 있으면 주제가 있는 질문("최근 교량 받침 관련 변경")이므로 RAG 로 보낸다.
+_FRAME_WORDS = (
+    "설계변경", "설계", "변경", "제안", "등록", "내역", "사항", "관련", "보여", "알려", "찾아", "조회",
+    "정리", "뭐", "무엇", "무슨", "어느", "있었", "있나", "있는", "있어", "있습", "되었", "되어", "됐", "된",
+    "했", "하였", "해주", "해줘", "주세요", "전체", "모든", "기준", "순서", "언제", "요즘", "이번", "현재",
+    "the", "a", "an", "of", "to", "for", "in", "on", "at", "about", "by", "from", "with", "and", "or",
+    "me", "us", "i", "we", "you", "my", "our", "please", "can", "could", "would", "show", "give", "tell",
+    "get", "find", "display", "see", "view", "what", "when", "how", "many", "was", "were", "is", "are",
+    "be", "been", "has", "have", "had", "did", "do", "does", "there", "any", "every", "each", "one", "ones",
+    "new", "design", "change*", "propos*", "item*", "record*", "entry", "entries", "made", "registered",
+    "added", "submitted", "project*", "amount",
+    "设计变更", "设计", "变更", "变化", "提案", "方案", "项目", "哪个", "什么", "多少", "的", "了", "吗",
+    "呢", "请", "是", "有", "给我", "显示", "查看", "列出", "登记", "注册", "条", "项", "个", "最", "前",
+    "thay đổi", "thiết kế", "đề xuất", "dự án", "các", "của", "cho", "tôi", "xem", "hiển thị", "là",
+    "gì", "nào", "có", "được", "đăng ký", "về", "trong", "hãy", "liệt kê", "cái", "bao nhiêu", "số",
+    "tiền", "đã", "mục",
+    "змін*", "проєкт*", "пропозиці*", "покаж*", "був*", "було", "є", "за", "в", "у", "на", "про", "мені",
+    "зареєстр*", "що", "скільки", "яких", "сум*",
+)
+# 템플릿 답변에 이미 들어 있는 메타데이터 필드 이름 ("기관명, 사업명, 제안명, 제안일자를 알려줘")
+_FIELD_WORDS = (
+    "기관명", "기관", "사업명", "제안명", "제안일자", "일자", "날짜", "발주처", "요청", "제목",
+    "organization*", "organisation*", "project", "name*", "proposal", "date*", "client*", "title*",
+    "机构", "名称", "日期", "委托方", "标题",
+    "tên", "cơ quan", "ngày", "bên đặt hàng", "tiêu đề",
+    "назв*", "організаці*", "дат*", "замовник*",
+)
+# 단어 뒤에 떨어져 남는 조사와 한 글자 단어 ("행복도시 도로공사에서" 에서 사업명을 지우고 남는 "에서" 등)
+_PARTICLES = (
+    "에서는", "에서", "에는", "으로", "부터", "까지", "은", "는", "이", "가", "을", "를", "의", "에",
+    "로", "와", "과", "도", "만", "별", "중", "등",
+)
+_FILLER_TOKENS = frozenset(_PARTICLES) | {"건", "것", "거", "좀", "줘", "순", "사업", "s"}
+
+_HANGUL = re.compile(r"[가-힣]")
+_HAN = re.compile(r"[一-鿿]")
+_TOKEN = re.compile(r"[^\W\d_]+")
+
+
+def _word_pattern(word: str) -> str:
+    if _HAN.search(word):
+        # 중국어는 띄어쓰기가 없으므로 부분 문자열로 찾는다.
+        return re.escape(word)
+    if _HANGUL.search(word):
+        # 어절 앞에서 시작해야 하고, 뒤에 붙은 조사/어미("최근에", "변경되었나요")까지 한 단어로 본다.
+        return rf"(?<![가-힣]){re.escape(word)}[가-힣]*"
+    if word.endswith("*"):
+        return rf"(?<![^\W\d_]){re.escape(word[:-1])}[^\W\d_]*"
+    # "elastic" 안의 "last" 처럼 다른 단어 일부에 걸리지 않도록 앞뒤 모두 단어 경계
+    return rf"(?<![^\W\d_]){re.escape(word)}(?![^\W\d_])"
+
+
+def _compile_words(*groups: tuple[str, ...]) -> re.Pattern[str]:
+    words = sorted({w for group in groups for w in group}, key=len, reverse=True)
+    return re.compile("|".join(_word_pattern(w) for w in words))
+
+
+_LATEST_RE = _compile_words(_LATEST_WORDS)
+_LIST_RE = _compile_words(_LIST_WORDS)
+_SAVINGS_RE = _compile_words(_SAVINGS_WORDS)
+_RANK_RE = _compile_words(_RANK_WORDS)
+_NON_TOPIC_RE = _compile_words(
+    _LATEST_WORDS, _LIST_WORDS, _SAVINGS_RATE_WORDS, _SAVINGS_WORDS, _RANK_WORDS, _FRAME_WORDS, _FIELD_WORDS
+)
+
+_COUNT_PATTERNS = (
+    re.compile(r"(\d{1,3})\s*(?:건|개|가지)"),
+    re.compile(r"(?<![^\W\d_])(?:상위|최근|최신|top|latest|last|recent)\s*(\d{1,3})\b", re.IGNORECASE),
+    re.compile(
+        r"(\d{1,3})\s*(?:(?:most recent|latest|recent|newest|last)\s+)?"
+        r"(?:items?|changes?|proposals?|个|项|条|thay đổi|змін)",
+        re.IGNORECASE,
+    ),
+)
+_FULL_DATE = re.compile(r"(20\d{2}|19\d{2})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})\s*일?")
+# 월 숫자 뒤에는 "월" 이 있어야 한다. ("2024년 10건" 을 10월로 읽지 않도록)
+_YEAR_MONTH = re.compile(r"(20\d{2}|19\d{2})\s*(?:[-./]\s*(\d{1,2})(?!\d)|년\s*(\d{1,2})\s*월)")
+# "2024년" 또는 숫자만 있는 연도 ("registered in 2024")
+_YEAR = re.compile(r"(?<!\d)(20\d{2}|19\d{2})(?!\d)\s*년?")
+
+
+@dataclass(frozen=True)
+class Intent:
+    kind: str  # latest / by_project / by_date / top_metric
+    limit: int = 1
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    project_name: Optional[str] = None
+    metric: Optional[str] = None  # top_metric 일 때 numeric_store 컬럼명
+
+
+def _contains_any(text: str, words: tuple[str, ...]) -> bool:
+    return any(w in text for w in words)
+
+
+def _extract_count(text: str) -> Optional[int]:
+    for pattern in _COUNT_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            return max(1, min(int(m.group(1)), settings.intent_router_max_items))
+    return None
+
+
+def _extract_date_range(text: str) -> Optional[tuple[date, date]]:
+    try:
+        m = _FULL_DATE.search(text)
+        if m:
+            d = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            return d, d
+        m = _YEAR_MONTH.search(text)
+        if m:
+            year, month = int(m.group(1)), int(m.group(2) or m.group(3))
+            last_day = calendar.monthrange(year, month)[1]
+            return date(year, month, 1), date(year, month, last_day)
+        m = _YEAR.search(text)
+        if m:
+            year = int(m.group(1))
+            return date(year, 1, 1), date(year, 12, 31)
+    except ValueError:
+        return None
+    return None
+
+
+def _topic_tokens(text: str) -> tuple[str, ...]:
+    """날짜/건수/의도/질문 틀 단어를 지우고 남은 단어. 비어 있지 않으면 주제가 있는 질문이다."""
+    for pattern in (_FULL_DATE, _YEAR_MONTH, _YEAR, *_COUNT_PATTERNS, _NON_TOPIC_RE):
+        text = pattern.sub(" ", text)
+    return tuple(t for t in _TOKEN.findall(text) if t not in _FILLER_TOKENS)
+
+
+def _covered_by_name(token: str, compact_name: str) -> bool:
+    """사업명 일부인 단어인지. ("도로공사에서" 처럼 조사가 붙은 경우 포함)"""
+    if token in compact_name:
+        return True
+    return any(
+        token.endswith(p) and len(token) > len(p) and token[: -len(p)] in compact_name
+        for p in _PARTICLES
+    )
+
+
+@lru_cache(maxsize=4096)
+def _classify_rules(question: str) -> Optional[tuple[Intent, tuple[str, ...]]]:
+    """사업명 매칭을 제외한 규칙 분류 (질문 문자열만으로 결정되므로 캐시).
+
+    (의도, 주제로 보이는 남은 단어) 를 돌려준다. 남은 단어는 사업명을 확인한 뒤 classify_intent 가 판단한다.
+    """
+    text = question.lower()
+    # 설명/효과 질문은 순위 단어가 있어도("가장 절감 효과가 좋은 공법 설명해줘") 본문이 필요하다.
+    if _contains_any(text, _CONTENT_WORDS):
+        return None
+
+    count = _extract_count(text)
+    topics = _topic_tokens(text)
+
+    if _SAVINGS_RE.search(text) and _RANK_RE.search(text):
+        metric = "savings_rate" if _contains_any(text, _SAVINGS_RATE_WORDS) else "savings_amount"
+        return Intent(kind="top_metric", limit=count or 5, metric=metric), topics
+
+    date_range = _extract_date_range(text)
+    if date_range is not None:
+        intent = Intent(
+            kind="by_date",
+            limit=count or settings.intent_router_max_items,
+            date_from=date_range[0],
+            date_to=date_range[1],
+        )
+        return intent, topics
+    if _LATEST_RE.search(text):
+        return Intent(kind="latest", limit=count or 1), topics
+    if _LIST_RE.search(text):
+        return Intent(kind="by_project", limit=count or settings.intent_router_max_items), topics
+    return None
+
+
+def classify_intent(question: str, index: ChangeIndex) -> Optional[Intent]:
+    normalized = " ".join(question.split())
+    rules = _classify_rules(normalized)
+    if rules is None:
+        return None
+    intent, topics = rules
+
+    project = index.match_project(normalized)
+    if topics:
+        # 사업명을 이루는 단어를 빼고도 남는 단어가 있으면 주제 검색이 필요하므로 RAG 로 보낸다.
+        compact = "".join(project.split()).lower() if project else ""
+        if not compact or not all(_covered_by_name(t, compact) for t in topics):
+            return None
+
+    if intent.kind == "by_project":
+        # 사업명 없는 목록 질문("모든 설계변경 목록")은 최근 등록순 목록으로 답한다.
+        if project is None:
+            return Intent(kind="latest", limit=intent.limit)
+        return Intent(kind="by_project", limit=intent.limit, project_name=project)
+    if intent.kind == "latest" and project is not None:
+        return Intent(kind="by_project", limit=intent.limit, project_name=project)
+    if intent.kind == "top_metric" and project is not None:
+        return Intent(
+            kind="top_metric", limit=intent.limit, metric=intent.metric, project_name=project
+        )
+    if intent.kind == "by_date" and project is not None:
+        return Intent(
+            kind="by_date",
+            limit=intent.limit,
+            date_from=intent.date_from,
+            date_to=intent.date_to,
+            project_name=project,
+        )
+    return intent
+
+
+_LABELS: Dict[LanguageCode, Dict[str, str]] = {
+    LanguageCode.ko: {
+        "organization": "기관명", "project_name": "사업명", "title": "제안명",
+        "change_date": "제안일자", "client": "요청 발주처",
+        "latest": "가장 최근에 등록된 설계변경 {n}건입니다.",
+        "by_project": "'{project}' 사업의 설계변경 {n}건입니다. (제안일자 최신순)",
+        "by_date": "{start} ~ {end} 제안일자의 설계변경 {n}건입니다.",
+        "top_metric": "{metric} 기준 상위 {n}건입니다.",
+        "savings_amount": "절감액(백만원)", "savings_rate": "절감율(%)",
+        "empty": "조건에 맞는 설계변경이 없습니다.",
+    },
+    LanguageCode.en: {
+        "organization": "Organization", "project_name": "Project name", "title": "Proposal name",
+        "change_date": "Proposal date", "client": "Client",
+        "latest": "Here are the {n} most recently registered design change(s).",
+        "by_project": "Here are {n} design change(s) for the project '{project}' (newest proposal date first).",
+        "by_date": "Here are {n} design change(s) with a proposal date between {start} and {end}.",
+        "top_metric": "Here are the top {n} proposal(s) by {metric}.",
+        "savings_amount": "Savings (KRW million)", "savings_rate": "Savings rate (%)",
+        "empty": "No design change matches the condition.",
+    },
+    LanguageCode.zh: {
+        "organization": "机构名称", "project_name": "项目名称", "title": "提案名称",
+        "change_date": "提案日期", "client": "委托方",
+        "latest": "以下是最近登记的 {n} 条设计变更。",
+        "by_project": "以下是项目“{project}”的 {n} 条设计变更（按提案日期从新到旧）。",
+        "by_date": "以下是提案日期在 {start} 至 {end} 之间的 {n} 条设计变更。",
+        "top_metric": "以下是按{metric}排名前 {n} 的提案。",
+        "savings_amount": "节约金额（百万韩元）", "savings_rate": "节约率（%）",
+        "empty": "没有符合条件的设计变更。",
+    },
+    LanguageCode.vi: {
+        "organization": "Tên cơ quan", "project_name": "Tên dự án", "title": "Tên đề xuất",
+        "change_date": "Ngày đề xuất", "client": "Bên đặt hàng",
+        "latest": "Dưới đây là {n} thay đổi thiết kế được đăng ký gần đây nhất.",
+        "by_project": "Dưới đây là {n} thay đổi thiết kế của dự án '{project}' (ngày đề xuất mới nhất trước).",
+        "by_date": "Dưới đây là {n} thay đổi thiết kế có ngày đề xuất từ {start} đến {end}.",
+        "top_metric": "Dưới đây là {n} đề xuất đứng đầu theo {metric}.",
+        "savings_amount": "Số tiền tiết kiệm (triệu KRW)", "savings_rate": "Tỷ lệ tiết kiệm (%)",
+        "empty": "Không có thay đổi thiết kế nào phù hợp với điều kiện.",
+    },
+    LanguageCode.uk: {
+        "organization": "Організація", "project_name": "Назва проєкту", "title": "Назва пропозиції",
+        "change_date": "Дата пропозиції", "client": "Замовник",
+        "latest": "Ось {n} останніх зареєстрованих змін проєкту.",
+        "by_project": "Ось {n} змін(и) проєкту «{project}» (спочатку найновіші).",
+        "by_date": "Ось {n} змін(и) проєкту з датою пропозиції з {start} по {end}.",
+        "top_metric": "Ось {n} найкращих пропозицій за показником «{metric}».",
+        "savings_amount": "Економія (млн вон)", "savings_rate": "Відсоток економії (%)",
+        "empty": "Немає змін проєкту, що відповідають умові.",
+    },
+}
+
+_FIELD_ORDER = ("organization", "project_name", "title", "change_date", "client")
+
+
+def _base_fields(record: DesignChangeRecord) -> Dict[str, str]:
+    return {
+        "organization": record.organization or "-",
+        "project_name": record.project_name or "-",
+        "title": record.title,
+        "change_date": record.change_date.isoformat(),
+        "client": record.client or "-",
+    }
+
+
+def answer_intent(
+    intent: Intent,
+    language: LanguageCode,
+    index: ChangeIndex,
+    store: NumericStore,
+    cached_translation: Callable[[str, LanguageCode], Optional[Dict[str, str]]],
+) -> WorkerChatResponse:
+    """변경 인덱스/수치 저장소에서 레코드를 찾아 템플릿으로 답변.
+
+    번역은 캐시에 있는 경우에만 사용한다. (LLM 미호출)
+    """
+    metric_values: Dict[str, float] = {}
+    if intent.kind == "latest":
+        records = index.latest(intent.limit)
+    elif intent.kind == "by_project":
+        records = index.by_project(intent.project_name or "", intent.limit)
+    elif intent.kind == "top_metric":
+        result = store.query(
+            metric=intent.metric or "savings_amount",
+            descending=True,
+            limit=intent.limit,
+            filters={"project_name": intent.project_name},
+        )
+        metric_values = {row["id"]: row[result["metric"]] for row in result["rows"]}
+        records = index.by_ids(list(metric_values))
+    else:
+        records = index.by_date(
+            intent.date_from or date.min,
+            intent.date_to or date.max,
+            intent.limit,
+            project_name=intent.project_name,
+        )
+
+    labels = _LABELS[language]
+    if not records:
+        answer = labels["empty"]
+    else:
+        lines: List[str] = [
+            labels[intent.kind].format(
+                n=len(records),
+                project=intent.project_name or "",
+                start=intent.date_from.isoformat() if intent.date_from else "",
+                end=intent.date_to.isoformat() if intent.date_to else "",
+                metric=labels.get(intent.metric or "", ""),
+            )
+        ]
+        for i, record in enumerate(records, start=1):
+            fields = _base_fields(record)
+            if language != LanguageCode.ko:
+                fields = cached_translation(record.id, language) or fields
+            lines.append("")
+            lines.append(f"[{i}] ID: {record.id}")
+            for key in _FIELD_ORDER:
+                lines.append(f"- {labels[key]}: {fields[key]}")
+            if record.id in metric_values:
+                lines.append(f"- {labels[intent.metric or '']}: {metric_values[record.id]:,.2f}")
+        answer = "\n".join(lines)
+
+    return WorkerChatResponse(
+        answer=answer,
+        language=language,
+        sources=[
+            WorkerChatAnswerSource(id=r.id, title=r.title, change_date=r.change_date)
+            for r in records
+        ],
+        route="structured",
+    )
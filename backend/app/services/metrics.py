@@ -0,0 +1,302 @@
+"""
+단계별 지연 시간 / 요청 수를 모아 Prometheus 텍스트 형식(`GET /metrics`)으로 내보내는 가벼운 메트릭 모듈.
+
+- 외부 의존성 없이 카운터 / 게이지 / 히스토그램만 구현한다.
+  - 관측 1건은 락 한 번 + 버킷 이진 탐색이라 운영 중에 켜 두어도 부담이 없다.
+  - 히스토그램 버킷은 누적하지 않고 저장했다가 내보낼 때만 누적한다.
+- `timed("embed")` 처럼 단계 이름으로 감싸면 `app_stage_duration_seconds{stage=...}` 에 기록되고,
+  예외가 나면 `app_stage_errors_total{stage=...}` 도 올라간다.
+- 캐시/인덱스/upstream 상태처럼 이미 다른 곳에서 세고 있는 값은 수집기(collector)로 등록해
+  scrape 시점에만 읽는다. (요청 경로에 추가 비용 없음)
+- `MetricsMiddleware` (ASGI) 가 엔드포인트(라우트 템플릿)별 요청 수 / 지연과 전체 처리 중 요청 수를 기록한다.
+- `settings.metrics_enabled` 가 False 이면 기록하지 않는다.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from ..core.config import settings
+
+
+# 임베딩/검색(ms 단위)부터 LLM/long-poll(수십 초)까지 한 히스토그램으로 보기 위한 버킷 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# (라벨 딕셔너리, 값)
+Sample = Tuple[Dict[str, str], float]
+# (이름, 타입, 설명, 샘플 목록). 수집기가 돌려주는 형식
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        if not settings.metrics_enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(k))} {_format_value(v)}" for k, v in values]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labelnames:
+            values = [((), 0.0)]
+        return [f"{self.name}{_format_labels(self._labels(k))} {_format_value(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 -> [버킷별 개수(누적 아님, 마지막은 +Inf), 합계, 개수]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not settings.metrics_enabled:
+            return
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[labels] = series
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self._series.items())
+        lines: List[str] = []
+        for key, (counts, total, count) in snapshot:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> Any:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], List[Family]]) -> None:
+        """scrape 때마다 호출되어 (이름, 타입, 설명, 샘플) 목록을 돌려주는 함수를 등록."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                # 상태 수집 하나가 실패해도 나머지 메트릭은 내보낸다.
+                lines.append(f"# collector error: {type(e).__name__}: {_escape(str(e))}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+STAGE_SECONDS = METRICS.histogram(
+    "app_stage_duration_seconds",
+    "Time spent in each processing stage (embed, search, rerank, format, llm, translate, persist, log_append).",
+    ("stage",),
+)
+STAGE_ERRORS = METRICS.counter(
+    "app_stage_errors_total", "Stage executions that raised an exception.", ("stage",)
+)
+CACHE_LOOKUPS = METRICS.counter(
+    "app_cache_lookups_total", "Cache lookups counted at the call site.", ("cache", "result")
+)
+REQUEST_SECONDS = METRICS.histogram(
+    "app_http_request_duration_seconds",
+    "HTTP request latency by route template and status (streams are measured until the response ends).",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = METRICS.gauge(
+    "app_http_requests_in_flight", "HTTP requests currently being processed (open streams included)."
+)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """with 블록의 소요 시간을 단계별 히스토그램에 기록한다."""
+    if not settings.metrics_enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+
+def cache_hit_ratio(cache: str) -> float:
+    hits = CACHE_LOOKUPS.value(cache, "hit")
+    lookups = hits + CACHE_LOOKUPS.value(cache, "miss")
+    return hits / lookups if lookups else 0.0
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    # 라우팅이 끝나면 FastAPI 가 scope["route"] 에 매칭된 라우트를 넣어 둔다.
+    # 경로 그대로(/admin/imports/<id>)를 라벨로 쓰면 시계열이 끝없이 늘어나므로 템플릿만 쓴다.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """엔드포인트별 요청 수 / 지연과 처리 중 요청 수를 기록하는 ASGI 미들웨어.
+
+    BaseHTTPMiddleware 와 달리 응답 본문을 감싸지 않으므로 SSE 스트림에도 그대로 쓸 수 있다.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started, scope["method"], _route_template(scope), str(status["code"])
+            )
@@ -0,0 +1,108 @@
+"""
+동시에 들어온 요청들을 짧은 시간 창(window) 동안 모아서 한 번에 처리하는 마이크로 배처.
+
+- 빈 배치에 처음 들어온 호출이 leader 가 되어 window 만큼(또는 max_batch 가 찰 때까지) 기다린 뒤
+  batch_fn 을 한 번 호출하고, 결과를 각 호출자에게 나눠 준다.
+- 별도 백그라운드 스레드 없이 요청 스레드 안에서 동작한다. (FastAPI sync 엔드포인트 스레드풀 기준)
+- batch_fn 이 실패하면 그 배치에 있던 모든 호출자에게 같은 예외를 전달한다.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Slot(Generic[T, R]):
+    def __init__(self, item: T) -> None:
+        self.item = item
+        self.done = threading.Event()
+        self.result: Optional[R] = None
+        self.error: Optional[BaseException] = None
+
+
+class _Batch(Generic[T, R]):
+    def __init__(self) -> None:
+        self.slots: List[_Slot[T, R]] = []
+        self.full = threading.Event()
+
+
+class MicroBatcher(Generic[T, R]):
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[T]], List[R]],
+        window_seconds: float,
+        max_batch: int,
+    ) -> None:
+        self.name = name
+        self._batch_fn = batch_fn
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+
+        self._lock = threading.Lock()
+        self._current: Optional[_Batch[T, R]] = None
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+
+    def submit(self, item: T) -> R:
+        if self.window_seconds <= 0 or self.max_batch <= 1:
+            return self._batch_fn([item])[0]
+
+        slot: _Slot[T, R] = _Slot(item)
+        with self._lock:
+            batch = self._current
+            leader = batch is None
+            if batch is None:
+                batch = _Batch()
+                self._current = batch
+            batch.slots.append(slot)
+            if len(batch.slots) >= self.max_batch:
+                # 가득 찼으면 새 요청은 다음 배치로 보내고 leader 를 바로 깨운다.
+                self._current = None
+                batch.full.set()
+
+        if not leader:
+            slot.done.wait()
+            if slot.error is not None:
+                raise slot.error
+            return slot.result  # type: ignore[return-value]
+
+        batch.full.wait(self.window_seconds)
+        with self._lock:
+            if self._current is batch:
+                self._current = None
+            slots = list(batch.slots)
+            self._batches += 1
+            self._items += len(slots)
+            self._max_seen = max(self._max_seen, len(slots))
+
+        try:
+            results = self._batch_fn([s.item for s in slots])
+            for s, result in zip(slots, results):
+                s.result = result
+        except BaseException as e:
+            for s in slots:
+                s.error = e
+        finally:
+            for s in slots:
+                s.done.set()
+
+        if slot.error is not None:
+            raise slot.error
+        return slot.result  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 3) if self._batches else 0.0,
+                "max_batch_size": self._max_seen,
+                "window_ms": self.window_seconds * 1000,
+            }
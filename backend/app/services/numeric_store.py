@@ -0,0 +1,343 @@
+"""
+VE 수치 컬럼(LCC 개선전/후, 절감액, 절감율, 성능/가치 점수)을 담는 NumPy 기반 컬럼형 저장소.
+
+- 인제스트 시 CSV/XLSX 행의 숫자 컬럼을 그대로 파싱해서 넣고,
+  관리자 페이지처럼 원본 행이 없는 경우에는 `_build_description` 형식의 description 텍스트에서 읽는다.
+- FAISS 인덱스 옆(`numeric_store.npz`)에 저장하고, 서버 시작 시 change_log 와 비교해서 빠진 레코드만 채운다.
+- 필터/정렬/그룹 집계는 모두 배열 연산으로 처리해서 전체 코퍼스 기준으로도 수 ms 안에 끝난다.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+import math
+from pathlib import Path
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from ..core.models import DesignChangeRecord
+
+
+# 필드명 -> VE 엑셀/CSV 헤더
+NUMERIC_COLUMNS: Dict[str, str] = {
+    "lcc_before_construction": "개선전_건설사업비(백만원)",
+    "lcc_before_maintenance": "개선전_유지관리비(백만원)",
+    "lcc_before_total": "개선전_계(백만원)",
+    "lcc_after_construction": "개선후_건설사업비(백만원)",
+    "lcc_after_maintenance": "개선후_유지관리비(백만원)",
+    "lcc_after_total": "개선후_계(백만원)",
+    "savings_amount": "절감액(백만원)",
+    "savings_rate": "절감율(%)",
+    "performance_before": "개선전_성능점수(점)",
+    "value_before": "개선전_가치점수(점)",
+    "performance_after": "개선후_성능점수(점)",
+    "value_after": "개선후_가치점수(점)",
+}
+
+# 필드명 -> VE 헤더 (문자열 컬럼)
+TEXT_COLUMNS: Dict[str, str] = {
+    "category": "공종분류",
+    "adopted": "채택여부",
+}
+
+GROUP_COLUMNS = ("organization", "project_name", "category", "adopted", "year")
+AGGREGATES = ("sum", "mean", "max", "min", "count")
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def parse_number(value: Any) -> float:
+    """'1,234.5', '12.3%', '--' 같은 셀 값을 float 로. 숫자가 없으면 NaN."""
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _NUMBER.search(str(value).replace(",", ""))
+    return float(m.group(0)) if m else math.nan
+
+
+def numeric_values_from_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """VE CSV/XLSX 한 행에서 수치/분류 컬럼만 뽑는다."""
+    values: Dict[str, Any] = {
+        name: parse_number(row.get(header)) for name, header in NUMERIC_COLUMNS.items()
+    }
+    for name, header in TEXT_COLUMNS.items():
+        values[name] = str(row.get(header) or "").strip()
+    return values
+
+
+# `_build_description` 의 섹션 제목 -> 섹션 안의 "- 라벨(단위): 값" 을 필드명으로
+_DESCRIPTION_SECTIONS: Dict[str, Dict[str, str]] = {
+    "[생애주기비용(LCC) 절감효과 - 개선전]": {
+        "건설사업 비용(백만원)": "lcc_before_construction",
+        "유지관리 비용(백만원)": "lcc_before_maintenance",
+        "계(백만원)": "lcc_before_total",
+    },
+    "[생애주기비용(LCC) 절감효과 - 개선후]": {
+        "건설사업 비용(백만원)": "lcc_after_construction",
+        "유지관리 비용(백만원)": "lcc_after_maintenance",
+        "계(백만원)": "lcc_after_total",
+    },
+    "[가치향상효과 - 개선전]": {
+        "성능점수(점)": "performance_before",
+        "가치점수(점)": "value_before",
+    },
+    "[가치향상효과 - 개선후]": {
+        "성능점수(점)": "performance_after",
+        "가치점수(점)": "value_after",
+    },
+}
+_DESCRIPTION_TOP_LEVEL = {
+    "절감액(백만원)": "savings_amount",
+    "절감율(%)": "savings_rate",
+    "공종분류": "category",
+    "채택여부": "adopted",
+}
+
+
+def numeric_values_from_description(description: str) -> Dict[str, Any]:
+    """`_build_description`(또는 관리자 페이지)이 만든 설명 텍스트에서 같은 값을 읽는다."""
+    values: Dict[str, Any] = {name: math.nan for name in NUMERIC_COLUMNS}
+    values.update({name: "" for name in TEXT_COLUMNS})
+
+    section: Optional[Dict[str, str]] = None
+    for raw in description.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("["):
+            section = _DESCRIPTION_SECTIONS.get(line)
+            continue
+        label, sep, value = line.lstrip("- ").partition(":")
+        if not sep:
+            continue
+        label = label.strip()
+        name = (section or {}).get(label) or _DESCRIPTION_TOP_LEVEL.get(label)
+        if name is None:
+            continue
+        if name in TEXT_COLUMNS:
+            values[name] = value.strip()
+        else:
+            values[name] = parse_number(value)
+    return values
+
+
+class NumericStore:
+    """레코드 단위로 행을 쌓는 컬럼형 저장소 (스레드 안전).
+
+    추가는 파이썬 리스트 버퍼에 모아 두었다가, 조회/저장 시점에 NumPy 배열로 합친다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._columns: Dict[str, np.ndarray] = self._empty_columns()
+        self._pending: List[Dict[str, Any]] = []
+        self._ids: set[str] = set()
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, np.ndarray]:
+        columns: Dict[str, np.ndarray] = {
+            "id": np.array([], dtype=str),
+            "title": np.array([], dtype=str),
+            "organization": np.array([], dtype=str),
+            "project_name": np.array([], dtype=str),
+            "change_date": np.array([], dtype="datetime64[D]"),
+        }
+        for name in TEXT_COLUMNS:
+            columns[name] = np.array([], dtype=str)
+        for name in NUMERIC_COLUMNS:
+            columns[name] = np.array([], dtype=np.float64)
+        return columns
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._columns["id"]) + len(self._pending)
+
+    def add(self, record: DesignChangeRecord, values: Optional[Mapping[str, Any]] = None) -> None:
+        """레코드 한 건 추가. values 가 없으면 description 에서 읽는다."""
+        values = values if values is not None else numeric_values_from_description(record.description)
+        row: Dict[str, Any] = {
+            "id": record.id,
+            "title": record.title,
+            "organization": record.organization or "",
+            "project_name": record.project_name or "",
+            "change_date": np.datetime64(record.change_date.isoformat(), "D"),
+        }
+        for name in TEXT_COLUMNS:
+            row[name] = str(values.get(name) or "")
+        for name in NUMERIC_COLUMNS:
+            row[name] = float(values.get(name, math.nan))
+
+        with self._lock:
+            if record.id in self._ids:
+                return
+            self._ids.add(record.id)
+            self._pending.append(row)
+
+    def _compact(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if self._pending:
+                merged: Dict[str, np.ndarray] = {}
+                for name, column in self._columns.items():
+                    dtype = str if column.dtype.kind == "U" else column.dtype
+                    extra = np.array([row[name] for row in self._pending], dtype=dtype)
+                    merged[name] = np.concatenate([column, extra])
+                self._columns = merged
+                self._pending = []
+            return self._columns
+
+    def load(
+        self,
+        path: Path,
+        records_loader: Callable[[], Iterable[DesignChangeRecord]],
+    ) -> None:
+        """저장된 npz 를 읽고, change_log 에는 있는데 저장소에 없는 레코드는 description 에서 채운다."""
+        with self._lock:
+            if self._loaded:
+                return
+            if path.exists():
+                with np.load(path, allow_pickle=False) as data:
+                    columns = self._empty_columns()
+                    for name in columns:
+                        if name in data.files:
+                            columns[name] = data[name]
+                    self._columns = columns
+                    self._ids = set(columns["id"].tolist())
+            for record in records_loader():
+                if record.id not in self._ids:
+                    self.add(record)
+            self._loaded = True
+
+    def retain(self, ids: set[str]) -> int:
+        """ids 에 없는 레코드를 지우고 지운 건수를 돌려준다. (중단된 인제스트를 되돌릴 때 사용)"""
+        columns = self._compact()
+        with self._lock:
+            keep = np.isin(columns["id"], list(ids))
+            removed = int((~keep).sum())
+            if removed:
+                self._columns = {name: column[keep] for name, column in columns.items()}
+                self._ids = set(self._columns["id"].tolist())
+            return removed
+
+    def save(self, path: Path) -> None:
+        columns = self._compact()
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, **columns)
+        tmp.replace(path)
+
+    def _mask(
+        self,
+        columns: Dict[str, np.ndarray],
+        filters: Mapping[str, Any],
+    ) -> np.ndarray:
+        mask = np.ones(len(columns["id"]), dtype=bool)
+        for name in ("organization", "project_name", "category", "adopted"):
+            value = filters.get(name)
+            if value:
+                mask &= np.char.find(columns[name].astype(str), str(value)) >= 0
+        if filters.get("date_from"):
+            mask &= columns["change_date"] >= np.datetime64(filters["date_from"], "D")
+        if filters.get("date_to"):
+            mask &= columns["change_date"] <= np.datetime64(filters["date_to"], "D")
+        return mask
+
+    def query(
+        self,
+        metric: str = "savings_amount",
+        descending: bool = True,
+        limit: int = 10,
+        group_by: Optional[str] = None,
+        agg: str = "sum",
+        filters: Optional[Mapping[str, Any]] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """필터 -> (그룹 집계) -> 정렬 -> 상위 limit.
+
+        반환: {"matched": 필터 후 metric 값이 있는 행 수, "total", "mean", "rows" 또는 "groups"}
+        """
+        if metric not in NUMERIC_COLUMNS:
+            raise ValueError(f"지원하지 않는 metric 입니다: {metric}")
+        if group_by is not None and group_by not in GROUP_COLUMNS:
+            raise ValueError(f"지원하지 않는 group_by 입니다: {group_by}")
+        if agg not in AGGREGATES:
+            raise ValueError(f"지원하지 않는 agg 입니다: {agg}")
+
+        columns = self._compact()
+        values = columns[metric]
+        mask = self._mask(columns, filters or {}) & ~np.isnan(values)
+        if min_value is not None:
+            mask &= values >= min_value
+        if max_value is not None:
+            mask &= values <= max_value
+
+        idx = np.flatnonzero(mask)
+        selected = values[idx]
+        result: Dict[str, Any] = {
+            "metric": metric,
+            "matched": int(len(idx)),
+            "total": float(selected.sum()) if len(idx) else 0.0,
+            "mean": float(selected.mean()) if len(idx) else None,
+        }
+
+        if group_by is None:
+            order = np.argsort(selected, kind="stable")
+            if descending:
+                order = order[::-1]
+            top = idx[order[:limit]]
+            result["rows"] = [self._row(columns, int(i)) for i in top]
+            return result
+
+        if group_by == "year":
+            keys = columns["change_date"][idx].astype("datetime64[Y]").astype(int) + 1970
+            keys = keys.astype(str)
+        else:
+            keys = columns[group_by][idx].astype(str)
+
+        names, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(names)).astype(np.float64)
+        if agg == "count":
+            agg_values = counts
+        elif agg in ("sum", "mean"):
+            sums = np.bincount(inverse, weights=selected, minlength=len(names))
+            agg_values = sums if agg == "sum" else sums / counts
+        else:
+            agg_values = np.full(len(names), -np.inf if agg == "max" else np.inf)
+            ufunc = np.maximum if agg == "max" else np.minimum
+            ufunc.at(agg_values, inverse, selected)
+
+        order = np.argsort(agg_values, kind="stable")
+        if descending:
+            order = order[::-1]
+        result["groups"] = [
+            {"key": str(names[i]), "value": float(agg_values[i]), "count": int(counts[i])}
+            for i in order[:limit]
+        ]
+        return result
+
+    @staticmethod
+    def _row(columns: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "id": str(columns["id"][i]),
+            "title": str(columns["title"][i]),
+            "organization": str(columns["organization"][i]) or None,
+            "project_name": str(columns["project_name"][i]) or None,
+            "change_date": date.fromisoformat(str(columns["change_date"][i])),
+        }
+        for name in TEXT_COLUMNS:
+            row[name] = str(columns[name][i]) or None
+        for name in NUMERIC_COLUMNS:
+            v = float(columns[name][i])
+            row[name] = None if math.isnan(v) else v
+        return row
+
+
+NUMERIC_STORE = NumericStore()
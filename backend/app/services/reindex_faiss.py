@@ -0,0 +1,110 @@
+"""
+기존 faiss_index 를 다른 임베딩 차원으로 다시 만드는 오프라인 도구.
+
+- text-embedding-3 계열은 Matryoshka 방식이라, 저장된 벡터의 앞 N 차원만 남기고 다시 정규화하면
+  API 에 dimensions=N 을 줘서 받은 임베딩과 같은 결과가 된다.
+  → 차원을 줄일 때는 OpenAI 호출 없이 저장된 벡터만으로 다시 만든다.
+- 차원을 늘리거나 `--reembed` 를 주면 docstore 의 패시지 텍스트를 다시 임베딩한다. (비용 발생)
+- 새 인덱스는 임시 디렉터리에 저장한 뒤 교체하고, 기존 파일은 `faiss_index/backup_<차원>d/` 에 남긴다.
+- 끝나면 `.env` 의 EMBEDDING_DIMENSIONS 를 같은 값으로 맞춰야 서버/인제스트가 새 인덱스를 쓴다.
+
+사용 예:
+
+    cd backend
+    python -m app.services.reindex_faiss --dimensions 512
+    python -m app.services.reindex_faiss --dimensions 1536 --reembed
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import time
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+
+from ..core.config import settings
+from .vectorstore import _get_embeddings, _vectorstore_path, embed_texts, truncate_embeddings
+
+
+def _reembed(vs: FAISS, dims: int, batch_size: int) -> np.ndarray:
+    texts = [vs.docstore.search(vs.index_to_docstore_id[i]).page_content for i in range(vs.index.ntotal)]
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(embed_texts(texts[start : start + batch_size]))
+        print(f"[REINDEX] 임베딩 {min(start + batch_size, len(texts)):,}/{len(texts):,}")
+    result = np.asarray(vectors, dtype=np.float32)
+    if result.shape[1] != dims:
+        raise RuntimeError(f"임베딩 결과 차원({result.shape[1]})이 요청한 차원({dims})과 다릅니다.")
+    return result
+
+
+def reindex(dims: int, reembed: bool = False, batch_size: int = 256) -> None:
+    index_dir = settings.faiss_index_dir_path
+    index_file, store_file = _vectorstore_path()
+    if not (index_file.exists() and store_file.exists()):
+        print(f"[ERROR] 다시 만들 faiss_index 가 없습니다: {index_dir}")
+        return
+
+    # 차원 검사는 여기서 직접 하므로 로드 시점 검사는 건너뛰도록 원래 인덱스를 그대로 읽는다.
+    vs = FAISS.load_local(str(index_dir), _get_embeddings(), allow_dangerous_deserialization=True)
+    current = vs.index.d
+    total = vs.index.ntotal
+    print(f"[REINDEX] 현재 {current}차원, 벡터 {total:,}개 → {dims}차원")
+
+    started = time.perf_counter()
+    if total == 0:
+        vectors = np.zeros((0, dims), dtype=np.float32)
+    elif dims <= current and not reembed:
+        vectors = truncate_embeddings(vs.index.reconstruct_n(0, total), dims)
+    else:
+        if dims > current and not reembed:
+            print("[REINDEX] 저장된 벡터보다 큰 차원이라 패시지 텍스트를 다시 임베딩합니다.")
+        # 새 차원으로 임베딩하도록 설정을 바꾸고 클라이언트를 다시 만든다.
+        settings.embedding_dimensions = dims
+        _get_embeddings.cache_clear()
+        vectors = _reembed(vs, dims, batch_size)
+
+    index = faiss.IndexFlatL2(dims)
+    index.add(vectors)
+    vs.index = index
+
+    tmp_dir = index_dir / "reindex_tmp"
+    backup_dir = index_dir / f"backup_{current}d"
+    vs.save_local(str(tmp_dir))
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    for path in (index_file, store_file):
+        shutil.copy2(path, backup_dir / path.name)
+        (tmp_dir / path.name).replace(path)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    memory_before = total * current * 4 / (1024 * 1024)
+    memory_after = total * dims * 4 / (1024 * 1024)
+    print(
+        f"[DONE] {dims}차원 인덱스 저장 ({time.perf_counter() - started:.1f}s, "
+        f"벡터 메모리 {memory_before:,.1f} MB → {memory_after:,.1f} MB, 이전 파일: {backup_dir})"
+    )
+    print(f"[INFO] .env 에 EMBEDDING_DIMENSIONS={dims} 를 설정한 뒤 서버를 다시 시작하세요.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.reindex_faiss",
+        description="faiss_index 를 다른 임베딩 차원으로 다시 만든다",
+    )
+    parser.add_argument("--dimensions", type=int, required=True, help="새 임베딩 차원 (예: 256, 512, 1024, 1536)")
+    parser.add_argument(
+        "--reembed",
+        action="store_true",
+        help="저장된 벡터를 자르지 않고 패시지 텍스트를 다시 임베딩 (차원을 늘릴 때는 자동)",
+    )
+    parser.add_argument("--batch-size", type=int, default=256, help="다시 임베딩할 때 요청 1건의 패시지 수")
+    args = parser.parse_args(argv)
+
+    reindex(args.dimensions, reembed=args.reembed, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
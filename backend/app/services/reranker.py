@@ -0,0 +1,120 @@
+"""
+FAISS 검색 이후의 로컬(CPU) 재정렬 단계.
+
+1. 후보를 넉넉히(`rerank_fetch_k`) 가져온 뒤
+2. 저장된 문서 벡터와의 정확한 코사인 유사도 + 질문/문서 간 글자 bigram 겹침(lexical)으로 다시 점수를 매기고
+3. 점수가 `rerank_min_score` 미만인 문서는 버리고
+4. MMR(Maximal Marginal Relevance)로 거의 같은 문서가 여러 개 들어가지 않게 최대 `retriever_top_k` 개만 고른다.
+
+한국어는 형태소 분석 없이도 비교가 되도록 공백/기호를 제거한 글자 bigram 을 사용한다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from typing import List, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ..core.config import settings
+from .vectorstore import SearchHit
+
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+@dataclass
+class RankedDoc:
+    doc: Document
+    distance: float
+    cosine: float
+    lexical: float
+    score: float
+    vector: np.ndarray  # L2 정규화된 문서 벡터 (MMR 중복 판단용)
+
+
+def _bigrams(text: str) -> set[str]:
+    compact = _NON_WORD.sub("", text.lower())
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i : i + 2] for i in range(len(compact) - 1)}
+
+
+def lexical_overlap(question: str, text: str) -> float:
+    """질문 bigram 중 문서에 등장하는 비율 (0~1)."""
+    q = _bigrams(question)
+    if not q:
+        return 0.0
+    return len(q & _bigrams(text)) / len(q)
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def score_hits(
+    question: str, query_vector: Sequence[float], hits: List[SearchHit]
+) -> List[RankedDoc]:
+    """모든 후보에 (1-w)*cosine + w*lexical 점수를 매겨 FAISS 순서 그대로 반환."""
+    if not hits:
+        return []
+
+    weight = settings.rerank_lexical_weight
+    query = _unit(np.asarray(query_vector, dtype=np.float32))
+    doc_vectors = _unit(np.stack([h.vector for h in hits]).astype(np.float32))
+    cosines = doc_vectors @ query
+
+    scored: List[RankedDoc] = []
+    for i, (hit, cos) in enumerate(zip(hits, cosines)):
+        lexical = lexical_overlap(question, hit.doc.page_content)
+        scored.append(
+            RankedDoc(
+                doc=hit.doc,
+                distance=hit.distance,
+                cosine=float(cos),
+                lexical=lexical,
+                score=(1.0 - weight) * float(cos) + weight * lexical,
+                vector=doc_vectors[i],
+            )
+        )
+    return scored
+
+
+def rerank(
+    scored: List[RankedDoc],
+    top_n: int | None = None,
+    min_score: float | None = None,
+) -> List[RankedDoc]:
+    """점수가 매겨진 후보에 임계값/MMR 을 적용해 프롬프트에 넣을 문서만 남긴다."""
+    top_n = top_n or settings.retriever_top_k
+    min_score = settings.rerank_min_score if min_score is None else min_score
+    candidates = [r for r in scored if r.score >= min_score]
+
+    # MMR: 관련도는 높고, 이미 고른 문서와는 덜 비슷한 문서를 차례로 선택
+    lam = settings.rerank_mmr_lambda
+    selected: List[RankedDoc] = []
+    while candidates and len(selected) < top_n:
+        best_pos = 0
+        best_value = -np.inf
+        for pos, ranked in enumerate(candidates):
+            redundancy = max(
+                (float(ranked.vector @ s.vector) for s in selected),
+                default=0.0,
+            )
+            value = lam * ranked.score - (1.0 - lam) * redundancy
+            if value > best_value:
+                best_pos, best_value = pos, value
+
+        ranked = candidates.pop(best_pos)
+        is_duplicate = any(
+            float(ranked.vector @ s.vector) >= settings.rerank_duplicate_similarity
+            for s in selected
+        )
+        if not is_duplicate:
+            selected.append(ranked)
+
+    return selected
@@ -0,0 +1,76 @@
+"""
+동일한 요청이 동시에 여러 번 들어올 때 upstream(OpenAI) 호출을 한 번으로 합치는 single-flight 유틸.
+
+- 같은 key 로 진행 중인 호출이 있으면 새 호출은 기다렸다가 그 결과(또는 예외)를 그대로 받는다.
+- 호출이 끝나면 key 는 바로 제거되므로 결과를 캐시하지는 않는다. (캐시는 answer_cache 담당)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """key 별로 진행 중인 호출 하나만 실행하고, 동시에 들어온 나머지는 결과를 공유한다."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[Any]] = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "shared": self._shared,
+            }
+
+
+CHAT_FLIGHTS = SingleFlight("worker_chat")
+TRANSLATE_FLIGHTS = SingleFlight("translate_latest_metadata_fields")
@@ -0,0 +1,181 @@
+"""
+multipart/form-data 업로드를 요청 본문 스트림에서 바로 디스크로 옮긴다. (POST /admin/imports)
+
+- UploadFile 을 쓰면 Starlette 가 본문 전체를 임시 파일(SpooledTemporaryFile)에 먼저 받고,
+  핸들러가 그걸 다시 import_dir 로 복사해야 해서 큰 파일이 디스크에 두 번 쓰인다.
+- 여기서는 python-multipart 의 스트리밍 파서로 파일 파트를 받는 대로 import_dir 에 바로 쓰고,
+  크기 한도도 바이트가 들어오는 대로 확인한다. (한도를 넘으면 본문을 끝까지 받지 않고 중단)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Collection, List, Optional, Tuple, TypeVar
+from uuid import uuid4
+
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+
+# 파일 파트 밖의 multipart 오버헤드(경계 문자열, 파트 헤더, 다른 폼 필드) 허용량
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# 이만큼 모이면 디스크에 쓴다. (쓰기는 스레드풀에서)
+_FLUSH_BYTES = 1024 * 1024
+
+_T = TypeVar("_T")
+
+
+class UploadRejected(Exception):
+    """업로드를 받을 수 없는 경우. status_code 는 그대로 HTTP 응답 코드로 쓴다."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class _FilePartSpooler:
+    """파서 콜백: field_name 파트의 본문만 dest_dir 의 새 파일로 보낸다. (다른 파트는 버림)"""
+
+    def __init__(
+        self,
+        field_name: str,
+        dest_dir: Path,
+        suffixes: Collection[str],
+        max_bytes: int,
+    ) -> None:
+        self.field_name = field_name
+        self.dest_dir = dest_dir
+        self.suffixes = suffixes
+        self.max_bytes = max_bytes
+        self.filename: Optional[str] = None
+        self.path: Optional[Path] = None
+        self.written = 0
+        self.complete = False
+        self._out = None
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file_part = False
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_bytes
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self) -> None:
+        self._headers = []
+        self._in_file_part = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers.append((self._header_field.lower(), self._header_value))
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        disposition = next((v for k, v in self._headers if k == b"content-disposition"), b"")
+        _, options = parse_options_header(disposition)
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name != self.field_name or b"filename" not in options or self.path is not None:
+            return
+
+        # 클라이언트가 보낸 경로 부분은 버리고 파일 이름만 쓴다.
+        filename = Path(options[b"filename"].decode("utf-8", "replace").replace("\\", "/")).name
+        self.filename = filename or "upload"
+        suffix = Path(self.filename).suffix.lower()
+        if suffix not in self.suffixes:
+            raise UploadRejected(
+                400,
+                f"Unsupported file type: {suffix or '(none)'} ({', '.join(sorted(s.lstrip('.') for s in self.suffixes))} only)",
+            )
+        self.path = self.dest_dir / f"{uuid4().hex}{suffix}"
+        self._out = self.path.open("wb")
+        self._in_file_part = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file_part:
+            return
+        self.written += end - start
+        if self.written > self.max_bytes:
+            raise UploadRejected(413, f"File is larger than {self.max_bytes // (1024 * 1024)} MB.")
+        self._pending.append(data[start:end])
+        self._pending_bytes += end - start
+
+    def _on_part_end(self) -> None:
+        if self._in_file_part:
+            self._in_file_part = False
+            self.complete = True
+
+    def flush(self) -> None:
+        if self._out is not None and self._pending:
+            self._out.writelines(self._pending)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+
+async def spool_multipart_file(
+    chunks: AsyncIterator[bytes],
+    content_type: Optional[str],
+    dest_dir: Path,
+    *,
+    field_name: str,
+    suffixes: Collection[str],
+    max_bytes: int,
+    run_sync: Callable[[Callable[[], _T]], Awaitable[_T]],
+) -> Tuple[str, Path]:
+    """multipart 본문 스트림에서 field_name 파일 파트를 dest_dir 에 저장하고 (원래 파일 이름, 저장 경로) 를 돌려준다.
+
+    run_sync: 디스크 쓰기를 이벤트 루프 밖에서 실행할 함수 (예: run_in_threadpool).
+    실패하면 UploadRejected 를 올리고, 쓰던 파일은 지운다.
+    """
+    ctype, options = parse_options_header(content_type or "")
+    boundary = options.get(b"boundary")
+    if ctype != b"multipart/form-data" or not boundary:
+        raise UploadRejected(400, "Expected a multipart/form-data upload with a boundary.")
+
+    spooler = _FilePartSpooler(field_name, dest_dir, suffixes, max_bytes)
+    parser = MultipartParser(boundary, spooler.callbacks())
+    try:
+        try:
+            async for chunk in chunks:
+                parser.write(chunk)
+                if spooler.pending_bytes >= _FLUSH_BYTES:
+                    await run_sync(spooler.flush)
+            parser.finalize()
+            await run_sync(spooler.flush)
+        except MultipartParseError as e:
+            raise UploadRejected(400, f"Malformed multipart body: {e}") from e
+        finally:
+            await run_sync(spooler.close)
+        if spooler.path is None:
+            raise UploadRejected(422, f"Missing file field: {field_name}")
+        if not spooler.complete:
+            raise UploadRejected(400, "Upload ended before the file part was complete.")
+    except BaseException:
+        if spooler.path is not None:
+            spooler.path.unlink(missing_ok=True)
+        raise
+    return spooler.filename or "upload", spooler.path
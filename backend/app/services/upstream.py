@@ -0,0 +1,354 @@
+"""
+OpenAI(upstream) 호출 제어.
+
+모델별로 하나씩 만드는 `UpstreamGovernor` 가 아래를 순서대로 적용한다.
+
+1. 서킷 브레이커: 연속 실패가 `upstream_breaker_failure_threshold` 번이면 `upstream_breaker_reset_seconds`
+   동안 호출하지 않고 바로 실패(UpstreamUnavailable)시킨다. 이후 시험 호출 1건이 성공하면 다시 닫힌다.
+2. 토큰 버킷: 분당 요청 수 / 분당 토큰 수 한도를 넘으면 기다리고, 기다릴 시간이 너무 길면 거절한다.
+3. AIMD 동시성 제한: 성공하면 한도를 조금씩(+1/limit) 늘리고, 429/타임아웃/5xx 면 절반으로 줄인다.
+   한도가 찬 상태에서 `upstream_queue_timeout_seconds` 안에 자리가 나지 않으면 거절한다.
+4. 재시도: 429/5xx/타임아웃/연결 오류는 지수 백오프 + full jitter 로 재시도한다.
+   (Retry-After 헤더가 있으면 그 값을 따른다. 전체 소요 시간은 `upstream_deadline_seconds` 를 넘지 않는다.)
+
+거절/재시도 소진은 모두 `UpstreamUnavailable` 로 올라가며, API 에서는 503 + Retry-After 로 응답한다.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+import openai
+
+from ..core.config import settings
+
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailable(Exception):
+    """upstream 이 과부하/장애 상태라 호출하지 않았거나 재시도를 모두 소진한 경우."""
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AimdLimiter:
+    """Additive-Increase / Multiplicative-Decrease 동시 호출 수 제한."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self._inflight = 0
+        self._waiting = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._inflight >= int(self._limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self._inflight += 1
+                return True
+            finally:
+                self._waiting -= 1
+
+    def release(self, outcome: str) -> None:
+        """outcome: success(한도 증가) / overload(한도 감소) / error(유지)"""
+        with self._cond:
+            self._inflight -= 1
+            if outcome == "success":
+                self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            elif outcome == "overload":
+                now = time.monotonic()
+                # 동시에 실패한 호출들이 한도를 연달아 깎지 않도록 1초에 한 번만 줄인다.
+                if now - self._last_decrease >= 1.0:
+                    self._limit = max(float(self.minimum), self._limit / 2)
+                    self._last_decrease = now
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "inflight": self._inflight,
+                "queue_depth": self._waiting,
+            }
+
+
+class TokenBucket:
+    """분당 한도를 초당 비율로 채우는 토큰 버킷. per_minute <= 0 이면 제한 없음."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float, max_wait: float) -> Optional[float]:
+        """amount 만큼 예약하고 기다려야 할 시간(초)을 돌려준다. max_wait 를 넘으면 None."""
+        if self.capacity <= 0 or amount <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= amount else (amount - self._tokens) / self._rate
+            if wait > max_wait:
+                return None
+            # 음수까지 내려가도록 미리 빼 두면 뒤에 온 요청이 그만큼 더 기다린다.
+            self._tokens -= amount
+            return wait
+
+    def refund(self, amount: float) -> None:
+        """reserve() 로 예약했지만 호출하지 않게 된 몫을 돌려준다."""
+        if self.capacity <= 0 or amount <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"per_minute": int(self.capacity), "available": round(max(self._tokens, 0.0), 1)}
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def check(self) -> bool:
+        """열려 있으면 UpstreamUnavailable. reset 시간이 지났으면 시험 호출 1건만 통과시킨다.
+
+        이 호출이 시험 호출이면 True. (release_probe / record_failure(probe=True) 는 그 호출만 부른다)
+        """
+        if self.failure_threshold <= 0:
+            return False
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0 or self._probing:
+                raise UpstreamUnavailable(
+                    "upstream circuit is open", retry_after=max(remaining, 1.0)
+                )
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, probe: bool = False) -> None:
+        """probe: 실패한 호출이 check() 에서 시험 호출로 통과한 것인지"""
+        with self._lock:
+            self._failures += 1
+            if probe or self._probing or (
+                self.failure_threshold > 0 and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+            if probe:
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """시험 호출이 upstream 상태와 무관한 오류(400 등)로 끝났을 때 다음 시험을 허용."""
+        with self._lock:
+            self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() >= self._opened_at + self.reset_seconds:
+                return "half_open"
+            return "open"
+
+
+def _classify(exc: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """(재시도 가능, 과부하 신호, Retry-After 초)"""
+    retry_after: Optional[float] = None
+    response = getattr(exc, "response", None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+
+    if isinstance(exc, openai.RateLimitError):
+        # 요금 한도 초과는 기다려도 풀리지 않는다.
+        if getattr(exc, "code", None) == "insufficient_quota":
+            return False, False, None
+        return True, True, retry_after
+    if isinstance(exc, (openai.APITimeoutError, httpx.TimeoutException)):
+        return True, True, retry_after
+    if isinstance(exc, (openai.APIConnectionError, httpx.TransportError)):
+        return True, False, retry_after
+    if isinstance(exc, openai.APIStatusError) and exc.status_code >= 500:
+        return True, True, retry_after
+    return False, False, None
+
+
+class UpstreamGovernor:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.limiter = AimdLimiter(
+            settings.upstream_initial_concurrency,
+            settings.upstream_min_concurrency,
+            settings.upstream_max_concurrency,
+        )
+        self.requests_bucket = TokenBucket(settings.upstream_requests_per_minute)
+        self.tokens_bucket = TokenBucket(settings.upstream_tokens_per_minute)
+        self.breaker = CircuitBreaker(
+            settings.upstream_breaker_failure_threshold,
+            settings.upstream_breaker_reset_seconds,
+        )
+
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rejected_breaker": 0,
+            "rejected_rate_limit": 0,
+            "rejected_queue": 0,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _admit(self, tokens: int, deadline: float) -> None:
+        max_wait = min(settings.upstream_queue_timeout_seconds, deadline - time.monotonic())
+
+        wait_requests = self.requests_bucket.reserve(1, max_wait)
+        wait_tokens = (
+            self.tokens_bucket.reserve(tokens, max_wait) if wait_requests is not None else None
+        )
+        if wait_requests is None or wait_tokens is None:
+            # 한쪽만 예약된 채로 거절하면 실제로 나가지 않은 호출이 한도를 깎아 먹는다.
+            if wait_requests is not None:
+                self.requests_bucket.refund(1)
+            self._count("rejected_rate_limit")
+            raise UpstreamUnavailable(
+                f"{self.name}: local rate limit exceeded", retry_after=max_wait or 1.0
+            )
+        wait = max(wait_requests, wait_tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+        if not self.limiter.acquire(max_wait - wait):
+            self.requests_bucket.refund(1)
+            self.tokens_bucket.refund(tokens)
+            self._count("rejected_queue")
+            raise UpstreamUnavailable(
+                f"{self.name}: too many concurrent upstream calls",
+                retry_after=settings.upstream_queue_timeout_seconds,
+            )
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """fn 을 제한/재시도/브레이커 아래에서 실행. tokens 는 분당 토큰 버킷에 쓸 예상 토큰 수."""
+        self._count("calls")
+        deadline = time.monotonic() + settings.upstream_deadline_seconds
+        attempt = 0
+        while True:
+            try:
+                probe = self.breaker.check()
+            except UpstreamUnavailable:
+                self._count("rejected_breaker")
+                raise
+            try:
+                self._admit(tokens, deadline)
+            except UpstreamUnavailable:
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            outcome = "error"
+            try:
+                result = fn()
+                outcome = "success"
+                self.breaker.record_success()
+                self._count("succeeded")
+                return result
+            except Exception as e:
+                retryable, overload, retry_after = _classify(e)
+                if overload:
+                    outcome = "overload"
+                if retryable:
+                    self.breaker.record_failure(probe)
+                else:
+                    if probe:
+                        self.breaker.release_probe()
+                    self._count("failed")
+                    raise
+
+                backoff = min(
+                    settings.upstream_backoff_max_seconds,
+                    settings.upstream_backoff_base_seconds * (2 ** attempt),
+                )
+                delay = retry_after if retry_after is not None else random.uniform(0, backoff)
+                if attempt >= settings.upstream_max_retries or time.monotonic() + delay > deadline:
+                    self._count("failed")
+                    raise UpstreamUnavailable(
+                        f"{self.name}: upstream unavailable ({type(e).__name__})",
+                        retry_after=max(delay, 1.0),
+                    ) from e
+                self._count("retries")
+            finally:
+                self.limiter.release(outcome)
+
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            **self.limiter.stats(),
+            "breaker": self.breaker.state,
+            "requests_per_minute": self.requests_bucket.stats(),
+            "tokens_per_minute": self.tokens_bucket.stats(),
+        }
+
+
+_GOVERNORS: Dict[str, UpstreamGovernor] = {}
+_GOVERNORS_LOCK = threading.Lock()
+
+
+def get_governor(model: str) -> UpstreamGovernor:
+    """모델 이름별 governor (임베딩 모델과 채팅 모델은 한도를 따로 관리한다)."""
+    with _GOVERNORS_LOCK:
+        governor = _GOVERNORS.get(model)
+        if governor is None:
+            governor = UpstreamGovernor(model)
+            _GOVERNORS[model] = governor
+        return governor
+
+
+def upstream_stats() -> dict[str, Any]:
+    with _GOVERNORS_LOCK:
+        governors = list(_GOVERNORS.values())
+    return {g.name: g.stats() for g in governors}
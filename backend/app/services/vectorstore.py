@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
-from typing import List, Tuple
+import threading
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
 from uuid import uuid4
 
 import faiss
+import numpy as np
 from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
@@ -14,32 +19,71 @@ from langchain_openai import OpenAIEmbeddings
 
 from ..core.config import settings
 from ..core.models import DesignChangeInput, DesignChangeRecord
+from .answer_cache import ANSWER_CACHE
+from .chunker import split_description
+from .change_index import CHANGE_INDEX, ChangeIndex
+from .change_notifier import CHANGE_NOTIFIER
+from .change_stream import CHANGE_HUB
+from .context_packer import count_tokens
+from .http_clients import get_async_http_client, get_http_client, get_timeout
+from .metrics import timed
+from .micro_batcher import MicroBatcher
+from .numeric_store import NUMERIC_STORE, NumericStore
+from .upstream import get_governor
 
 
 _VECTORSTORE: FAISS | None = None
 _LATEST_CHANGE: DesignChangeRecord | None = None
+# 백그라운드 인제스트(add/save)와 검색이 동시에 FAISS 인덱스/docstore 를 건드리지 않도록 보호
+_INDEX_LOCK = threading.RLock()
+# FAISS 추가 ~ change_log 기록 ~ 인덱스/수치 저장소 추가 ~ 이벤트 발행을 한 커밋으로 묶는다.
+# 동시에 커밋해도 change_log 줄 순서 = 변경 인덱스 seq = 스트림 이벤트 순서가 되도록 보장.
+_COMMIT_LOCK = threading.RLock()
+# 인덱스에 문서가 추가될 때마다 1씩 증가. 답변 캐시 항목의 유효성 판단에 사용.
+_GENERATION: int = 0
 
 
+@lru_cache
 def _get_embeddings() -> OpenAIEmbeddings:
+    # 공유 커넥션 풀을 쓰는 인스턴스 하나를 프로세스 전체에서 재사용한다.
     return OpenAIEmbeddings(
         api_key=settings.openai_api_key,
         model=settings.openai_embedding_model,
+        # 문서와 질문이 항상 같은 차원으로 임베딩되도록 한 곳에서만 지정한다.
+        dimensions=settings.embedding_dimensions,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        request_timeout=get_timeout(),
+        # 재시도는 upstream governor 가 담당한다.
+        max_retries=0,
     )
 
 
-def _build_text(change: DesignChangeRecord) -> str:
+def _build_text(change: DesignChangeRecord, body: str | None = None, part: str = "") -> str:
+    """임베딩/검색 문서 텍스트. body 를 주면 description 대신 그 패시지 본문을 넣는다."""
     return (
-        f"[설계변경 ID: {change.id}]\n"
+        f"[설계변경 ID: {change.id}]{part}\n"
         f"변경일: {change.change_date.isoformat()}\n"
         f"제목: {change.title}\n"
         f"기관명: {change.organization or '미상'}\n"
         f"사업명: {change.project_name or '미상'}\n"
         f"요청 발주처: {change.client or '미상'}\n"
         f"작성자: {change.author or '미상'}\n"
-        f"내용:\n{change.description}"
+        f"내용:\n{change.description if body is None else body}"
     )
 
 
+def _build_passages(change: DesignChangeRecord) -> List[str]:
+    """레코드를 임베딩할 패시지 텍스트 목록으로 만든다. 짧은 레코드는 _build_text 한 개."""
+    bodies = split_description(change.description)
+    if len(bodies) == 1:
+        return [_build_text(change)]
+    return [
+        _build_text(change, body, part=f" (부분 {i}/{len(bodies)})")
+        for i, body in enumerate(bodies, start=1)
+    ]
+
+
 def _metadata(change: DesignChangeRecord) -> dict:
     return {
         "id": change.id,
@@ -53,6 +97,10 @@ def _metadata(change: DesignChangeRecord) -> dict:
     }
 
 
+def _numeric_store_path() -> Path:
+    return settings.faiss_index_dir_path / "numeric_store.npz"
+
+
 def _vectorstore_path() -> Tuple[Path, Path]:
     index_dir = settings.faiss_index_dir_path
     index_file = index_dir / "index.faiss"
@@ -64,7 +112,7 @@ def _create_empty_vectorstore() -> FAISS:
     """문서가 하나도 없을 때 사용할 빈 FAISS 인덱스 생성."""
     embedding = _get_embeddings()
     # 간단한 문장 하나를 임베딩해서 차원을 구한다.
-    dim = len(embedding.embed_query("init"))
+    dim = len(embed_texts(["init"])[0])
     index = faiss.IndexFlatL2(dim)
     docstore = InMemoryDocstore({})
     index_to_docstore_id: dict[int, str] = {}
@@ -86,11 +134,18 @@ def load_vectorstore() -> FAISS:
     index_file, store_file = _vectorstore_path()
 
     if index_file.exists() and store_file.exists():
-        _VECTORSTORE = FAISS.load_local(
+        vs = FAISS.load_local(
             str(index_dir),
             _get_embeddings(),
             allow_dangerous_deserialization=True,
         )
+        dims = settings.embedding_dimensions
+        if dims is not None and vs.index.d != dims:
+            raise RuntimeError(
+                f"faiss_index 차원({vs.index.d})이 embedding_dimensions({dims})와 다릅니다. "
+                f"`python -m app.services.reindex_faiss --dimensions {dims}` 로 인덱스를 다시 만드세요."
+            )
+        _VECTORSTORE = vs
     else:
         # 문서가 하나도 없는 초기 상태용 빈 인덱스 생성
         _VECTORSTORE = _create_empty_vectorstore()
@@ -99,17 +154,22 @@ def load_vectorstore() -> FAISS:
     return _VECTORSTORE
 
 
-def save_vectorstore() -> None:
-    vs = load_vectorstore()
-    vs.save_local(str(settings.faiss_index_dir_path))
-
+def truncate_embeddings(vectors: np.ndarray, dims: int) -> np.ndarray:
+    """Matryoshka 임베딩을 앞 dims 차원만 남기고 다시 L2 정규화. (API 의 dimensions 축소와 같은 결과)"""
+    reduced = np.ascontiguousarray(vectors[:, :dims], dtype=np.float32)
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return reduced / norms
 
-def add_design_change(change_input: DesignChangeInput) -> DesignChangeRecord:
-    """설계 변경 사항을 벡터DB에 추가하고, 로컬 메타데이터도 저장."""
-    global _LATEST_CHANGE
 
+def save_vectorstore() -> None:
     vs = load_vectorstore()
+    with timed("persist"), _INDEX_LOCK:
+        vs.save_local(str(settings.faiss_index_dir_path))
 
+
+def prepare_design_change(change_input: DesignChangeInput) -> Tuple[DesignChangeRecord, List[str]]:
+    """새 레코드(ID/등록 시각 부여)와 임베딩할 패시지 텍스트들을 만든다. 아직 저장하지는 않는다."""
     record = DesignChangeRecord(
         id=uuid4().hex,
         change_date=change_input.change_date,
@@ -121,20 +181,311 @@ def add_design_change(change_input: DesignChangeInput) -> DesignChangeRecord:
         client=change_input.client,
         created_at=datetime.utcnow(),
     )
+    return record, _build_passages(record)
 
-    doc = Document(
-        page_content=_build_text(record),
-        metadata=_metadata(record),
-    )
-    vs.add_documents([doc])
-    save_vectorstore()
 
-    _LATEST_CHANGE = record
-    _append_change_log(record)
+def add_design_change(
+    change_input: DesignChangeInput,
+    numeric_values: Optional[Mapping[str, Any]] = None,
+) -> DesignChangeRecord:
+    """설계 변경 사항을 벡터DB에 추가하고, 로컬 메타데이터도 저장.
 
+    numeric_values: VE 원본 행에서 파싱한 수치 컬럼 (없으면 description 에서 읽는다)
+    """
+    record, passages = prepare_design_change(change_input)
+    # 답변 캐시 무효화에 같은 벡터를 쓰기 위해 직접 임베딩한 뒤 인덱스에 넣는다.
+    vectors = embed_texts(passages)
+    commit_design_changes([(record, vectors, numeric_values)])
     return record
 
 
+def commit_design_changes(
+    entries: Sequence[Tuple[DesignChangeRecord, List[List[float]], Optional[Mapping[str, Any]]]],
+    persist: bool = True,
+) -> None:
+    """이미 임베딩된 레코드들을 FAISS / change_log / 변경 인덱스 / 수치 저장소에 한 번에 반영.
+
+    entries: (레코드, 패시지별 벡터 목록, 수치 컬럼). 벡터 순서는 _build_passages(레코드) 와 같아야 한다.
+
+    persist=False 면 디스크 저장(index.faiss, numeric_store.npz)은 미루고, 나중에 persist_stores() 로 저장한다.
+    (대량 인제스트에서 배치마다 전체 인덱스를 다시 쓰지 않기 위함)
+    """
+    global _LATEST_CHANGE
+    if not entries:
+        return
+
+    vs = load_vectorstore()
+    # change_log 에 쓰기 전에 로드해야 이 레코드가 description 파싱 값으로 먼저 채워지지 않는다.
+    numeric_store = get_numeric_store()
+    # 변경 스트림 이벤트 번호(seq)를 매기려면 인덱스가 change_log 와 맞춰져 있어야 한다.
+    change_index = get_change_index()
+
+    records = [record for record, _, _ in entries]
+    text_embeddings: List[Tuple[str, List[float]]] = []
+    metadatas: List[dict] = []
+    for record, vectors, _ in entries:
+        passages = _build_passages(record)
+        if len(passages) != len(vectors):
+            raise ValueError(f"패시지 수({len(passages)})와 벡터 수({len(vectors)})가 다릅니다: {record.id}")
+        for i, (text, vector) in enumerate(zip(passages, vectors)):
+            text_embeddings.append((text, vector))
+            # 패시지 → 레코드 매핑: 검색 결과는 metadata["id"] 로 레코드 단위로 합친다.
+            metadatas.append({**_metadata(record), "passage": i, "passages": len(passages)})
+    with _COMMIT_LOCK:
+        with _INDEX_LOCK:
+            vs.add_embeddings(text_embeddings, metadatas=metadatas)
+        if persist:
+            save_vectorstore()
+
+        _LATEST_CHANGE = records[-1]
+        _append_change_log(records)
+        for record, _, numeric_values in entries:
+            change_index.add(record)
+            numeric_store.add(record, numeric_values)
+        if persist:
+            with timed("persist_numeric"):
+                numeric_store.save(_numeric_store_path())
+
+        if len(entries) == 1:
+            record, vectors, _ = entries[0]
+            _bump_generation(record.id, vectors)
+        else:
+            # 여러 건이 한 번에 들어오면 항목별 비교보다 캐시를 비우는 편이 싸다.
+            _bump_generation_bulk(len(entries))
+
+        # /worker/latest-change long-poll 대기자 깨우기 + /worker/changes/stream 구독자에게 전송
+        CHANGE_NOTIFIER.publish()
+        CHANGE_HUB.publish([(change_index.seq_of(r.id), r) for r in records])
+
+
+def persist_stores() -> None:
+    """commit_design_changes(persist=False) 로 미뤄 둔 FAISS / 수치 저장소를 디스크에 저장."""
+    save_vectorstore()
+    with timed("persist_numeric"):
+        get_numeric_store().save(_numeric_store_path())
+
+
+def rollback_to_record(last_record_id: Optional[str]) -> int:
+    """중단된 인제스트 재개용: change_log 를 last_record_id 까지만 남기고, 그 뒤 레코드를 디스크 저장소에서도 지운다.
+
+    last_record_id 가 None 이면 change_log 를 모두 비운다. 지운 change_log 레코드 수를 돌려준다.
+    FAISS / 변경 인덱스를 쓰는 다른 요청이 없는 CLI 프로세스 시작 직후에 호출해야 한다.
+    """
+    with _COMMIT_LOCK:
+        return _rollback_to_record_locked(last_record_id)
+
+
+def _log_line_id(line: str) -> Optional[str]:
+    try:
+        return json.loads(line)["id"]
+    except Exception:
+        return None
+
+
+def _rollback_to_record_locked(last_record_id: Optional[str]) -> int:
+    global _LATEST_CHANGE
+    log_path = settings.data_dir_path / "change_log.jsonl"
+    lines: List[str] = []
+    if log_path.exists():
+        with log_path.open("r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+
+    kept_ids: List[Optional[str]] = [_log_line_id(line) for line in lines]
+    if last_record_id is None:
+        keep = 0
+    elif last_record_id in kept_ids:
+        keep = kept_ids.index(last_record_id) + 1
+    else:
+        raise RuntimeError(f"change_log 에서 체크포인트 레코드를 찾을 수 없습니다: {last_record_id}")
+
+    removed = len(lines) - keep
+    if removed:
+        tmp = log_path.with_name(log_path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.writelines(lines[:keep])
+        tmp.replace(log_path)
+        _LATEST_CHANGE = None
+    kept = set(kept_ids[:keep])
+
+    # FAISS 저장과 체크포인트 기록 사이에 죽었다면 인덱스에 체크포인트 이후 벡터가 남아 있을 수 있다.
+    vs = load_vectorstore()
+    with _INDEX_LOCK:
+        stale = [
+            doc_id
+            for doc_id in vs.index_to_docstore_id.values()
+            if getattr(vs.docstore.search(doc_id), "metadata", {}).get("id") not in kept
+        ]
+        if stale:
+            vs.delete(stale)
+    if stale:
+        save_vectorstore()
+
+    numeric_store = get_numeric_store()
+    if numeric_store.retain(kept):
+        numeric_store.save(_numeric_store_path())
+    return removed
+
+
+def _bump_generation(doc_id: str, vectors: List[List[float]]) -> None:
+    global _GENERATION
+    _GENERATION += 1
+    for vector in vectors:
+        ANSWER_CACHE.invalidate_for_change(doc_id, vector, _GENERATION)
+
+
+def _bump_generation_bulk(count: int) -> None:
+    global _GENERATION
+    _GENERATION += count
+    ANSWER_CACHE.clear()
+
+
+def get_generation() -> int:
+    return _GENERATION
+
+
+def index_stats() -> dict[str, Any]:
+    """메모리에 올라온 FAISS 인덱스 크기. 아직 로드 전이면 디스크를 읽지 않고 0 으로 돌려준다."""
+    vs = _VECTORSTORE
+    vectors = vs.index.ntotal if vs is not None else 0
+    dimensions = vs.index.d if vs is not None else 0
+    return {
+        "vectors": vectors,
+        "dimensions": dimensions,
+        "vector_bytes": vectors * dimensions * 4,  # IndexFlatL2 는 float32 원본 벡터를 그대로 보관
+        "generation": _GENERATION,
+    }
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """임베딩 모델 governor(동시성/분당 한도/재시도) 아래에서 embed_documents 호출."""
+    governor = get_governor(settings.openai_embedding_model)
+    with timed("embed"):
+        return governor.call(
+            lambda: _get_embeddings().embed_documents(texts),
+            tokens=sum(count_tokens(t) for t in texts),
+        )
+
+
+def _embed_query_batch(texts: List[str]) -> List[List[float]]:
+    # embed_query 도 내부적으로 embed_documents([text]) 와 같은 요청이므로 결과 벡터는 동일하다.
+    return embed_texts(texts)
+
+
+@dataclass
+class SearchHit:
+    """FAISS 검색 결과 한 건. 재정렬(rerank)을 위해 저장된 문서 벡터도 함께 돌려준다."""
+
+    doc: Document
+    distance: float  # 제곱 L2 거리 (IndexFlatL2)
+    vector: np.ndarray
+
+
+def _merge_passages(docs: List[Document]) -> Document:
+    """같은 레코드에서 함께 검색된 패시지들을 원래 순서대로 하나의 문서로 합친다. (첫 문서가 최상위 패시지)"""
+    if len(docs) == 1:
+        return docs[0]
+    best = docs[0]
+    header = best.page_content.split("내용:\n", 1)[0]
+    ordered = sorted(docs, key=lambda d: (d.metadata or {}).get("passage", 0))
+    bodies = [d.page_content.split("내용:\n", 1)[-1] for d in ordered]
+    return Document(page_content=header + "내용:\n" + "\n...\n".join(bodies), metadata=best.metadata)
+
+
+def _search_batch(requests: List[Tuple[List[float], int]]) -> List[List[SearchHit]]:
+    """여러 질문 벡터를 하나의 행렬로 쌓아 index.search 를 한 번만 호출.
+
+    인덱스에는 패시지 단위로 들어 있으므로 k 의 `chunk_search_multiplier` 배를 가져온 뒤
+    레코드(metadata["id"]) 단위로 합쳐 서로 다른 레코드 최대 k 개를 돌려준다.
+    (긴 레코드 하나가 후보를 다 차지해 k 개가 안 되면 그 질문만 두 배씩 더 깊게 다시 검색)
+    거리/벡터는 레코드에서 가장 가까운 패시지 기준이다.
+    """
+    with timed("search"):
+        return _search_batch_locked(requests)
+
+
+def _search_batch_locked(requests: List[Tuple[List[float], int]]) -> List[List[SearchHit]]:
+    vs = load_vectorstore()
+    multiplier = max(1, settings.chunk_search_multiplier) if settings.chunk_max_tokens > 0 else 1
+    with _INDEX_LOCK:
+        total = vs.index.ntotal
+        if total == 0:
+            return [[] for _ in requests]
+
+        queries = np.asarray([vector for vector, _ in requests], dtype=np.float32)
+        results: List[List[SearchHit]] = [[] for _ in requests]
+        pending = list(range(len(requests)))
+        depth = max(k for _, k in requests) * multiplier
+        while pending:
+            fetch = min(depth, total)
+            distances, indices = vs.index.search(queries[pending], fetch)
+            retry: List[int] = []
+            for row, request_no in enumerate(pending):
+                k = requests[request_no][1]
+                groups = _group_by_record(vs, distances[row], indices[row], k)
+                if len(groups) < k and fetch < total:
+                    retry.append(request_no)
+                    continue
+                results[request_no] = [
+                    SearchHit(
+                        doc=_merge_passages([doc for _, _, doc in group]),
+                        distance=group[0][0],
+                        vector=vs.index.reconstruct(group[0][1]),
+                    )
+                    for group in groups.values()
+                ]
+            pending, depth = retry, depth * 2
+        return results
+
+
+def _group_by_record(
+    vs: FAISS, distances: np.ndarray, indices: np.ndarray, k: int
+) -> dict[str, List[Tuple[float, int, Document]]]:
+    """가까운 순 패시지 검색 결과를 레코드 ID -> [(거리, 인덱스 위치, 패시지 문서), ...] 로 묶는다. (최대 k 개 레코드)"""
+    groups: dict[str, List[Tuple[float, int, Document]]] = {}
+    for distance, idx in zip(distances, indices):
+        if idx == -1:
+            continue
+        doc = vs.docstore.search(vs.index_to_docstore_id[int(idx)])
+        if not isinstance(doc, Document):
+            continue
+        record_id = (doc.metadata or {}).get("id") or vs.index_to_docstore_id[int(idx)]
+        if record_id not in groups and len(groups) >= k:
+            continue
+        groups.setdefault(record_id, []).append((float(distance), int(idx), doc))
+    return groups
+
+
+# 동시에 들어온 /worker/chat 요청들의 질문 임베딩 / FAISS 검색을 짧은 창 동안 모아서 한 번에 처리한다.
+QUERY_EMBED_BATCHER: MicroBatcher[str, List[float]] = MicroBatcher(
+    "query_embedding",
+    _embed_query_batch,
+    window_seconds=settings.query_batch_window_ms / 1000,
+    max_batch=settings.query_batch_max_size,
+)
+SEARCH_BATCHER: MicroBatcher[Tuple[List[float], int], List[SearchHit]] = MicroBatcher(
+    "faiss_search",
+    _search_batch,
+    window_seconds=settings.query_batch_window_ms / 1000,
+    max_batch=settings.query_batch_max_size,
+)
+
+
+def embed_query(text: str) -> List[float]:
+    return QUERY_EMBED_BATCHER.submit(text)
+
+
+def search_hits(query_vector: List[float], k: int | None = None) -> List[SearchHit]:
+    """질문 임베딩으로 직접 검색. 가까운 순서로 (문서, 거리, 저장 벡터) 를 반환."""
+    return SEARCH_BATCHER.submit((query_vector, k or settings.retriever_top_k))
+
+
+def search_by_vector(
+    query_vector: List[float], k: int | None = None
+) -> List[Tuple[Document, float]]:
+    """질문 임베딩으로 직접 검색. (문서, 제곱 L2 거리) 를 가까운 순서로 반환."""
+    return [(h.doc, h.distance) for h in search_hits(query_vector, k)]
+
+
 def get_latest_change() -> DesignChangeRecord | None:
     global _LATEST_CHANGE
     if _LATEST_CHANGE is not None:
@@ -174,39 +525,71 @@ def get_latest_change() -> DesignChangeRecord | None:
         return None
 
 
-def _append_change_log(record: DesignChangeRecord) -> None:
+def _append_change_log(records: Sequence[DesignChangeRecord]) -> None:
     log_path = settings.data_dir_path / "change_log.jsonl"
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    payload = {
-        "id": record.id,
-        "change_date": record.change_date.isoformat(),
-        "title": record.title,
-        "description": record.description,
-        "author": record.author,
-        "organization": record.organization,
-        "project_name": record.project_name,
-        "client": record.client,
-        "created_at": record.created_at.isoformat(),
-    }
-
-    with log_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    lines = []
+    for record in records:
+        payload = {
+            "id": record.id,
+            "change_date": record.change_date.isoformat(),
+            "title": record.title,
+            "description": record.description,
+            "author": record.author,
+            "organization": record.organization,
+            "project_name": record.project_name,
+            "client": record.client,
+            "created_at": record.created_at.isoformat(),
+        }
+        lines.append(json.dumps(payload, ensure_ascii=False) + "\n")
+
+    with timed("log_append"), log_path.open("a+b") as f:
+        # 이전 프로세스가 줄 중간에 죽었으면 그 조각을 한 줄로 끝내 둔다. (뒤 레코드의 줄 번호 = seq 유지)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write("".join(lines).encode("utf-8"))
+
+
+def get_change_index() -> ChangeIndex:
+    """등록순/제안일자/사업명 인덱스. 처음 호출 시 change_log.jsonl 에서 채운다."""
+    if not CHANGE_INDEX.loaded:
+        CHANGE_INDEX.load(_read_change_log)
+    return CHANGE_INDEX
+
+
+def get_numeric_store() -> NumericStore:
+    """VE 수치 컬럼 저장소. 처음 호출 시 numeric_store.npz 를 읽고 change_log 와 맞춘다."""
+    if not NUMERIC_STORE.loaded:
+        NUMERIC_STORE.load(_numeric_store_path(), list_all_changes_from_log)
+    return NUMERIC_STORE
 
 
 def get_retriever():
     vs = load_vectorstore()
-    return vs.as_retriever(search_kwargs={"k": 5})
+    return vs.as_retriever(search_kwargs={"k": settings.retriever_top_k})
 
 
 def list_all_changes_from_log() -> List[DesignChangeRecord]:
-    """디버깅/관리용: change_log.jsonl 전체 읽기."""
+    """디버깅/관리용: change_log.jsonl 전체 읽기. (읽을 수 없는 줄은 건너뜀)"""
+    return [record for record in _read_change_log() if record is not None]
+
+
+def _read_change_log() -> List[Optional[DesignChangeRecord]]:
+    """change_log.jsonl 을 빈 줄을 뺀 줄 순서대로. 읽을 수 없는 줄은 None 으로 자리만 남긴다.
+
+    목록 위치가 곧 변경 인덱스 seq(= SSE 이벤트 id)라서, 깨진 줄을 빼 버리면 그 뒤 seq 가 밀려
+    재시작 후 Last-Event-ID 재개가 어긋난다.
+    """
     log_path = settings.data_dir_path / "change_log.jsonl"
-    result: List[DesignChangeRecord] = []
+    result: List[Optional[DesignChangeRecord]] = []
     if not log_path.exists():
         return result
 
-    with log_path.open("r", encoding="utf-8") as f:
+    skipped = 0
+    with log_path.open("r", encoding="utf-8", errors="replace") as f:
         for line in f:
             if not line.strip():
                 continue
@@ -225,9 +608,10 @@ def list_all_changes_from_log() -> List[DesignChangeRecord]:
                     client=obj.get("client"),
                     created_at=_dt.fromisoformat(obj["created_at"]),
                 )
-                result.append(record)
             except Exception:
-                continue
+                record = None
+                skipped += 1
+            result.append(record)
+    if skipped:
+        print(f"[WARN] change_log.jsonl 에서 읽을 수 없는 줄 {skipped}개를 건너뜀 (seq 자리는 유지)")
     return result
-
-
@@ -0,0 +1,68 @@
+"""answer_cache: 유사 질문 조회, 새 문서 추가 시 세대(generation) 올림/선택적 무효화, LRU 정리."""
+
+import numpy as np
+
+from app.core.models import LanguageCode, WorkerChatResponse
+from app.services.answer_cache import AnswerCache
+
+
+def _response(answer: str) -> WorkerChatResponse:
+    return WorkerChatResponse(answer=answer, language=LanguageCode.ko, sources=[])
+
+
+def _cache(max_entries: int = 10) -> AnswerCache:
+    return AnswerCache(similarity_threshold=0.95, max_entries=max_entries, ttl_seconds=3600.0)
+
+
+def _store(cache: AnswerCache, vector, answer: str = "a", generation: int = 0, language: str = "ko") -> None:
+    # top-k(2) 가 꽉 찼고 가장 먼 문서까지의 제곱 거리가 0.5 인 항목
+    cache.store(language, vector, _response(answer), ["doc-1", "doc-2"], [0.1, 0.5], 2, generation, 1.0)
+
+
+def test_similar_question_hits_and_other_language_misses() -> None:
+    cache = _cache()
+    _store(cache, [1.0, 0.0, 0.0])
+
+    hit = cache.lookup("ko", [0.99, 0.01, 0.0], 0)
+    assert hit is not None and hit.answer == "a"
+    assert cache.lookup("en", [1.0, 0.0, 0.0], 0) is None
+    assert cache.lookup("ko", [0.0, 1.0, 0.0], 0) is None
+
+
+def test_far_document_bumps_generation_and_keeps_entry() -> None:
+    cache = _cache()
+    _store(cache, [1.0, 0.0, 0.0])
+
+    # 제곱 거리 2.0 > 0.5: top-k 에 못 들어오므로 답변은 그대로 새 세대로 올라간다.
+    assert cache.invalidate_for_change("doc-9", [-1.0, 0.0, 0.0], 1) == 0
+    assert cache.lookup("ko", [1.0, 0.0, 0.0], 1) is not None
+
+
+def test_near_or_cited_document_invalidates_entry() -> None:
+    cache = _cache()
+    _store(cache, [1.0, 0.0, 0.0], "near")
+    _store(cache, [0.0, 1.0, 0.0], "cited")
+
+    assert cache.invalidate_for_change("doc-9", [0.9, 0.0, 0.0], 1) == 1
+    assert cache.lookup("ko", [1.0, 0.0, 0.0], 1) is None
+    assert cache.invalidate_for_change("doc-1", [0.0, -1.0, 0.0], 2) == 1
+    assert cache.lookup("ko", [0.0, 1.0, 0.0], 2) is None
+
+
+def test_stale_generation_is_dropped() -> None:
+    cache = _cache()
+    _store(cache, [1.0, 0.0, 0.0], generation=0)
+
+    # 무효화 통보 없이 세대가 바뀌었으면(대량 인제스트 등) 쓰지 않는다.
+    assert cache.lookup("ko", [1.0, 0.0, 0.0], 5) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_oldest_entry_is_evicted() -> None:
+    cache = _cache(max_entries=2)
+    for i, vector in enumerate(np.eye(3)):
+        _store(cache, vector, f"a{i}", language="ko" if i else "en")
+
+    assert cache.stats()["evicted"] == 1
+    assert cache.lookup("en", [1.0, 0.0, 0.0], 0) is None
+    assert cache.lookup("ko", [0.0, 0.0, 1.0], 0).answer == "a2"
@@ -0,0 +1,100 @@
+"""change_index + change_log: seq = change_log 줄 위치(깨진 줄 포함), SSE Last-Event-ID 재개, 사업/날짜 조회."""
+
+from datetime import date, datetime
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.core.config import settings
+from app.core.models import DesignChangeRecord
+from app.services.change_index import ChangeIndex
+from app.services.change_stream import format_change_event
+from app.services.vectorstore import _append_change_log, _read_change_log, list_all_changes_from_log
+
+
+def _record(i: int, project: str = "행복도시 도로공사", day: int = 1) -> DesignChangeRecord:
+    return DesignChangeRecord(
+        id=f"rec-{i}",
+        change_date=date(2024, 3, day),
+        title=f"제안 {i}",
+        description="설명",
+        project_name=project,
+        created_at=datetime(2024, 3, 1, 9, i),
+    )
+
+
+@pytest.fixture
+def log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    return tmp_path
+
+
+def _loaded(records) -> ChangeIndex:
+    index = ChangeIndex()
+    index.load(lambda: records)
+    return index
+
+
+def test_malformed_lines_keep_their_seq(log_dir: Path) -> None:
+    _append_change_log([_record(0), _record(1)])
+    with (log_dir / "change_log.jsonl").open("a", encoding="utf-8") as f:
+        f.write("{not json\n\n")
+    _append_change_log([_record(3)])
+
+    index = _loaded(_read_change_log())
+
+    assert [r.id for r in list_all_changes_from_log()] == ["rec-0", "rec-1", "rec-3"]
+    assert index.seq_of("rec-3") == 3  # 깨진 줄(2)도 자리를 차지하고, 빈 줄은 세지 않는다.
+    assert len(index) == 3
+    assert [(seq, r.id) for seq, r in index.since(0, 100)] == [(1, "rec-1"), (3, "rec-3")]
+
+
+def test_append_after_torn_line_starts_a_new_line(log_dir: Path) -> None:
+    _append_change_log([_record(0)])
+    with (log_dir / "change_log.jsonl").open("a", encoding="utf-8") as f:
+        f.write('{"id": "torn')  # 쓰다가 죽은 줄
+
+    _append_change_log([_record(2)])
+
+    lines = (log_dir / "change_log.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3 and json.loads(lines[2])["id"] == "rec-2"
+    assert _loaded(_read_change_log()).seq_of("rec-2") == 2
+
+
+def test_live_adds_match_reload(log_dir: Path) -> None:
+    _append_change_log([_record(0)])
+    live = _loaded(_read_change_log())
+    for record in (_record(0), _record(1)):  # 중복 ID 도 로그에 한 줄이므로 자리를 차지한다.
+        _append_change_log([record])
+        live.add(record)
+
+    reloaded = _loaded(_read_change_log())
+    assert live.seq_of("rec-1") == reloaded.seq_of("rec-1") == 2
+
+
+def test_since_limits_backlog_to_latest_records() -> None:
+    index = _loaded([_record(i) for i in range(10)])
+
+    assert [seq for seq, _ in index.since(-1, 3)] == [7, 8, 9]
+    assert index.since(9, 100) == []
+    assert format_change_event(4, _record(4)).startswith("id: 4\nevent: change\ndata: ")
+
+
+def test_latest_by_project_and_by_date() -> None:
+    records: List[DesignChangeRecord] = [
+        _record(0, "행복도시 도로공사", day=5),
+        _record(1, "Sejong Bridge", day=2),
+        _record(2, "행복도시 도로공사", day=9),
+        _record(3, "Sejong Bridge", day=20),
+    ]
+    index = _loaded(records)
+
+    assert [r.id for r in index.latest(2)] == ["rec-3", "rec-2"]
+    assert [r.id for r in index.by_project("행복도시도로공사")] == ["rec-2", "rec-0"]
+    assert [r.id for r in index.by_date(date(2024, 3, 1), date(2024, 3, 9))] == ["rec-2", "rec-0", "rec-1"]
+    assert [
+        r.id for r in index.by_date(date(2024, 3, 1), date(2024, 3, 31), project_name="sejong bridge")
+    ] == ["rec-3", "rec-1"]
+    assert index.match_project("Sejong Bridge 의 최근 변경") == "Sejong Bridge"
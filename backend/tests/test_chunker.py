@@ -0,0 +1,59 @@
+"""chunker.split_description: 토큰 예산, 섹션 경계 유지, 긴 섹션의 겹침 분할."""
+
+from app.services.chunker import split_description
+from app.services.context_packer import count_tokens
+
+
+def _section(name: str, lines: int) -> str:
+    body = "\n".join(f"{name} 항목 {i}: 배수관 재질을 HDPE 로 변경하여 유지관리비를 줄임" for i in range(lines))
+    return f"[{name}]\n{body}"
+
+
+def test_short_description_is_not_split() -> None:
+    text = _section("개요", 2)
+    assert split_description(text, max_tokens=10_000, overlap_tokens=10) == [text]
+
+
+def test_zero_budget_disables_splitting() -> None:
+    text = _section("개요", 50)
+    assert split_description(text, max_tokens=0, overlap_tokens=10) == [text]
+
+
+def test_sections_are_packed_whole_within_budget() -> None:
+    sections = [_section(name, 3) for name in ("개요", "개선전", "개선후", "LCC")]
+    text = "\n".join(sections)
+    budget = count_tokens(sections[0]) * 2 + 8
+
+    passages = split_description(text, max_tokens=budget, overlap_tokens=0)
+
+    assert len(passages) > 1
+    assert all(count_tokens(p) <= budget for p in passages)
+    # 섹션은 쪼개지지 않고, 순서대로 모두 들어간다.
+    assert "\n\n".join(passages).split("\n\n") == sections
+
+
+def test_long_section_is_split_with_overlap() -> None:
+    text = _section("생애주기비용(LCC) 절감효과 - 개선전", 40)
+    line_tokens = count_tokens(text.splitlines()[1]) + 1
+    budget = line_tokens * 6
+    overlap = line_tokens * 2
+
+    passages = split_description(text, max_tokens=budget, overlap_tokens=overlap)
+
+    assert len(passages) > 2
+    assert all(count_tokens(p) <= budget for p in passages)
+    for prev, nxt in zip(passages, passages[1:]):
+        # 앞 패시지의 마지막 줄이 다음 패시지 앞에 겹쳐 들어간다.
+        assert nxt.splitlines()[0] in prev.splitlines()
+    covered = {line for p in passages for line in p.splitlines()}
+    assert covered == set(text.splitlines())
+
+
+def test_single_long_line_is_split_by_characters() -> None:
+    text = "가" * 5000
+    budget = max(8, count_tokens(text) // 10)
+
+    passages = split_description(text, max_tokens=budget, overlap_tokens=0)
+
+    assert len(passages) > 1
+    assert "".join(passages) == text
@@ -0,0 +1,52 @@
+"""context_packer.pack_context: 메타데이터 중복 제거와 토큰 예산 안에서의 잘라내기."""
+
+from datetime import date, datetime
+
+from langchain_core.documents import Document
+
+from app.core.models import DesignChangeRecord
+from app.services.context_packer import EMPTY_CONTEXT, TRUNCATED_MARK, count_tokens, pack_context
+from app.services.vectorstore import _build_text, _metadata
+
+
+def _doc(i: int, body_lines: int = 3) -> Document:
+    record = DesignChangeRecord(
+        id=f"rec-{i}",
+        change_date=date(2024, 1, i + 1),
+        title=f"제안 {i}",
+        description="\n".join(f"[VE 제안명] 제안 {i}" if n == 0 else f"내용 {i}-{n} 배수 공법 변경" for n in range(body_lines)),
+        organization="LH",
+        project_name="행복도시 도로공사",
+        created_at=datetime(2024, 1, i + 1),
+    )
+    return Document(page_content=_build_text(record), metadata=_metadata(record))
+
+
+def test_empty_context() -> None:
+    packed = pack_context([], 1000)
+    assert packed.text == EMPTY_CONTEXT and packed.docs == [] and not packed.truncated
+
+
+def test_metadata_is_printed_once_per_document() -> None:
+    packed = pack_context([_doc(0), _doc(1)], 10_000)
+
+    assert [d.metadata["id"] for d in packed.docs] == ["rec-0", "rec-1"]
+    assert packed.text.count("사업명: 행복도시 도로공사") == 2  # 헤더에만
+    assert "[VE 제안명]" not in packed.text
+    assert "[설계변경 ID:" not in packed.text
+    assert packed.tokens == count_tokens(packed.text)
+    assert not packed.truncated
+
+
+def test_budget_truncates_lower_ranked_documents() -> None:
+    docs = [_doc(i, body_lines=40) for i in range(5)]
+    full = pack_context(docs, 100_000)
+    budget = full.tokens // 3
+
+    packed = pack_context(docs, budget)
+
+    assert packed.truncated
+    assert packed.tokens <= budget + count_tokens(TRUNCATED_MARK)
+    assert packed.docs == docs[: len(packed.docs)]
+    assert packed.text.endswith(TRUNCATED_MARK)
+    assert "rec-4" not in packed.text
@@ -0,0 +1,111 @@
+"""IngestManifest: 체크포인트/행 fingerprint 저장-로드 왕복, 커밋되지 않은 행 로그 꼬리, 예전 형식 변환."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services.ingest_manifest import (
+    IngestManifest,
+    content_key,
+    file_key,
+    row_fingerprint,
+    rows_path,
+)
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "ingest_manifest.json"
+
+
+def test_checkpoint_and_rows_round_trip(path: Path, tmp_path: Path) -> None:
+    source = tmp_path / "ve.csv"
+    source.write_text("기관명,사업명\n", encoding="utf-8")
+
+    manifest = IngestManifest.load(path)
+    state = manifest.check_file(source)
+    assert state is not None
+    manifest.record_rows([("fp-1", "rec-1"), ("fp-2", "rec-2")])
+    manifest.set_checkpoint("rec-2", {file_key(source): {"sha256": state["sha256"], "row_offset": 2}})
+    manifest.save()
+
+    loaded = IngestManifest.load(path)
+    assert len(loaded) == 2 and loaded.has_row("fp-1") and loaded.has_row("fp-2")
+    assert loaded.checkpoint == {
+        "last_record_id": "rec-2",
+        "files": {file_key(source): {"sha256": state["sha256"], "row_offset": 2}},
+    }
+
+    loaded.mark_file(source, state, rows=2)
+    loaded.clear_checkpoint()
+    loaded.save()
+
+    finished = IngestManifest.load(path)
+    assert finished.checkpoint is None
+    assert finished.check_file(source) is None  # 바뀌지 않은 파일은 건너뜀
+    source.write_text("기관명,사업명\n값,값\n", encoding="utf-8")
+    assert finished.check_file(source) is not None
+
+
+def test_save_appends_only_new_rows(path: Path) -> None:
+    manifest = IngestManifest.load(path)
+    manifest.record_rows([("fp-1", "rec-1")])
+    manifest.save()
+    first = rows_path(path).read_bytes()
+
+    manifest.record_rows([("fp-2", "rec-2")])
+    manifest.save()
+
+    assert rows_path(path).read_bytes().startswith(first)
+    assert rows_path(path).read_text(encoding="utf-8").splitlines() == ["fp-1\trec-1", "fp-2\trec-2"]
+    assert "rows" not in json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_uncommitted_rows_tail_is_ignored_and_overwritten(path: Path) -> None:
+    manifest = IngestManifest.load(path)
+    manifest.record_rows([("fp-1", "rec-1")])
+    manifest.save()
+    # 행 로그에 덧붙인 뒤 json 을 바꾸기 전에 죽은 실행
+    with rows_path(path).open("a", encoding="utf-8") as f:
+        f.write("fp-lost\trec-x\nfp-torn")
+
+    reloaded = IngestManifest.load(path)
+    assert len(reloaded) == 1 and not reloaded.has_row("fp-lost")
+
+    reloaded.record_rows([("fp-2", "rec-2")])
+    reloaded.save()
+    assert rows_path(path).read_text(encoding="utf-8").splitlines() == ["fp-1\trec-1", "fp-2\trec-2"]
+
+
+def test_version_1_manifest_is_migrated(path: Path) -> None:
+    upload = (settings.import_dir.resolve() / "0123abcd.csv").as_posix()
+    path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "files": {upload: {"size": 1, "mtime_ns": 1, "sha256": "abc", "rows": 1}},
+                "rows": {"fp-1": "rec-1"},
+                "checkpoint": None,
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    manifest = IngestManifest.load(path)
+    assert manifest.has_row("fp-1")
+    # 업로드 임시 경로 항목은 내용 해시 키로 옮겨진다.
+    assert manifest.has_content("abc")
+    manifest.save()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["version"] == 2 and list(data["files"]) == [content_key("abc")]
+    assert IngestManifest.load(path).has_row("fp-1")
+
+
+def test_row_fingerprint_ignores_order_whitespace_and_empty_columns() -> None:
+    a = row_fingerprint({"기관명": "LH ", "사업명": "도로", "비고": ""})
+    b = row_fingerprint({"사업명": "도로", "기관명": "LH"})
+    assert a == b
+    assert a != row_fingerprint({"사업명": "교량", "기관명": "LH"})
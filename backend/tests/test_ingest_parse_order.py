@@ -0,0 +1,66 @@
+"""ingest_ve_csv._iter_parsed_directory: 병렬 파싱 결과의 파일/행 순서와 체크포인트 오프셋."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from app.core.config import settings
+from app.services.ingest_ve_csv import _iter_parsed_directory
+
+
+ROW_COUNTS = [7, 1, 12, 5]
+
+
+@pytest.fixture
+def files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> List[Path]:
+    # 작은 묶음으로 보내야 파일들의 결과가 큐에서 서로 섞인다.
+    monkeypatch.setattr(settings, "ingest_parse_batch_rows", 2)
+    paths = []
+    for file_no, count in enumerate(ROW_COUNTS):
+        lines = ["VE 제안 목록", "기관명,사업명,제안명,제안일자"]
+        lines += [f"기관,사업{file_no},제안 {file_no}-{row},2024-01-{row % 28 + 1:02d}" for row in range(count)]
+        path = tmp_path / f"{file_no:02d}.csv"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_ordered_keeps_file_then_row_order(files: List[Path]) -> None:
+    parsed = list(_iter_parsed_directory(files, workers=3, ordered=True, skip_rows=[0] * len(files)))
+
+    expected = [(f, r) for f, count in enumerate(ROW_COUNTS) for r in range(count)]
+    assert [(file_no, row_no) for file_no, row_no, *_ in parsed] == expected
+    assert parsed[0][3].title == "제안 0-0"
+
+
+def test_unordered_keeps_row_order_within_each_file(files: List[Path]) -> None:
+    parsed = list(_iter_parsed_directory(files, workers=3, ordered=False, skip_rows=[0] * len(files)))
+
+    assert sorted((f, r) for f, r, *_ in parsed) == [
+        (f, r) for f, count in enumerate(ROW_COUNTS) for r in range(count)
+    ]
+    for file_no, count in enumerate(ROW_COUNTS):
+        assert [r for f, r, *_ in parsed if f == file_no] == list(range(count))
+
+
+def test_skip_rows_resumes_from_offset(files: List[Path]) -> None:
+    skip = [3, 0, 10, 5]
+    parsed = list(_iter_parsed_directory(files, workers=2, ordered=True, skip_rows=skip))
+
+    expected = [(f, r) for f, count in enumerate(ROW_COUNTS) for r in range(skip[f], count)]
+    assert [(file_no, row_no) for file_no, row_no, *_ in parsed] == expected
+
+
+def test_unreadable_file_is_reported(files: List[Path]) -> None:
+    files[1].write_text("헤더가 없는 파일\n", encoding="utf-8")
+    failed: List[int] = []
+
+    parsed = list(
+        _iter_parsed_directory(
+            files, workers=2, ordered=True, skip_rows=[0] * len(files), on_file_error=failed.append
+        )
+    )
+
+    assert failed == [1]
+    assert [f for f, *_ in parsed] == [0] * 7 + [2] * 12 + [3] * 5
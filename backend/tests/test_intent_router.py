@@ -0,0 +1,136 @@
+"""intent_router 규칙 분류: 구조화 템플릿으로 보낼 질문과 RAG 로 보낼 질문 구분."""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.core.models import DesignChangeRecord
+from app.services.change_index import ChangeIndex
+from app.services.intent_router import classify_intent
+
+
+@pytest.fixture(scope="module")
+def index() -> ChangeIndex:
+    records = [
+        DesignChangeRecord(
+            id=str(i),
+            change_date=date(2024, 3, i + 1),
+            title=f"제안 {i}",
+            description="설명",
+            project_name=project,
+            created_at=datetime(2024, 3, i + 1),
+        )
+        for i, project in enumerate(["행복도시 도로공사", "Sejong Bridge"])
+    ]
+    idx = ChangeIndex()
+    idx.load(lambda: records)
+    return idx
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        # 키워드가 다른 단어 일부인 경우 ("elastic"/"plastic" 안의 "last")
+        "Which elastic bearing was replaced?",
+        "Which proposal used plastic pipes?",
+        # 의도 단어가 있어도 주제가 남는 질문
+        "What was the last change to the drainage design?",
+        "Show recent changes about waterproofing",
+        "최근 교량 받침 관련 설계변경이 있었나요?",
+        "행복도시 도로공사에서 어떤 공법이 변경되었나요?",
+        "2024년에 변경된 배수 공법은?",
+        "最近的桥梁设计变更",
+        "Thay đổi thiết kế mới nhất về cầu",
+        "Останні зміни дренажу",
+    ],
+)
+def test_topical_questions_go_to_rag(index: ChangeIndex, question: str) -> None:
+    assert classify_intent(question, index) is None
+
+
+@pytest.mark.parametrize(
+    "question, limit",
+    [
+        ("최근 설계변경 알려주세요", 1),
+        ("가장 최근에 등록된 설계변경 3건 보여줘", 3),
+        ("What is the most recent design change?", 1),
+        ("Show the 5 latest changes", 5),
+        ("最近的设计变更", 1),
+        ("Thay đổi thiết kế mới nhất", 1),
+        ("Останні зміни проєкту", 1),
+        # 메타데이터 필드 이름은 템플릿 답변에 이미 있으므로 주제 단어가 아니다.
+        ("가장 최근에 등록된 설계변경의 기관명, 사업명, 제안명, 제안일자를 알려줘", 1),
+        ("What are the organization, project name, proposal name and date of the latest design change?", 1),
+        ("최근 설계변경의 요청 발주처는?", 1),
+        # 사업명 없는 목록 질문은 최근 등록순 목록
+        ("모든 설계변경 목록", 10),
+    ],
+)
+def test_latest(index: ChangeIndex, question: str, limit: int) -> None:
+    intent = classify_intent(question, index)
+    assert intent is not None
+    assert (intent.kind, intent.limit) == ("latest", limit)
+
+
+@pytest.mark.parametrize(
+    "question, project",
+    [
+        ("행복도시 도로공사 설계변경 목록", "행복도시 도로공사"),
+        ("행복도시 도로공사에서 어떤 설계변경이 있었나요?", "행복도시 도로공사"),
+        ("List all changes for Sejong Bridge project", "Sejong Bridge"),
+    ],
+)
+def test_by_project(index: ChangeIndex, question: str, project: str) -> None:
+    intent = classify_intent(question, index)
+    assert intent is not None
+    assert (intent.kind, intent.project_name) == ("by_project", project)
+
+
+@pytest.mark.parametrize(
+    "question, date_from, date_to, limit",
+    [
+        ("2024년 3월 설계변경", date(2024, 3, 1), date(2024, 3, 31), 10),
+        ("2024-03-05 제안", date(2024, 3, 5), date(2024, 3, 5), 10),
+        ("2024.03 설계변경 목록", date(2024, 3, 1), date(2024, 3, 31), 10),
+        # "10건" 은 건수이지 10월이 아니다.
+        ("2024년 10건의 설계변경", date(2024, 1, 1), date(2024, 12, 31), 10),
+        ("2024년 5건의 설계변경", date(2024, 1, 1), date(2024, 12, 31), 5),
+        ("Which changes were registered in 2024?", date(2024, 1, 1), date(2024, 12, 31), 10),
+    ],
+)
+def test_by_date(index: ChangeIndex, question: str, date_from: date, date_to: date, limit: int) -> None:
+    intent = classify_intent(question, index)
+    assert intent is not None
+    assert (intent.kind, intent.date_from, intent.date_to, intent.limit) == (
+        "by_date",
+        date_from,
+        date_to,
+        limit,
+    )
+
+
+@pytest.mark.parametrize(
+    "question, metric, limit",
+    [
+        ("절감액이 가장 큰 제안 5건", "savings_amount", 5),
+        ("절감율이 가장 높은 제안 3건", "savings_rate", 3),
+        ("which proposals saved the most", "savings_amount", 5),
+        ("节约最多的提案", "savings_amount", 5),
+    ],
+)
+def test_top_metric(index: ChangeIndex, question: str, metric: str, limit: int) -> None:
+    intent = classify_intent(question, index)
+    assert intent is not None
+    assert (intent.kind, intent.metric, intent.limit) == ("top_metric", metric, limit)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "가장 절감 효과가 좋은 공법 설명해줘",
+        "절감액이 가장 큰 제안의 내용을 요약해줘",
+        "Explain the proposal with the highest savings",
+    ],
+)
+def test_explanations_with_ranking_words_go_to_rag(index: ChangeIndex, question: str) -> None:
+    assert classify_intent(question, index) is None
@@ -0,0 +1,95 @@
+"""GET /worker/latest-change: ETag / If-None-Match 304 와 long-poll(wait=) 깨우기."""
+
+from datetime import date, datetime
+import threading
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app import main
+from app.core.models import DesignChangeRecord
+from app.services.change_notifier import CHANGE_NOTIFIER
+
+
+def _record(record_id: str) -> DesignChangeRecord:
+    return DesignChangeRecord(
+        id=record_id,
+        change_date=date(2024, 5, 1),
+        title="제안",
+        description="설명",
+        created_at=datetime(2024, 5, 1, 9, 0),
+    )
+
+
+@pytest.fixture
+def latest(monkeypatch: pytest.MonkeyPatch) -> dict:
+    holder = {"record": _record("r1")}
+    monkeypatch.setattr(main, "get_latest_change", lambda: holder["record"])
+    return holder
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"r1"', True),
+        ('W/"r1"', True),
+        ('"r0", "r1"', True),
+        ("*", True),
+        ('"r2"', False),
+        ("r1", False),
+    ],
+)
+def test_etag_matches(header, expected: bool) -> None:
+    assert main._etag_matches(header, '"r1"') is expected
+
+
+def test_matching_etag_returns_304(latest: dict) -> None:
+    client = TestClient(main.app)
+
+    first = client.get("/worker/latest-change")
+    assert first.status_code == 200
+    assert first.headers["etag"] == '"r1"'
+    assert first.json()["latest"]["id"] == "r1"
+
+    again = client.get("/worker/latest-change", headers={"If-None-Match": '"r1"'})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    latest["record"] = _record("r2")
+    changed = client.get("/worker/latest-change", headers={"If-None-Match": '"r1"'})
+    assert changed.status_code == 200
+    assert changed.json()["latest"]["id"] == "r2"
+
+
+def test_long_poll_wakes_up_on_publish(latest: dict) -> None:
+    client = TestClient(main.app)
+    result: dict = {}
+
+    def poll() -> None:
+        started = time.monotonic()
+        result["response"] = client.get(
+            "/worker/latest-change", params={"wait": 5}, headers={"If-None-Match": '"r1"'}
+        )
+        result["elapsed"] = time.monotonic() - started
+
+    thread = threading.Thread(target=poll)
+    thread.start()
+    time.sleep(0.3)
+    latest["record"] = _record("r2")
+    CHANGE_NOTIFIER.publish()
+    thread.join(5)
+
+    assert result["response"].status_code == 200
+    assert result["response"].json()["latest"]["id"] == "r2"
+    assert result["elapsed"] < 4
+
+
+def test_long_poll_times_out_with_304(latest: dict) -> None:
+    client = TestClient(main.app)
+    response = client.get(
+        "/worker/latest-change", params={"wait": 0.2}, headers={"If-None-Match": '"r1"'}
+    )
+    assert response.status_code == 304
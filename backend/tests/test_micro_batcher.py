@@ -0,0 +1,59 @@
+"""micro_batcher: 시간 창 안에 들어온 호출을 한 번의 batch_fn 호출로 묶고 결과/예외를 나눠 준다."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from app.services.micro_batcher import MicroBatcher
+
+
+def test_concurrent_items_are_batched_in_order() -> None:
+    batches: List[List[int]] = []
+
+    def double(items: List[int]) -> List[int]:
+        batches.append(list(items))
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher("test", double, window_seconds=0.2, max_batch=64)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(batcher.submit, range(8)))
+
+    assert results == [i * 2 for i in range(8)]
+    assert sum(len(b) for b in batches) == 8
+    assert len(batches) < 8
+    assert batcher.stats()["items"] == 8
+
+
+def test_full_batch_is_flushed_without_waiting_for_window() -> None:
+    batches: List[List[int]] = []
+
+    def identity(items: List[int]) -> List[int]:
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher("test", identity, window_seconds=5.0, max_batch=2)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(batcher.submit, range(4), timeout=4))
+
+    assert results == [0, 1, 2, 3]
+    assert all(len(b) <= 2 for b in batches)
+    assert batcher.stats()["max_batch_size"] == 2
+
+
+def test_batch_error_reaches_every_caller() -> None:
+    def fail(items: List[int]) -> List[int]:
+        raise RuntimeError("embedding failed")
+
+    batcher = MicroBatcher("test", fail, window_seconds=0.1, max_batch=8)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(batcher.submit, i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            future.result()
+
+
+def test_zero_window_calls_directly() -> None:
+    batcher = MicroBatcher("test", lambda items: [i + 1 for i in items], window_seconds=0, max_batch=8)
+    assert batcher.submit(1) == 2
+    assert batcher.stats()["batches"] == 0
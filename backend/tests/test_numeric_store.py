@@ -0,0 +1,102 @@
+"""numeric_store: VE 수치 파싱과 필터/정렬/그룹 집계, npz 저장-로드."""
+
+from datetime import date, datetime
+import math
+from pathlib import Path
+
+import pytest
+
+from app.core.models import DesignChangeRecord
+from app.services.numeric_store import NumericStore, parse_number
+
+
+def _record(i: int, organization: str, project: str, year: int) -> DesignChangeRecord:
+    return DesignChangeRecord(
+        id=f"rec-{i}",
+        change_date=date(year, 6, 1),
+        title=f"제안 {i}",
+        description="설명",
+        organization=organization,
+        project_name=project,
+        created_at=datetime(year, 6, 1),
+    )
+
+
+@pytest.fixture
+def store() -> NumericStore:
+    store = NumericStore()
+    rows = [
+        ("LH", "도로", 2023, 100.0, "토목", "채택"),
+        ("LH", "교량", 2024, 300.0, "토목", "채택"),
+        ("도로공사", "터널", 2024, 50.0, "건축", "미채택"),
+        ("도로공사", "터널", 2024, None, "건축", "채택"),
+    ]
+    for i, (org, project, year, savings, category, adopted) in enumerate(rows):
+        values = {"category": category, "adopted": adopted}
+        if savings is not None:
+            values["savings_amount"] = savings
+        store.add(_record(i, org, project, year), values)
+    return store
+
+
+def test_parse_number() -> None:
+    assert parse_number("1,234.5") == 1234.5
+    assert parse_number("12.5%") == 12.5
+    assert parse_number("-3") == -3.0
+    assert math.isnan(parse_number("--"))
+
+
+def test_top_rows_skip_missing_values(store: NumericStore) -> None:
+    result = store.query("savings_amount", limit=2)
+
+    assert result["matched"] == 3
+    assert result["total"] == 450.0
+    assert result["mean"] == 150.0
+    assert [row["id"] for row in result["rows"]] == ["rec-1", "rec-0"]
+    assert [row["id"] for row in store.query("savings_amount", descending=False, limit=1)["rows"]] == ["rec-2"]
+
+
+def test_filters_and_value_range(store: NumericStore) -> None:
+    result = store.query(
+        "savings_amount",
+        filters={"organization": "LH", "date_from": "2024-01-01"},
+    )
+    assert [row["id"] for row in result["rows"]] == ["rec-1"]
+    assert store.query("savings_amount", min_value=60, max_value=200)["matched"] == 1
+    assert store.query("savings_amount", filters={"adopted": "미채택"})["total"] == 50.0
+
+
+@pytest.mark.parametrize(
+    "group_by, agg, expected",
+    [
+        ("organization", "sum", [("LH", 400.0, 2), ("도로공사", 50.0, 1)]),
+        ("year", "count", [("2024", 2.0, 2), ("2023", 1.0, 1)]),
+        ("year", "max", [("2024", 300.0, 2), ("2023", 100.0, 1)]),
+        ("category", "mean", [("토목", 200.0, 2), ("건축", 50.0, 1)]),
+    ],
+)
+def test_group_aggregates(store: NumericStore, group_by: str, agg: str, expected) -> None:
+    groups = store.query("savings_amount", group_by=group_by, agg=agg)["groups"]
+    assert [(g["key"], g["value"], g["count"]) for g in groups] == expected
+
+
+def test_invalid_arguments(store: NumericStore) -> None:
+    with pytest.raises(ValueError):
+        store.query("unknown")
+    with pytest.raises(ValueError):
+        store.query("savings_amount", group_by="title")
+    with pytest.raises(ValueError):
+        store.query("savings_amount", agg="median")
+
+
+def test_save_and_load_round_trip(store: NumericStore, tmp_path: Path) -> None:
+    path = tmp_path / "numeric_store.npz"
+    store.save(path)
+
+    loaded = NumericStore()
+    loaded.load(path, lambda: [])
+
+    assert len(loaded) == 4
+    assert loaded.query("savings_amount", group_by="organization")["groups"] == store.query(
+        "savings_amount", group_by="organization"
+    )["groups"]
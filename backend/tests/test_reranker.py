@@ -0,0 +1,70 @@
+"""reranker: 코사인 + 글자 bigram 점수, 최소 점수 컷, MMR 중복 제거."""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from app.core.config import settings
+from app.services.reranker import lexical_overlap, rerank, score_hits
+from app.services.vectorstore import SearchHit
+
+
+def _hit(doc_id: str, text: str, vector) -> SearchHit:
+    return SearchHit(
+        doc=Document(page_content=text, metadata={"id": doc_id}),
+        distance=0.0,
+        vector=np.asarray(vector, dtype=np.float32),
+    )
+
+
+@pytest.fixture(autouse=True)
+def rerank_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "rerank_lexical_weight", 0.3)
+    monkeypatch.setattr(settings, "rerank_mmr_lambda", 0.7)
+    monkeypatch.setattr(settings, "rerank_duplicate_similarity", 0.97)
+
+
+def test_lexical_overlap() -> None:
+    assert lexical_overlap("배수 공법", "배수공법 변경") == 1.0
+    assert lexical_overlap("교량 받침", "배수 공법") == 0.0
+    assert lexical_overlap("", "아무 문서") == 0.0
+
+
+def test_score_combines_cosine_and_lexical() -> None:
+    hits = [_hit("a", "배수 공법 변경", [1.0, 0.0]), _hit("b", "교량 받침", [0.0, 2.0])]
+
+    scored = score_hits("배수 공법", [2.0, 0.0], hits)
+
+    assert [r.cosine for r in scored] == pytest.approx([1.0, 0.0])
+    assert scored[0].score == pytest.approx(0.7 * 1.0 + 0.3 * 1.0)
+    assert scored[1].score == pytest.approx(0.0)
+    assert np.linalg.norm(scored[1].vector) == pytest.approx(1.0)
+
+
+def test_rerank_drops_low_scores_and_near_duplicates() -> None:
+    hits = [
+        _hit("a", "배수 공법", [1.0, 0.0, 0.0]),
+        _hit("a-copy", "배수 공법", [0.999, 0.01, 0.0]),
+        _hit("b", "배수 공법 대안", [0.8, 0.6, 0.0]),
+        _hit("far", "무관", [0.0, 0.0, 1.0]),
+    ]
+    scored = score_hits("배수 공법", [1.0, 0.0, 0.0], hits)
+
+    ranked = rerank(scored, top_n=5, min_score=0.25)
+
+    assert [r.doc.metadata["id"] for r in ranked] == ["a", "b"]
+
+
+def test_rerank_mmr_prefers_diverse_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "rerank_mmr_lambda", 0.5)
+    hits = [
+        _hit("a", "x", [1.0, 0.0]),
+        _hit("a2", "x", [0.95, 0.31]),
+        _hit("b", "x", [0.8, -0.6]),
+    ]
+    scored = score_hits("", [1.0, 0.0], hits)
+
+    ranked = rerank(scored, top_n=2, min_score=0.0)
+
+    # a2 가 b 보다 관련도는 높지만 a 와 너무 비슷해서 b 가 먼저 뽑힌다.
+    assert [r.doc.metadata["id"] for r in ranked] == ["a", "b"]
@@ -0,0 +1,63 @@
+"""singleflight: 같은 key 로 동시에 들어온 호출은 한 번만 실행하고 결과/예외를 나눠 받는다."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def _run_concurrently(flight: SingleFlight, key, fn, callers: int = 5):
+    started = threading.Event()
+    release = threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        first = pool.submit(flight.do, key, leader_fn)
+        started.wait(5)
+        others = [pool.submit(flight.do, key, leader_fn) for _ in range(callers - 1)]
+        # 나머지 호출이 모두 대기열에 붙은 뒤 leader 를 끝낸다.
+        while flight.stats()["shared"] < callers - 1:
+            time.sleep(0.01)
+        release.set()
+        return [first] + others
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flight = SingleFlight("test")
+    executed = []
+
+    futures = _run_concurrently(flight, "q", lambda: executed.append(1) or "answer")
+
+    assert [f.result() for f in futures] == ["answer"] * 5
+    assert executed == [1]
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": 4}
+
+
+def test_error_is_shared_and_key_is_released() -> None:
+    flight = SingleFlight("test")
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    futures = _run_concurrently(flight, "q", fail, callers=3)
+    for future in futures:
+        with pytest.raises(RuntimeError, match="upstream down"):
+            future.result()
+
+    # 끝난 호출은 캐시되지 않으므로 다음 호출은 새로 실행된다.
+    assert flight.do("q", lambda: "retry") == "retry"
+    assert flight.stats()["executed"] == 2
+
+
+def test_different_keys_run_separately() -> None:
+    flight = SingleFlight("test")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["executed"] == 2
@@ -0,0 +1,104 @@
+"""upload_spool.spool_multipart_file: multipart 본문을 스트리밍으로 바로 저장, 형식/크기 거절 시 파일 정리."""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import pytest
+
+from app.services.upload_spool import UploadRejected, spool_multipart_file
+
+
+BOUNDARY = "test-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _part(name: str, data: bytes, filename: str | None = None) -> bytes:
+    disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+    return f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + data + b"\r\n"
+
+
+async def _chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def _run_sync(fn):
+    return fn()
+
+
+def _spool(body: bytes, dest: Path, max_bytes: int = 1_000_000, content_type: str = CONTENT_TYPE, chunk: int = 7):
+    return asyncio.run(
+        spool_multipart_file(
+            _chunks(body, chunk),
+            content_type,
+            dest,
+            field_name="file",
+            suffixes={".csv", ".xlsx"},
+            max_bytes=max_bytes,
+            run_sync=_run_sync,
+        )
+    )
+
+
+def _files(dest: Path) -> List[Path]:
+    return sorted(dest.iterdir())
+
+
+def test_file_part_is_written_directly(tmp_path: Path) -> None:
+    data = "기관명,사업명\nLH,도로\n".encode("utf-8") * 100
+    body = _body(_part("note", b"ignored"), _part("file", data, "C:\\Users\\me\\ve.CSV"))
+
+    filename, path = _spool(body, tmp_path)
+
+    assert filename == "ve.CSV"
+    assert path.parent == tmp_path and path.suffix == ".csv"
+    assert path.read_bytes() == data
+    assert _files(tmp_path) == [path]
+
+
+@pytest.mark.parametrize(
+    "body, content_type, status",
+    [
+        (_body(_part("file", b"x", "ve.txt")), CONTENT_TYPE, 400),
+        (_body(_part("other", b"x", "ve.csv")), CONTENT_TYPE, 422),
+        (_body(_part("file", b"x", "ve.csv")), "text/csv", 400),
+        (_part("file", b"x" * 100, "ve.csv")[:-20], CONTENT_TYPE, 400),
+    ],
+)
+def test_rejected_uploads_leave_no_file(tmp_path: Path, body: bytes, content_type: str, status: int) -> None:
+    with pytest.raises(UploadRejected) as info:
+        _spool(body, tmp_path, content_type=content_type)
+    assert info.value.status_code == status
+    assert _files(tmp_path) == []
+
+
+def test_size_limit_is_enforced_while_streaming(tmp_path: Path) -> None:
+    consumed = []
+
+    async def chunks():
+        yield _part("file", b"", "ve.csv")[:-2]
+        for _ in range(100):
+            consumed.append(1)
+            yield b"x" * 1000
+
+    with pytest.raises(UploadRejected) as info:
+        asyncio.run(
+            spool_multipart_file(
+                chunks(),
+                CONTENT_TYPE,
+                tmp_path,
+                field_name="file",
+                suffixes={".csv"},
+                max_bytes=5000,
+                run_sync=_run_sync,
+            )
+        )
+
+    assert info.value.status_code == 413
+    assert len(consumed) <= 6  # 한도를 넘은 뒤에는 본문을 더 읽지 않는다.
+    assert _files(tmp_path) == []
@@ -0,0 +1,130 @@
+"""upstream: AIMD 동시성 한도, 토큰 버킷 예약/환불, 서킷 브레이커 시험 호출, governor 재시도/거절."""
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.upstream import (
+    AimdLimiter,
+    CircuitBreaker,
+    TokenBucket,
+    UpstreamGovernor,
+    UpstreamUnavailable,
+)
+
+
+def test_aimd_increases_on_success_and_halves_on_overload() -> None:
+    limiter = AimdLimiter(initial=4, minimum=1, maximum=8)
+    for _ in range(8):
+        assert limiter.acquire(0)
+        limiter.release("success")
+    assert limiter.stats()["limit"] == 5
+
+    assert limiter.acquire(0)
+    limiter.release("overload")
+    assert limiter.stats()["limit"] == 2
+    # 1초 안에 연달아 실패해도 한 번만 줄인다.
+    assert limiter.acquire(0)
+    limiter.release("overload")
+    assert limiter.stats()["limit"] == 2
+
+
+def test_aimd_rejects_when_full() -> None:
+    limiter = AimdLimiter(initial=1, minimum=1, maximum=1)
+    assert limiter.acquire(0)
+    assert not limiter.acquire(0.01)
+    limiter.release("error")
+    assert limiter.acquire(0)
+
+
+def test_token_bucket_reserve_and_refund() -> None:
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(60, max_wait=0) == 0.0
+    assert bucket.reserve(1, max_wait=0) is None
+    bucket.refund(30)
+    assert bucket.reserve(30, max_wait=0) == 0.0
+    assert TokenBucket(per_minute=0).reserve(1_000_000, max_wait=0) == 0.0
+
+
+def test_breaker_allows_one_probe_and_only_the_probe_releases_it() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.0)
+    assert breaker.check() is False
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+
+    assert breaker.check() is True
+    with pytest.raises(UpstreamUnavailable):
+        breaker.check()
+    # 시험 호출이 아닌 호출의 실패로는 시험 자리가 풀리지 않는다.
+    breaker.record_failure(probe=False)
+    with pytest.raises(UpstreamUnavailable):
+        breaker.check()
+
+    breaker.record_failure(probe=True)
+    assert breaker.check() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.fixture
+def fast_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "upstream_backoff_base_seconds", 0.0)
+    monkeypatch.setattr(settings, "upstream_backoff_max_seconds", 0.0)
+    monkeypatch.setattr(settings, "upstream_max_retries", 2)
+    monkeypatch.setattr(settings, "upstream_queue_timeout_seconds", 0.01)
+    monkeypatch.setattr(settings, "upstream_requests_per_minute", 0)
+    monkeypatch.setattr(settings, "upstream_tokens_per_minute", 0)
+    monkeypatch.setattr(settings, "upstream_breaker_failure_threshold", 3)
+
+
+def test_governor_retries_transient_errors(fast_settings: None) -> None:
+    governor = UpstreamGovernor("test")
+    calls = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise httpx.ConnectError("boom")
+        return "ok"
+
+    assert governor.call(flaky) == "ok"
+    stats = governor.stats()
+    assert (stats["retries"], stats["succeeded"], stats["inflight"]) == (2, 1, 0)
+
+
+def test_governor_does_not_retry_client_errors(fast_settings: None) -> None:
+    governor = UpstreamGovernor("test")
+
+    def bad_request() -> None:
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        governor.call(bad_request)
+    assert governor.stats()["retries"] == 0
+    assert governor.stats()["breaker"] == "closed"
+
+
+def test_governor_refunds_request_budget_when_rejected(
+    fast_settings: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "upstream_requests_per_minute", 60)
+    monkeypatch.setattr(settings, "upstream_tokens_per_minute", 100)
+    governor = UpstreamGovernor("test")
+    assert governor.call(lambda: "ok", tokens=100) == "ok"
+
+    # 토큰 버킷에서 거절: 요청 버킷 예약은 돌려받는다.
+    with pytest.raises(UpstreamUnavailable):
+        governor.call(lambda: "ok", tokens=50)
+    assert governor.stats()["requests_per_minute"]["available"] == pytest.approx(59.0, abs=0.5)
+
+    # 동시성 한도에서 거절: 두 버킷 모두 돌려받는다.
+    governor.tokens_bucket.refund(100)
+    for _ in range(governor.limiter.maximum):
+        governor.limiter.acquire(0)
+    with pytest.raises(UpstreamUnavailable):
+        governor.call(lambda: "ok", tokens=40)
+    assert governor.stats()["requests_per_minute"]["available"] == pytest.approx(59.0, abs=0.5)
+    assert governor.stats()["tokens_per_minute"]["available"] == 100.0
+    assert governor.stats()["rejected_rate_limit"] == 1
+    assert governor.stats()["rejected_queue"] == 1
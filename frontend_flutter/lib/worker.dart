@@ -153,7 +153,16 @@ const List<_WorkerLanguage> _workerLanguages = [
 
 class _WorkerPageState extends State<WorkerPage>
     with SingleTickerProviderStateMixin {
+  // The server parks the request for up to this many seconds until a new
+  // change is committed (long-poll), and answers 304 when nothing changed.
+  static const int _longPollSeconds = 25;
+  static const Duration _pollRetryDelay = Duration(seconds: 15);
+  // Floor between polls when the server did not hold the request
+  // (no ETag from an older server / stripping proxy, or an early reply).
+  static const Duration _minPollInterval = Duration(seconds: 5);
+
   Timer? _pollTimer;
+  String? _latestEtag;
   String? _latestChangeId;
   String? _latestChangeTitle;
   String? _latestChangeDate;
@@ -185,18 +194,29 @@ class _WorkerPageState extends State<WorkerPage>
 
   void _startPolling() {
     _pollLatestChange();
-    _pollTimer = Timer.periodic(const Duration(seconds: 15), (_) {
-      _pollLatestChange();
-    });
   }
 
   Future<void> _pollLatestChange() async {
+    var nextDelay = Duration.zero;
+    final started = DateTime.now();
     try {
-      final uri = Uri.parse('$apiBaseUrl/worker/latest-change');
-      final resp = await http.get(uri);
+      final uri = Uri.parse(
+        '$apiBaseUrl/worker/latest-change?wait=$_longPollSeconds',
+      );
+      final etag = _latestEtag;
+      final resp = await http.get(
+        uri,
+        headers: {if (etag != null) 'If-None-Match': etag},
+      );
       if (resp.statusCode == 200) {
+        _latestEtag = resp.headers['etag'];
+        if (_latestEtag == null) {
+          // Without an ETag the server answers immediately every time,
+          // so fall back to plain interval polling.
+          nextDelay = _pollRetryDelay;
+        }
         final data = jsonDecode(resp.body) as Map<String, dynamic>;
-        if (data['has_change'] == true && data['latest'] != null) {
+        if (mounted && data['has_change'] == true && data['latest'] != null) {
           final latest = data['latest'] as Map<String, dynamic>;
           setState(() {
             _latestChangeId = latest['id'] as String?;
@@ -207,10 +227,22 @@ class _WorkerPageState extends State<WorkerPage>
             _latestClient = latest['client'] as String?;
           });
         }
+      } else if (resp.statusCode != 304) {
+        nextDelay = _pollRetryDelay;
       }
     } catch (_) {
-      // silent fail for polling
+      // silent fail for polling, retry later
+      nextDelay = _pollRetryDelay;
+    }
+    if (!mounted) return;
+    // 200/304 normally come back only after a change or the long-poll
+    // timeout, so the next request can be sent right away. A reply that
+    // came back sooner still waits out the minimum interval.
+    final elapsed = DateTime.now().difference(started);
+    if (nextDelay == Duration.zero && elapsed < _minPollInterval) {
+      nextDelay = _minPollInterval - elapsed;
     }
+    _pollTimer = Timer(nextDelay, _pollLatestChange);
   }
 
   bool get _hasNewChange {